@@ -0,0 +1,83 @@
+# benchmarks/bench_html_parser.py
+# Kaydedilmiş DuckDuckGo sayfaları üzerinde HTML ayrıştırıcı karşılaştırması
+#
+# Kullanım:
+#   python benchmarks/bench_html_parser.py sayfa1.html sayfa2.html --repeat 50
+
+import argparse
+import os
+import sys
+import time
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.html_parser import BACKENDS, available_backends, parse_ddg_results
+
+
+def _parse_bs4(content, num_results):
+    """
+    Önceki uygulama: BeautifulSoup + html.parser (karşılaştırma için).
+
+    Eski _search_duckduckgo ile aynı alanları (başlık, bağlantı, özet) çıkarır;
+    böylece oranlar aynı miktarda işi karşılaştırır.
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content.decode('utf-8'), 'html.parser')
+    results = []
+    for i, result in enumerate(soup.select('.result')):
+        if i >= num_results:
+            break
+        title_elem = result.select_one('.result__a')
+        snippet_elem = result.select_one('.result__snippet')
+        if not title_elem:
+            continue
+        href = title_elem.get('href', '')
+        real_url = unquote(href[href.find('uddg=') + 5:]) if 'uddg=' in href else href
+        results.append({
+            'title': title_elem.get_text(strip=True),
+            'link': real_url,
+            'snippet': snippet_elem.get_text(strip=True) if snippet_elem else '',
+        })
+    return results
+
+
+def bench(name, parse, pages, num_results, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for content in pages:
+            parse(content, num_results)
+    elapsed = time.perf_counter() - start
+    per_page = elapsed / (repeat * len(pages)) * 1000
+    print(f"{name:<12} {per_page:8.3f} ms/sayfa")
+    return per_page
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DuckDuckGo HTML ayrıştırıcı karşılaştırması")
+    parser.add_argument("pages", nargs="+", help="Kaydedilmiş DuckDuckGo sonuç sayfaları")
+    parser.add_argument("--num-results", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = []
+    for path in args.pages:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+
+    timings = {}
+    for name in available_backends():
+        timings[name] = bench(name, lambda c, n, b=name: parse_ddg_results(c, n, backend=b),
+                              pages, args.num_results, args.repeat)
+    try:
+        timings["bs4"] = bench("bs4", _parse_bs4, pages, args.num_results, args.repeat)
+    except ImportError:
+        pass
+
+    if "bs4" in timings:
+        for name in (backend for backend, _, _ in BACKENDS if backend in timings):
+            print(f"{name}: bs4'e göre {timings['bs4'] / timings[name]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
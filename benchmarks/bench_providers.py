@@ -0,0 +1,140 @@
+# benchmarks/bench_providers.py
+# Arama ve çeviri sağlayıcılarının kaydedilmiş yanıtlarla çevrimdışı yük testi
+#
+# Kullanım:
+#   python benchmarks/bench_providers.py kaset.jsonl --record          # gerçek servislerden kaydet
+#   python benchmarks/bench_providers.py kaset.jsonl --concurrency 16 --requests 500 \
+#       --latency 0.15 --jitter 0.1 --error-rate 0.02                  # tekrar oynatarak ölç
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import http_client
+from modules.rate_limiter import ProviderLimiter
+from modules.replay import Cassette, RecordingTransport, ReplayServer, ReplayTransport
+from modules.translator import Translator
+from modules.web_searcher import WebSearcher
+
+# (Türkçe nesne adı, anahtar kelimeler)
+SEARCH_WORKLOAD = [
+    ("sırt çantası", ["sırt çantası", "okul", "ergonomik"]),
+    ("el çantası", ["el çantası", "kadın", "deri"]),
+    ("sosisli sandviç", ["sosisli sandviç", "tarif", "sos"]),
+    ("dizüstü bilgisayar", ["dizüstü bilgisayar", "teknoloji", "inceleme"]),
+    ("fincan", ["fincan", "kahve", "porselen"]),
+    ("kitap", ["kitap", "roman", "okuma"]),
+]
+
+# Sözlükte olmayan, çeviri servisine giden kelimeler
+TRANSLATE_WORKLOAD = ["lighthouse", "windmill", "accordion", "hammock", "lantern", "compass"]
+
+_local = threading.local()
+
+
+def _searcher():
+    """İş parçacığı başına arama nesnesi (arama geçmişi sorguları değiştirmesin)."""
+    if not hasattr(_local, "searcher"):
+        _local.searcher = WebSearcher(
+            use_cache=False,
+            serper_limiter=ProviderLimiter("Serper", rate=1e9, burst=10 ** 9),
+        )
+    return _local.searcher
+
+
+def search_task(i):
+    object_name, keywords = SEARCH_WORKLOAD[i % len(SEARCH_WORKLOAD)]
+    searcher = _searcher()
+    searcher.search_history.clear()
+    results = searcher.search_web(object_name, keywords)
+    searcher.extract_content(results, object_name)
+    return bool(results)
+
+
+def translate_task(i):
+    if not hasattr(_local, "translator"):
+        _local.translator = Translator(use_google=False)
+    word = TRANSLATE_WORKLOAD[i % len(TRANSLATE_WORKLOAD)]
+    return _local.translator.translate(word) != word
+
+
+TASKS = {"search": (search_task, SEARCH_WORKLOAD), "translate": (translate_task, TRANSLATE_WORKLOAD)}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(name, task, total, concurrency):
+    latencies = []
+    failures = 0
+
+    def timed(i):
+        start = time.perf_counter()
+        try:
+            ok = task(i)
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for latency, ok in executor.map(timed, range(total)):
+            latencies.append(latency)
+            failures += 0 if ok else 1
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{name:<10} {total / elapsed:8.1f} istek/sn  "
+          f"p50 {percentile(latencies, 50) * 1000:7.1f} ms  "
+          f"p95 {percentile(latencies, 95) * 1000:7.1f} ms  "
+          f"p99 {percentile(latencies, 99) * 1000:7.1f} ms  "
+          f"başarısız {failures}/{total}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sağlayıcı kayıt/tekrar oynatma yük testi")
+    parser.add_argument("cassette", help="Kaset dosyası (JSON Lines)")
+    parser.add_argument("--record", action="store_true", help="Gerçek servislerden kaset kaydet")
+    parser.add_argument("--target", choices=["search", "translate", "all"], default="all")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="Yanıt başına sabit gecikme (sn)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Rastgele ek gecikme üst sınırı (sn)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Hata döndürülecek istek oranı")
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    targets = list(TASKS) if args.target == "all" else [args.target]
+    cassette = Cassette(args.cassette)
+
+    if args.record:
+        http_client.set_transport(RecordingTransport(cassette))
+        for name in targets:
+            task, workload = TASKS[name]
+            for i in range(len(workload)):
+                task(i)
+        print(f"Kasette {len(cassette)} kayıt var: {args.cassette}")
+        return
+
+    server = ReplayServer(cassette, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, error_status=args.error_status).start()
+    http_client.set_transport(ReplayTransport(server.url))
+    try:
+        for name in targets:
+            run(name, TASKS[name][0], args.requests, args.concurrency)
+    finally:
+        server.stop()
+    print(f"Sunucu: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#compact_history.py
+# Analiz geçmişini sıkıştırılmış bölütlere taşır ve yinelenen / süresi dolmuş kayıtları atar
+#
+# Kullanım:
+#   python compact_history.py                    # yalnızca yinelenen kayıtları at
+#   python compact_history.py --max-age-days 90  # 90 günden eski kayıtları da at
+#
+# Uygulama veya sunucu çalışırken de kullanılabilir: manifest ve bölüt işlemleri
+# data/history.lock üzerindeki süreçler arası kilitle sıraya girer. Aynı anda
+# yalnızca bir sıkıştırma çalışır; başka biri sürüyorsa betik hiçbir şeyi
+# değiştirmeden 1 koduyla çıkar.
+
+import argparse
+import logging
+import sys
+
+from modules.data_storage import DataStorage, HistoryLockedError
+
+# Loglama ayarları
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiz geçmişini sıkıştır")
+    parser.add_argument("--storage-file", help="Geçmiş dosyası (varsayılan: data/history.jsonl)")
+    parser.add_argument("--max-age-days", type=float, help="Bu günden eski kayıtları sil")
+    parser.add_argument("--keep-duplicates", action="store_true", help="Yinelenen kayıtları silme")
+    parser.add_argument("--rotate", action="store_true", help="Önce etkin dosyayı bölüte taşı")
+    args = parser.parse_args()
+
+    storage = DataStorage(args.storage_file, backend="jsonl")
+    try:
+        if args.rotate:
+            storage.backend.rotate()
+        stats = storage.compact(max_age_days=args.max_age_days, dedupe=not args.keep_duplicates)
+    except HistoryLockedError as e:
+        print(e)
+        sys.exit(1)
+    finally:
+        storage.close()
+    print(stats)
+
+if __name__ == "__main__":
+    main()
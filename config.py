@@ -1 +1,38 @@
-#Yapılandırma dosyası
\ No newline at end of file
+#Yapılandırma dosyası
+import os
+
+
+def _env_flag(name, default=False):
+    """Ortam değişkenini mantıksal değer olarak okur."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Çevrimdışı mod: açıkken model/veri indirme gibi ağ erişimleri yapılmaz
+OFFLINE_MODE = _env_flag("GORUNTU_OFFLINE")
+
+# DuckDuckGo sonuç sayfası ayrıştırıcısı: auto, selectolax, lxml veya stdlib
+HTML_PARSER = os.environ.get("GORUNTU_HTML_PARSER", "auto")
+
+# Serper.dev aylık ücretsiz arama kotası ve kota bitmeden önce ayrılan pay
+SERPER_MONTHLY_QUOTA = int(os.environ.get("GORUNTU_SERPER_QUOTA", "2000"))
+SERPER_QUOTA_RESERVE = int(os.environ.get("GORUNTU_SERPER_QUOTA_RESERVE", "100"))
+
+# Yük testi için HTTP kayıt/tekrar oynatma (modules/replay.py):
+# GORUNTU_HTTP_RECORD=kaset.jsonl yanıtları kaydeder, GORUNTU_HTTP_REPLAY=http://127.0.0.1:8765
+# tüm istekleri tekrar oynatma sunucusuna yönlendirir
+HTTP_RECORD_CASSETTE = os.environ.get("GORUNTU_HTTP_RECORD")
+HTTP_REPLAY_URL = os.environ.get("GORUNTU_HTTP_REPLAY")
+
+# Analiz geçmişinin saklama katmanı: jsonl (data/history.jsonl) veya sqlite (data/history.db)
+STORAGE_BACKEND = os.environ.get("GORUNTU_STORAGE", "jsonl")
+
+# Geçmişteki analiz bu süreden (saniye) yeniyse arama yapılmadan geçmişten yanıtlanır (0: kapalı);
+# REFRESH_AFTER süresini aşan yanıtlar döndürüldükten sonra arka planda yenilenir
+ANSWER_MAX_AGE = float(os.environ.get("GORUNTU_ANSWER_MAX_AGE", str(7 * 24 * 3600)))
+ANSWER_REFRESH_AFTER = float(os.environ.get("GORUNTU_ANSWER_REFRESH_AFTER", str(24 * 3600)))
+
+# Aşama süreleri ve önbellek isabetlerinin süreç içi ölçümü (modules/metrics.py)
+METRICS_ENABLED = _env_flag("GORUNTU_METRICS", True)
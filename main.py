@@ -2,6 +2,8 @@
 # Ayşenur Arslan - 16.04.2025
 
 import argparse
+import functools
+import json
 import os
 import sys
 from PIL import Image
@@ -11,8 +13,13 @@ from modules.translator import Translator
 from modules.image_processor import get_image_from_source, preprocess_image
 from modules.object_detector import ObjectDetector
 from modules.keyword_extractor import KeywordExtractor
+from modules.keyword_expander import EmbeddingExpander
 from modules.web_searcher import WebSearcher
 from modules.data_storage import DataStorage
+from modules.knowledge_store import KnowledgeStore
+from modules.answer_cache import AnswerCache
+from modules import metrics
+from modules.pipeline import AnalysisStages, iter_batch_sources, parse_workers, research
 
 # Loglama ayarları
 logging.basicConfig(
@@ -25,28 +32,92 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
-    # Argüman ayrıştırıcıyı ayarla
-    parser = argparse.ArgumentParser(description="Görüntü Analizi ve Sohbet Uygulaması")
-    parser.add_argument("--source", "-s", help="Görüntü URL'si veya dosya yolu (isteğe bağlı)")
-    args = parser.parse_args()
-    
+def build_components():
+    """Uygulamanın bileşenlerini oluşturur (main.py ve server.py ortak kullanır)."""
     # Özel eğitilmiş modeli kullan
     model_path = "D:\Masaüstü\goruntu_analizi_sohbet_uygulamasi\models\best.pt"  # Modelinizin tam yolu
     
+    translator = Translator()  # Çeviri nesnesi
+
     # Nesneleri başlat - özel model kullanımı için parametreleri geçir
     object_detector = ObjectDetector(
     model_path=model_path, 
     custom_model=True, 
     confidence_threshold=0.3,
     ensemble=True,  # Ensemble (birleştirme) modelini etkinleştir
-    optimize=True   # Model optimizasyonunu etkinleşti
-    
+    optimize=True,   # Model optimizasyonunu etkinleşti
+    translator=translator  # Sınıf etiketleri model yüklenirken Türkçe'ye çevrilir
     )
-    keyword_extractor = KeywordExtractor()
-    translator = Translator()  # Çeviri nesnesi
-    web_searcher = WebSearcher()
-    data_storage = DataStorage()
+    # Vektör matrisi ilk kullanımda hazırlanır (data/embeddings altında saklanır)
+    keyword_extractor = KeywordExtractor(expander=EmbeddingExpander())
+    # İlk 3 sonucun tam metni özetlenir; prefetch_knowledge.py ile hazırlanan sınıflar ağa çıkmadan yanıtlanır
+    web_searcher = WebSearcher(full_pages=3, knowledge_store=KnowledgeStore())
+    # Kayıtlar arka planda toplu yazılır; kullanıcı disk yazmasını beklemez.
+    # Aynı nesne için tekrar eden içerik bir kez saklanır
+    data_storage = DataStorage(write_behind=True, dedupe_content=True)
+    # Yakın zamanda analiz edilmiş nesneler aramaya çıkmadan geçmişten yanıtlanır
+    answer_cache = AnswerCache(data_storage)
+    return translator, object_detector, keyword_extractor, web_searcher, data_storage, answer_cache
+
+# Toplu kipte çıktı dosyasına yazılan alanlar
+BATCH_FIELDS = ("index", "source", "object", "tr_object", "confidence", "keywords", "content",
+                "from_history", "error", "seconds")
+
+def run_batch(args, stages):
+    """Kaynakları aşamalı boru hattından geçirip sonuçları JSON Lines olarak yazar."""
+    sources = iter_batch_sources(args.batch)
+    if not sources:
+        print(f"Kaynak bulunamadı: {args.batch}")
+        return
+    pipeline = stages.build(parse_workers(args.workers), queue_size=args.queue_size)
+    print(f"{len(sources)} görüntü işlenecek, sonuçlar: {args.output}")
+
+    with open(args.output, 'w', encoding='utf-8') as out:
+        def write_result(item):
+            result = {field: item[field] for field in BATCH_FIELDS if field in item}
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()  # Sonuçlar geldikçe okunabilsin
+
+        summary = pipeline.run(sources, sink=write_result)
+
+    print(f"\n✓ {summary['items']} görüntü {summary['seconds']:.1f} sn'de işlendi "
+          f"({summary['items_per_second']:.2f} görüntü/sn, {summary['failed']} hatalı)")
+    for name, stage_metrics in summary["stages"].items():
+        print(f"  {name:<10} işçi {stage_metrics['workers']}  işlenen {stage_metrics['processed']:>5}  "
+              f"hatalı {stage_metrics['failed']:>3}  meşgul {stage_metrics['busy_seconds']:7.1f} sn  "
+              f"en uzun kuyruk {stage_metrics['max_queue']}")
+
+def main():
+    # Argüman ayrıştırıcıyı ayarla
+    parser = argparse.ArgumentParser(description="Görüntü Analizi ve Sohbet Uygulaması")
+    parser.add_argument("--source", "-s", help="Görüntü URL'si veya dosya yolu (isteğe bağlı)")
+    parser.add_argument("--batch", "-b", help="Toplu kip: klasör, glob deseni veya URL/dosya listesi")
+    parser.add_argument("--output", "-o", default="batch_results.jsonl", help="Toplu kip çıktı dosyası (JSON Lines)")
+    parser.add_argument("--workers", nargs="+", metavar="AŞAMA=SAYI",
+                        help="Aşama işçi sayıları, ör. --workers fetch=8 search=6")
+    parser.add_argument("--queue-size", type=int, default=8, help="Aşamalar arası kuyruk kapasitesi")
+    parser.add_argument("--metrics-out", help="Çıkışta aşama sürelerinin yazılacağı dosya (.json veya .prom)")
+    args = parser.parse_args()
+    try:
+        run(args)
+    finally:
+        if args.metrics_out:
+            metrics.dump(args.metrics_out)
+            print(f"Ölçümler yazıldı: {args.metrics_out}")
+
+def run(args):
+    
+    (translator, object_detector, keyword_extractor, web_searcher,
+     data_storage, answer_cache) = build_components()
+
+    if args.batch:
+        try:
+            run_batch(args, AnalysisStages(object_detector, translator, keyword_extractor,
+                                           web_searcher, answer_cache))
+        finally:
+            answer_cache.close()
+            data_storage.close()
+        return
     
     print("=" * 50)
     print("Görüntü Analizi ve Sohbet Uygulaması")
@@ -74,31 +145,34 @@ def main():
                 source = input("\nYeni bir görüntü URL'si veya dosya yolu girin: ")
                 continue
             
-            # İngilizce nesne adını Türkçe'ye çevir
-            tr_object_name = translator.translate(object_name)
+            # İngilizce nesne adını Türkçe'ye çevir (önce model yüklenirken hazırlanan tablo)
+            primary_object = object_detector.last_primary_object or {}
+            tr_object_name = primary_object.get('tr_name') or translator.translate(object_name)
             print(f"\n✓ Tespit edilen nesne: {object_name} (Türkçesi: {tr_object_name})")
             
             # İsteğe bağlı: işaretlenmiş görüntüyü kaydet
             marked_image.save("detected_object.jpg")
             print("(İşaretlenmiş görüntü 'detected_object.jpg' olarak kaydedildi)")
             
-            # Anahtar kelime üretme
-            keywords = keyword_extractor.generate_keywords(tr_object_name, is_turkish=True)
-            print(f"✓ Anahtar kelimeler: {', '.join(keywords)}")
-            
-            # Web'de arama
+            # Anahtar kelime üretme ve web'de arama (taze bir analiz varsa geçmişten)
             print("\nWeb'de bilgi aranıyor...")
-            search_results = web_searcher.search_web(tr_object_name, keywords, lang="tr")
+            # Arka plan yenilemesi sonraki görüntüyle aynı anda çalışabilir; geçmişi kullanmaz
+            entry, from_history = answer_cache.get_or_compute(
+                object_name, functools.partial(research, keyword_extractor, web_searcher, tr_object_name),
+                refresh=functools.partial(research, keyword_extractor, web_searcher, tr_object_name,
+                                          use_history=False))
 
-            if not search_results:
+            if entry is None:
                print("Web'de arama sonucu bulunamadı!")
                source = input("\nYeni bir görüntü URL'si veya dosya yolu girin (çıkmak için 'q'): ")
                if source.lower() == 'q':
                   break
                continue
-               
-            # İçerik çıkarma - object_name ve keywords parametrelerini geçirerek zenginleştir
-            content = web_searcher.extract_content(search_results, tr_object_name)
+
+            keywords, content = entry["keywords"], entry["content"]
+            print(f"✓ Anahtar kelimeler: {', '.join(keywords)}")
+            if from_history:
+                print(f"(Sonuçlar {entry['timestamp'][:16].replace('T', ' ')} tarihli analizden alındı)")
            
             # Sonuçları göster
             print("\n" + "=" * 50)
@@ -107,9 +181,9 @@ def main():
             print(content)
             print("=" * 50)
             
-            # Veri saklama
-            data_storage.save_data(object_name, keywords, content)
-            print("✓ Sonuçlar başarıyla kaydedildi!")
+            # Veri saklama (yeni analizler get_or_compute içinde kaydedildi)
+            if not from_history:
+                print("✓ Sonuçlar başarıyla kaydedildi!")
             
             # Yeni görüntü için sorgu
             source = input("\nYeni bir görüntü URL'si veya dosya yolu girin (çıkmak için 'q'): ")
@@ -129,5 +203,9 @@ def main():
                 # Yeni kaynak
                 source = retry
 
+    # Arka plandaki yenilemeleri bekle ve kuyrukta bekleyen kayıtları diske yaz
+    answer_cache.close()
+    data_storage.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
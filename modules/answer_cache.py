@@ -0,0 +1,151 @@
+# modules/answer_cache.py
+# Analiz geçmişini ağ aşamaları için okuma-içinden (read-through) önbellek olarak kullanma
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import config
+from modules import metrics
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _age(entry):
+    """Kaydın yaşı (saniye); zaman damgası okunamazsa None."""
+    try:
+        return (datetime.now() - datetime.fromisoformat(entry["timestamp"])).total_seconds()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class AnswerCache:
+    """
+    Bir nesne için geçmişte max_age saniyeden yeni bir analiz varsa anahtar
+    kelime üretme, web araması, Wikipedia ve özetleme yeniden yapılmadan onu
+    döndürür. Yoksa yanıt hesaplanır, geçmişe yazılır ve sonraki sorgular için
+    bellekte tutulur.
+
+    refresh_after saniyeden eski (ama hâlâ taze) yanıtlar hemen döndürülür ve
+    arka planda bir kez yeniden hesaplanıp geçmişe yazılır.
+
+    Args:
+        data_storage: DataStorage nesnesi
+        max_age: Yanıtın geçmişten verilebileceği en fazla yaş (saniye, 0: kapalı)
+        refresh_after: Bu yaştan sonra yanıt arka planda yenilenir (None: yenileme yok)
+    """
+
+    def __init__(self, data_storage, max_age=config.ANSWER_MAX_AGE,
+                 refresh_after=config.ANSWER_REFRESH_AFTER):
+        self.data_storage = data_storage
+        self.max_age = max_age
+        self.refresh_after = refresh_after
+        self._latest = {}       # nesne -> bu süreçte görülen en yeni kayıt
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        self.metrics = {"hits": 0, "misses": 0, "refreshes": 0, "refresh_failed": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.metrics[name] += 1
+
+    def lookup(self, object_name):
+        """Nesnenin taze kaydını döndürür; yoksa None."""
+        if not self.max_age:
+            return None
+        with self._lock:
+            entry = self._latest.get(object_name)
+        if entry is None:
+            since = datetime.now() - timedelta(seconds=self.max_age)
+            entry = self.data_storage.latest(object_name, since=since)
+            if entry is None:
+                return None
+            with self._lock:
+                self._latest.setdefault(object_name, entry)
+        age = _age(entry)
+        if age is None or age > self.max_age:
+            return None
+        return entry
+
+    def get_or_compute(self, object_name, compute, refresh=None):
+        """
+        Taze kayıt varsa onu, yoksa compute() sonucunu döndürür.
+
+        Args:
+            object_name: Geçmişteki nesne adı
+            compute: {'keywords': [...], 'content': '...'} ya da sonuç yoksa None döndüren fonksiyon
+            refresh: Arka plan yenilemesinde compute yerine çağrılacak fonksiyon (varsayılan:
+                compute). Yenileme başka bir iş parçacığında çalıştığından anahtar kelime ve
+                arama geçmişini kullanmamalıdır (ör. research(..., use_history=False)).
+
+        Returns:
+            (kayıt veya None, geçmişten mi geldiği)
+        """
+        entry = self.lookup(object_name)
+        if entry is not None:
+            self._count("hits")
+            metrics.count("cache_requests_total", cache="answers", result="hit")
+            age = _age(entry)
+            if self.refresh_after is not None and age is not None and age > self.refresh_after:
+                self._schedule_refresh(object_name, refresh or compute)
+            return entry, True
+
+        self._count("misses")
+        metrics.count("cache_requests_total", cache="answers", result="miss")
+        return self._compute_and_store(object_name, compute), False
+
+    def _compute_and_store(self, object_name, compute):
+        answer = compute()
+        if not answer:
+            return None
+        return self.store(object_name, answer["keywords"], answer["content"])
+
+    def store(self, object_name, keywords, content):
+        """Yeni analizi geçmişe yazar ve sonraki sorgular için bellekte tutar."""
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "object": object_name,
+            "keywords": keywords,
+            "content": content,
+        }
+        self.data_storage.save_data(object_name, keywords, content)
+        with self._lock:
+            self._latest[object_name] = entry
+        return entry
+
+    def _schedule_refresh(self, object_name, compute):
+        """Nesne için (zaten sürmüyorsa) arka planda yenileme başlatır."""
+        with self._lock:
+            if object_name in self._refreshing:
+                return
+            self._refreshing.add(object_name)
+            if self._executor is None:
+                # Tek iş parçacığı: yenilemeler dış servislere sırayla gider
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="answer-refresh")
+        self._executor.submit(self._refresh, object_name, compute)
+
+    def _refresh(self, object_name, compute):
+        try:
+            if self._compute_and_store(object_name, compute) is not None:
+                self._count("refreshes")
+                logger.info(f"Yanıt arka planda yenilendi: {object_name}")
+        except Exception as e:
+            self._count("refresh_failed")
+            logger.error(f"Yanıt yenilenirken hata ({object_name}): {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(object_name)
+
+    def info(self):
+        with self._lock:
+            return dict(self.metrics, refreshing=len(self._refreshing))
+
+    def close(self):
+        """Süren yenilemelerin bitmesini bekler."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
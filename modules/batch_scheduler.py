@@ -0,0 +1,159 @@
+# modules/batch_scheduler.py
+# Eşzamanlı tespit isteklerini kısa bir süre toplayıp tek bir toplu çağrıyla işleyen zamanlayıcı
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Zamanlayıcıyı durduran işaret
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Gelen istekleri en fazla max_wait saniye (ya da max_batch_size isteğe
+    ulaşana kadar) bekletip batch_fn'e tek liste olarak verir ve her sonucu
+    kendi isteğine döndürür.
+
+    batch_fn tek bir iş parçacığından çağrılır; iş parçacıkları arasında
+    paylaşılamayan modeller (YOLO) için uygundur. Kuyruk max_queue isteğe
+    ulaşınca yeni istekler queue.Full ile reddedilir. Toplu çağrı hata
+    verirse istekler tek tek yeniden denenir; hata yalnızca ona yol açan
+    isteğe döner.
+
+    Args:
+        batch_fn: Girdi listesi alıp aynı uzunlukta sonuç listesi döndüren fonksiyon
+        max_batch_size: Bir toplu çağrıdaki en fazla istek sayısı
+        max_wait: İlk istekten sonra diğerleri için beklenecek en uzun süre (saniye)
+        max_queue: Bekleyebilecek en fazla istek sayısı
+    """
+
+    def __init__(self, batch_fn, max_batch_size=8, max_wait=0.005, max_queue=64, name="batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._lock = threading.Lock()
+        self.metrics = {
+            "requests": 0,
+            "rejected": 0,          # Kuyruk dolu olduğu için reddedilenler
+            "failed": 0,
+            "split_batches": 0,     # Hata yüzünden tek tek yeniden denenen toplu çağrılar
+            "batches": 0,
+            "max_depth": 0,
+            "last_batch_size": 0,
+            "last_batch_seconds": 0.0,
+            "wait_seconds": 0.0,    # İsteklerin kuyrukta geçirdiği toplam süre
+            "batch_sizes": {},      # Toplu çağrı boyutu -> adet
+        }
+        self._thread = threading.Thread(target=self._run, daemon=True, name=name)
+        self._thread.start()
+
+    def submit(self, item):
+        """İsteği kuyruğa alır ve sonucunu taşıyacak Future'ı döndürür."""
+        if self._closed:
+            raise RuntimeError("Zamanlayıcı kapatıldı")
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self.metrics["rejected"] += 1
+            raise
+        with self._lock:
+            self.metrics["requests"] += 1
+            self.metrics["max_depth"] = max(self.metrics["max_depth"], self._queue.qsize())
+        return future
+
+    def __call__(self, item, timeout=None):
+        """İsteği gönderir ve sonucunu bekler."""
+        return self.submit(item).result(timeout)
+
+    def _run(self):
+        while True:
+            request = self._queue.get()
+            if request is _STOP:
+                return
+            batch, stop = [request], False
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stop = True
+                    break
+                batch.append(request)
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch):
+        start = time.perf_counter()
+        waited = sum(start - enqueued for _, _, enqueued in batch)
+        try:
+            results = self._call([item for item, _, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"İstek başarısız: {e}")
+                self._fail(batch[0][1], e)
+                return
+            # Hatalı isteği bulmak için istekler tek tek yeniden denenir
+            logger.warning(f"{len(batch)} isteklik toplu çağrı başarısız, istekler tek tek deneniyor: {e}")
+            with self._lock:
+                self.metrics["split_batches"] += 1
+            for item, future, _ in batch:
+                try:
+                    future.set_result(self._call([item])[0])
+                except Exception as item_error:
+                    logger.error(f"İstek başarısız: {item_error}")
+                    self._fail(future, item_error)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+        with self._lock:
+            self.metrics["batches"] += 1
+            self.metrics["last_batch_size"] = len(batch)
+            self.metrics["last_batch_seconds"] = time.perf_counter() - start
+            self.metrics["wait_seconds"] += waited
+            sizes = self.metrics["batch_sizes"]
+            sizes[len(batch)] = sizes.get(len(batch), 0) + 1
+
+    def _call(self, items):
+        results = self.batch_fn(items)
+        if len(results) != len(items):
+            raise ValueError(f"{len(items)} girdi için {len(results)} sonuç döndü")
+        return results
+
+    def _fail(self, future, error):
+        with self._lock:
+            self.metrics["failed"] += 1
+        future.set_exception(error)
+
+    def depth(self):
+        """Kuyrukta bekleyen istek sayısı."""
+        return self._queue.qsize()
+
+    def info(self):
+        with self._lock:
+            info = dict(self.metrics, depth=self._queue.qsize(), batch_sizes=dict(self.metrics["batch_sizes"]))
+        batched = sum(size * count for size, count in info["batch_sizes"].items())
+        info["avg_batch_size"] = round(batched / info["batches"], 2) if info["batches"] else 0.0
+        return info
+
+    def close(self):
+        """Kuyruktaki istekleri işler ve zamanlayıcıyı durdurur."""
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
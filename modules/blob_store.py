@@ -0,0 +1,277 @@
+# modules/blob_store.py
+# Geçmiş kayıtlarının içerikleri için içerik adresli (özetle adreslenen) blob deposu
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+
+from utils.helpers import LRUCache
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Yakın kopya karşılaştırmasında kullanılan kelime penceresi
+SHINGLE_SIZE = 4
+
+
+def content_hash(text):
+    """İçeriğin SHA-256 özeti (blob adresi)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Metindeki ardışık `size` kelimelik pencerelerin özet kümesi."""
+    words = text.lower().split()
+    if len(words) < size:
+        return {hash(" ".join(words))} if words else set()
+    return {hash(" ".join(words[i:i + size])) for i in range(len(words) - size + 1)}
+
+
+def jaccard(a, b):
+    """İki kümenin Jaccard benzerliği (0-1)."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class BlobStore:
+    """
+    Aynı içeriği yalnızca bir kez saklayan blob deposu.
+
+    Bloblar tek bir eklemeli dosyada `<sha256>\\t<JSON metin>` satırları olarak
+    tutulur. Açılışta dosya bir kez taranıp özet -> konum indeksi kurulur
+    (metinler çözülmez); okumalar konuma atlayıp tek satır okur.
+
+    near_duplicate_threshold verilirse yeni içerik aynı gruptaki (nesnedeki)
+    son bloblarla shingle benzerliğine göre karşılaştırılır; eşiği geçen içerik
+    yeni blob yazılmadan var olan bloba bağlanır. Bu durumda küçük farklar
+    saklanmaz, bu yüzden varsayılan olarak kapalıdır.
+
+    Dosyayı başka süreçler de büyütebilir ya da retain() ile yeniden
+    yazabilir: bilinmeyen bir özet istendiğinde ve yazmadan önce dosyanın
+    yeni kısmı indekse eklenir, dosya değiştirilmişse indeks yeniden kurulur.
+    Yazmaların kendi aralarında sıraya girmesi çağıranın (JsonlBackend
+    kilidi) sorumluluğundadır.
+    """
+
+    def __init__(self, path, near_duplicate_threshold=None, recent_per_group=8, cache_size=256):
+        self.path = path
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.recent_per_group = recent_per_group
+        self._cache = LRUCache(maxsize=cache_size)
+        self._lock = threading.Lock()
+        self._index = {}
+        self._recent = {}  # grup -> son blobların (özet, shingle kümesi) listesi
+        self._reader = None
+        self._file_id = None   # İndekslenen dosyanın inode numarası
+        self._indexed = 0      # İndekslenen son tam satırın bittiği konum
+        self.metrics = {"dedup_hits": 0, "near_duplicates": 0, "bytes_written": 0, "bytes_saved": 0,
+                        "blobs_removed": 0, "bytes_freed": 0}
+        self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.path):
+            return
+        self._refresh()
+        # Yarım kalmış son satır kapatılır; sonraki blob yeni satırdan başlar
+        if os.path.getsize(self.path) > self._indexed:
+            with open(self.path, 'ab') as f:
+                f.write(b"\n")
+            self._indexed = os.path.getsize(self.path)
+            logger.warning(f"Yarım kalmış son blob atlanacak: {self.path}")
+
+    def _refresh(self):
+        """Dosyanın yeni eklenen kısmını indekse ekler; dosya değiştirilmişse indeksi baştan kurar."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if st.st_ino != self._file_id:
+            self._index = {}
+            self._indexed = 0
+            self._file_id = st.st_ino
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+        if st.st_size <= self._indexed:
+            return
+        offset = self._indexed
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Yazılmakta olan satır; sonraki taramada okunur
+                ref, sep, _ = line.partition(b"\t")
+                if sep and len(ref) == 64:
+                    self._index.setdefault(ref.decode("ascii"), offset)
+                offset += len(line)
+        self._indexed = offset
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, ref):
+        return ref in self._index
+
+    def _near_duplicate(self, group, content_shingles):
+        """Gruptaki son bloblar içinde eşiği geçen en benzer blobu döndürür."""
+        best, best_score = None, 0.0
+        for ref, candidate in self._recent.get(group, ()):
+            score = jaccard(content_shingles, candidate)
+            if score > best_score:
+                best, best_score = ref, score
+        if best is not None and best_score >= self.near_duplicate_threshold:
+            return best, best_score
+        return None, best_score
+
+    def _remember(self, group, ref, content_shingles):
+        recent = self._recent.setdefault(group, deque(maxlen=self.recent_per_group))
+        if all(existing != ref for existing, _ in recent):
+            recent.append((ref, content_shingles))
+
+    def put_many(self, items, sync=False):
+        """
+        İçerikleri depoya ekler; yalnızca depoda olmayanlar diske yazılır.
+
+        Args:
+            items: (içerik, grup) çiftleri
+            sync: True ise yeni bloblar fsync ile diske yazılır
+
+        Returns:
+            Her içerik için (blob özeti, benzerlik) çifti; benzerlik yalnızca
+            yakın kopya olarak var olan bloba bağlanan içerikler için doludur
+        """
+        results, pending = [], {}
+        with self._lock:
+            self._refresh()
+            for content, group in items:
+                ref = content_hash(content)
+                size = len(content.encode("utf-8"))
+                if ref in self._index or ref in pending:
+                    self.metrics["dedup_hits"] += 1
+                    self.metrics["bytes_saved"] += size
+                    results.append((ref, None))
+                    continue
+
+                content_shingles = None
+                if self.near_duplicate_threshold is not None:
+                    content_shingles = shingles(content)
+                    match, score = self._near_duplicate(group, content_shingles)
+                    if match is not None:
+                        self.metrics["near_duplicates"] += 1
+                        self.metrics["bytes_saved"] += size
+                        results.append((match, round(score, 3)))
+                        continue
+
+                pending[ref] = content
+                if content_shingles is not None:
+                    self._remember(group, ref, content_shingles)
+                results.append((ref, None))
+
+            if pending:
+                self._write(pending, sync)
+        return results
+
+    def _write(self, pending, sync):
+        with open(self.path, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            lines = []
+            for ref, content in pending.items():
+                line = f"{ref}\t{json.dumps(content, ensure_ascii=False)}\n".encode("utf-8")
+                self._index[ref] = offset
+                offset += len(line)
+                lines.append(line)
+            data = b"".join(lines)
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+            self._file_id = os.fstat(f.fileno()).st_ino
+            self._indexed = offset
+        self.metrics["bytes_written"] += len(data)
+
+    def put(self, content, group=None, sync=False):
+        return self.put_many([(content, group)], sync=sync)[0]
+
+    def get(self, ref):
+        """Blob içeriğini döndürür; blob yoksa None."""
+        content = self._cache.get(ref)
+        if content is not None:
+            return content
+        with self._lock:
+            if ref not in self._index or self._reader is None:
+                self._refresh()  # Başka süreçte yazılmış ya da dosya yeniden yazılmış olabilir
+            offset = self._index.get(ref)
+            if offset is None:
+                logger.warning(f"Blob bulunamadı: {ref}")
+                return None
+            if self._reader is None:
+                self._reader = open(self.path, 'rb')
+            self._reader.seek(offset)
+            line = self._reader.readline()
+        content = json.loads(line.partition(b"\t")[2])
+        self._cache.put(ref, content)
+        return content
+
+    def retain(self, refs):
+        """
+        Yalnızca verilen özetlerin bloblarını tutarak dosyayı yeniden yazar
+        (kayıtlarca artık kullanılmayan bloblar silinir; yinelenen satırlar
+        birleştirilir). Çağıran, bu sırada yeni blob yazılmadığını garanti etmelidir.
+
+        Returns:
+            (silinen blob sayısı, kazanılan bayt)
+        """
+        keep = set(refs)
+        with self._lock:
+            self._refresh()
+            if not os.path.exists(self.path):
+                return 0, 0
+            size_before = os.path.getsize(self.path)
+            removed = sum(1 for ref in self._index if ref not in keep)
+
+            tmp_path = self.path + ".tmp"
+            index, offset = {}, 0
+            with open(self.path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                for line in src:
+                    ref, sep, _ = line.partition(b"\t")
+                    ref = ref.decode("ascii", "replace")
+                    if not sep or not line.endswith(b"\n") or ref not in keep or ref in index:
+                        continue
+                    index[ref] = offset
+                    dst.write(line)
+                    offset += len(line)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp_path, self.path)
+
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+            self._index = index
+            self._indexed = offset
+            self._file_id = os.stat(self.path).st_ino
+            for group, recent in self._recent.items():
+                self._recent[group] = deque(((ref, s) for ref, s in recent if ref in index),
+                                            maxlen=self.recent_per_group)
+            freed = size_before - offset
+            self.metrics["blobs_removed"] += removed
+            self.metrics["bytes_freed"] += freed
+        if removed:
+            logger.info(f"{removed} kullanılmayan blob silindi ({freed} bayt): {self.path}")
+        return removed, freed
+
+    def info(self):
+        with self._lock:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            return dict(self.metrics, blobs=len(self._index), bytes=size)
+
+    def close(self):
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
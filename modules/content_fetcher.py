@@ -0,0 +1,116 @@
+# modules/content_fetcher.py
+# Arama sonucu sayfalarını paralel indirip ana metni çıkarma
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from modules import http_client
+from modules.html_parser import extract_main_text
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+
+class ContentFetcher:
+    """
+    Sonuç sayfalarını eşzamanlı indirip ana metinlerini çıkarır.
+
+    Her sayfa için bayt sınırı, aynı siteye eşzamanlı istek sınırı ve tüm
+    işlem için ortak bir süre sınırı uygulanır; süreyi aşan sayfalar atlanır.
+    """
+
+    def __init__(self, max_workers=6, max_bytes=512 * 1024, max_chars=4000,
+                 deadline=6.0, per_host_limit=2, timeout=(3.05, 5)):
+        """
+        Args:
+            max_workers: Aynı anda indirilecek en fazla sayfa sayısı
+            max_bytes: Sayfa başına okunacak en fazla bayt
+            max_chars: Sayfa başına çıkarılacak en fazla karakter
+            deadline: Tüm sayfalar için toplam süre sınırı (saniye)
+            per_host_limit: Aynı siteye eşzamanlı en fazla istek (nezaket sınırı)
+            timeout: Sayfa başına (bağlantı, okuma) zaman aşımı
+        """
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.deadline = deadline
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="content-fetch")
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def fetch_all(self, urls):
+        """
+        Sayfaları paralel indirir.
+
+        Returns:
+            {url: ana metin} sözlüğü (süre içinde tamamlanamayan veya boş sayfalar olmadan)
+        """
+        urls = [url for url in dict.fromkeys(urls) if url and url.startswith(('http://', 'https://'))]
+        if not urls:
+            return {}
+
+        stop_at = time.monotonic() + self.deadline
+        futures = {self._executor.submit(self._fetch, url, stop_at): url for url in urls}
+        done, not_done = wait(futures, timeout=self.deadline)
+
+        for future in not_done:
+            future.cancel()
+        if not_done:
+            logger.info(f"Süre sınırında tamamlanamayan {len(not_done)} sayfa atlandı")
+
+        texts = {}
+        for future in done:
+            try:
+                text = future.result()
+            except Exception as e:
+                logger.warning(f"Sayfa içeriği alınamadı: {futures[future]} - {e}")
+                continue
+            if text:
+                texts[futures[future]] = text
+        return texts
+
+    def _fetch(self, url, stop_at):
+        """Tek bir sayfayı bayt ve süre sınırıyla akış halinde okuyup ana metni çıkarır."""
+        with self._host_limit(url):
+            if time.monotonic() >= stop_at:
+                return None
+
+            response = http_client.get(url, stream=True, timeout=self.timeout,
+                                       headers={'User-Agent': USER_AGENT})
+            try:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', 'text/html').lower()
+                if 'html' not in content_type:
+                    return None
+                # Karakter seti başlıkta yoksa requests ISO-8859-1 varsayar; UTF-8 daha olası
+                encoding = response.encoding if 'charset' in content_type else 'utf-8'
+
+                def limited_chunks():
+                    read = 0
+                    for chunk in response.iter_content(chunk_size=16 * 1024):
+                        yield chunk
+                        read += len(chunk)
+                        if read >= self.max_bytes or time.monotonic() >= stop_at:
+                            break
+
+                return extract_main_text(limited_chunks(), encoding, self.max_chars)
+            finally:
+                response.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -3,34 +3,1158 @@
 # modules/data_storage.py
 # Ayşenur Arslan - 16.04.2025
 
+import atexit
+import gzip
+import hashlib
+import io
 import json
 import os
-from datetime import datetime
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
 import logging
 
+import config
+from modules import metrics
+from modules.blob_store import BlobStore
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 # Loglama ayarları
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def migrate_json_array(legacy_file, storage_file):
+    """
+    Eski JSON dizisi biçimindeki geçmişi JSON Lines dosyasına bir kez taşır.
+
+    Yeni dosya zaten varsa hiçbir şey yapılmaz; eski dosya silinmez.
+
+    Returns:
+        Taşınan kayıt sayısı
+    """
+    if os.path.exists(storage_file) or not os.path.exists(legacy_file):
+        return 0
+
+    with open(legacy_file, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    # Yarıda kalan taşıma yarım bir dosya bırakmasın
+    tmp_file = storage_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, storage_file)
+
+    logger.info(f"{len(entries)} kayıt {legacy_file} dosyasından {storage_file} dosyasına taşındı")
+    return len(entries)
+
+
+def _iso(value):
+    """datetime veya ISO metnini karşılaştırılabilir ISO metnine çevirir."""
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
+
+
+def _fold(text):
+    """Türkçe büyük/küçük harf farkını kaldırır (I -> ı, İ -> i)."""
+    return text.replace("İ", "i").replace("I", "ı").lower()
+
+
+def _matches(entry, object_name=None, since=None, until=None):
+    timestamp = entry.get("timestamp", "")
+    return ((object_name is None or entry.get("object") == object_name)
+            and (since is None or timestamp >= since)
+            and (until is None or timestamp < until))
+
+
+# Geçmiş dosyası sondan okunurken bir seferde okunan bayt sayısı
+REVERSE_READ_BLOCK = 64 * 1024
+
+# Etkin dosya bu boyuta ulaşınca sıkıştırılmış bir bölüte taşınır
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+
+
+def _iter_reverse_lines(f, end=None):
+    """
+    İkili dosyayı sondan başa bloklar halinde okuyup (satır başı konumu, satır) çiftleri üretir.
+
+    Okunan miktar istenen satır sayısıyla orantılıdır, dosya boyutundan bağımsızdır.
+    """
+    pos = f.seek(0, os.SEEK_END) if end is None else end
+    remainder = b""  # Başı henüz okunmamış satır parçası
+    while pos > 0:
+        read_size = min(REVERSE_READ_BLOCK, pos)
+        pos -= read_size
+        f.seek(pos)
+        lines = (f.read(read_size) + remainder).split(b"\n")
+        remainder = lines[0]
+        line_end = pos + len(remainder)
+        complete = []
+        for line in lines[1:]:
+            complete.append((line_end + 1, line))
+            line_end += 1 + len(line)
+        yield from reversed(complete)
+    if remainder:
+        yield 0, remainder
+
+
+def _entry_key(entry):
+    """Aynı nesne, anahtar kelime ve içeriğe (ya da içerik blobuna) sahip kayıtlar için ortak özet."""
+    content = entry.get("content_ref", entry.get("content"))
+    data = json.dumps([entry.get("object"), entry.get("keywords"), content], ensure_ascii=False)
+    return hashlib.sha1(data.encode("utf-8")).digest()
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _lock_file(f, blocking=True):
+    """Dosyaya süreçler arası özel kilit koyar; blocking=False iken kilit alınamazsa BlockingIOError."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return
+    while True:
+        try:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            if not blocking:
+                raise BlockingIOError(f"Kilit başka bir süreçte: {f.name}")
+            time.sleep(0.05)
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class HistoryLockedError(RuntimeError):
+    """Geçmiş başka bir süreç tarafından sıkıştırılırken yeni sıkıştırma istendi."""
+
+
+class InterProcessLock:
+    """
+    Aynı iş parçacığında iç içe alınabilen, süreçler arasında da geçerli kilit.
+
+    İş parçacıkları RLock ile, süreçler kilit dosyası üzerindeki flock
+    (Windows'ta msvcrt.locking) ile sıraya girer; dosya kilidi yalnızca en
+    dıştaki acquire() ile alınıp en dıştaki release() ile bırakılır.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self, blocking=True):
+        if not self._lock.acquire(blocking):
+            return False
+        if self._depth == 0:
+            try:
+                if self._file is None:
+                    if os.path.dirname(self.path):
+                        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self._file = open(self.path, 'a+b')
+                _lock_file(self._file, blocking)
+            except BlockingIOError:
+                self._lock.release()
+                return False
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            _unlock_file(self._file)
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+    def close(self):
+        with self._lock:
+            if self._file is not None and self._depth == 0:
+                self._file.close()
+                self._file = None
+
+
+class JsonlBackend:
+    """
+    Her kaydı etkin dosyanın sonuna tek satır olarak ekleyen saklama katmanı.
+
+    Kayıt maliyeti geçmişin boyutundan bağımsızdır. Yazma sırasında çökme
+    olursa yalnızca son satır yarım kalır; okumada atlanır ve sonraki kayıt
+    yeni bir satırdan başlar.
+
+    Etkin dosya max_segment_bytes boyutuna (ya da en eski kaydı
+    max_segment_age saniyeye) ulaşınca gzip ile sıkıştırılmış bir bölüte
+    taşınır. Bölütler `<dosya>.segments/` altında, sıraları ve özetleri
+    manifest.json dosyasında tutulur. Okuyucular bölütleri gerektikçe açar;
+    compact() eski bölütlerdeki yinelenen ve süresi dolmuş kayıtları atar.
+
+    dedupe_content ise içerik `<dosya>.blobs` deposuna bir kez yazılır ve
+    kayıtta yalnızca özeti (content_ref) tutulur; okumada içerik geri konur.
+
+    Aynı geçmişi birden fazla süreç (uygulama, sunucu, compact_history.py)
+    kullanabilir: yazma, taşıma ve manifest güncellemeleri `<dosya>.lock`
+    üzerindeki süreçler arası kilitle sıraya girer ve manifest her
+    değişiklikten önce diskten yeniden okunur. Aynı anda tek bir compact()
+    çalışabilir (`<dosya>.compact.lock`).
+    """
+
+    def __init__(self, path, max_segment_bytes=DEFAULT_SEGMENT_BYTES, max_segment_age=None,
+                 dedupe_content=False, near_duplicate_threshold=None):
+        self.path = path
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.segment_dir = os.path.splitext(path)[0] + ".segments"
+        self.manifest_path = os.path.join(self.segment_dir, "manifest.json")
+        self.dedupe_content = dedupe_content
+        base = os.path.splitext(path)[0]
+        self._lock = InterProcessLock(base + ".lock")
+        self._compaction_lock = InterProcessLock(base + ".compact.lock")
+        self._manifest = None
+        self._manifest_stamp = None
+        self._active_started = None
+        with self._lock:
+            # Özellik kapatılsa da önceden yazılmış içerik özetleri çözülebilmeli
+            blob_path = base + ".blobs"
+            self.blobs = None
+            if dedupe_content or os.path.exists(blob_path):
+                self.blobs = BlobStore(blob_path, near_duplicate_threshold=near_duplicate_threshold)
+            self._refresh_manifest()
+            self._recover_rotation()
+            self._terminate_partial_line()
+
+    # --- Manifest ve bölütler ---
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"next_seq": 1, "generation": 0, "segments": []}
+
+    def _manifest_file_stamp(self):
+        try:
+            st = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _refresh_manifest(self):
+        """Manifest başka bir süreçte değiştiyse yeniden okur (kilit altında çağrılır)."""
+        stamp = self._manifest_file_stamp()
+        if self._manifest is None or stamp != self._manifest_stamp:
+            self._manifest = self._load_manifest()
+            self._manifest_stamp = stamp
+            self._active_started = None  # Etkin dosya başka süreçte taşınmış olabilir
+
+    def _save_manifest(self):
+        os.makedirs(self.segment_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_stamp = self._manifest_file_stamp()
+
+    @property
+    def segments(self):
+        """Bölüt özetleri (eskiden yeniye)."""
+        with self._lock:
+            self._refresh_manifest()
+            return list(self._manifest["segments"])
+
+    def _segment_path(self, segment):
+        return os.path.join(self.segment_dir, segment["file"])
+
+    def _write_segment(self, name, data, entries_count, first, last, seq):
+        """Satırları sıkıştırılmış bölüt dosyasına atomik olarak yazar ve özetini döndürür."""
+        os.makedirs(self.segment_dir, exist_ok=True)
+        path = os.path.join(self.segment_dir, name)
+        with open(path + ".tmp", 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) as gz:
+                gz.write(data)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(path + ".tmp", path)
+        return {
+            "seq": seq,
+            "file": name,
+            "count": entries_count,
+            "first_timestamp": first,
+            "last_timestamp": last,
+            "raw_bytes": len(data),
+            "bytes": os.path.getsize(path),
+        }
+
+    @staticmethod
+    def _summarize_lines(data):
+        """Satırların sayısını, ilk ve son kaydın zamanını döndürür."""
+        lines = [line for line in data.split(b"\n") if line.strip()]
+
+        def timestamp(line):
+            try:
+                return json.loads(line).get("timestamp")
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return None
+
+        if not lines:
+            return 0, None, None
+        return len(lines), timestamp(lines[0]), timestamp(lines[-1])
+
+    def _rotating_path(self):
+        return self.path + ".rotating"
+
+    def _recover_rotation(self):
+        """Yarıda kalmış bir bölüt taşımasını tamamlar."""
+        rotating = self._rotating_path()
+        if not os.path.exists(rotating):
+            return
+        segments = self._manifest["segments"]
+        if segments and segments[-1]["seq"] == self._manifest["next_seq"] - 1 \
+                and segments[-1]["raw_bytes"] == os.path.getsize(rotating):
+            os.remove(rotating)  # Manifest güncellenmiş, yalnızca silme kalmış
+            return
+        logger.warning(f"Yarıda kalan bölüt taşıması tamamlanıyor: {rotating}")
+        self._finish_rotation(rotating)
+
+    def rotate(self):
+        """Etkin dosyayı sıkıştırılmış yeni bir bölüte taşır."""
+        with self._lock:
+            self._refresh_manifest()
+            if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                return None
+            rotating = self._rotating_path()
+            os.replace(self.path, rotating)
+            return self._finish_rotation(rotating)
+
+    def _finish_rotation(self, rotating):
+        with open(rotating, 'rb') as f:
+            data = f.read()
+        if data and not data.endswith(b"\n"):
+            data += b"\n"
+        seq = self._manifest["next_seq"]
+        count, first, last = self._summarize_lines(data)
+        segment = self._write_segment(f"history-{seq:06d}.jsonl.gz", data, count, first, last, seq)
+
+        self._manifest["segments"].append(segment)
+        self._manifest["next_seq"] = seq + 1
+        self._save_manifest()
+        os.remove(rotating)
+        self._active_started = None
+        logger.info(f"Geçmiş bölüte taşındı: {segment['file']} ({count} kayıt, "
+                    f"{segment['raw_bytes']} -> {segment['bytes']} bayt)")
+        return segment
+
+    def _should_rotate(self, size):
+        if size >= self.max_segment_bytes:
+            return True
+        if self.max_segment_age is None or size == 0:
+            return False
+        if self._active_started is None:
+            with open(self.path, 'rb') as f:
+                first_line = f.readline()
+            try:
+                self._active_started = _parse_timestamp(json.loads(first_line).get("timestamp")) or time.time()
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                self._active_started = time.time()
+        return time.time() - self._active_started >= self.max_segment_age
+
+    # --- Yazma ---
+
+    def _terminate_partial_line(self):
+        """Dosya yarım bir satırla bitiyorsa sonraki kaydın ona eklenmemesi için satırı kapatır."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+                logger.warning(f"Yarım kalmış son kayıt atlanacak: {self.path}")
+
+    def append(self, entry):
+        self.extend([entry], sync=False)
+
+    def _store_contents(self, entries, sync):
+        """İçerikleri blob deposuna yazar, kayıtlarda içerik yerine özetini bırakır."""
+        contents = [(entry["content"], entry.get("object")) for entry in entries
+                    if isinstance(entry.get("content"), str)]
+        refs = iter(self.blobs.put_many(contents, sync=sync))
+        stored = []
+        for entry in entries:
+            if not isinstance(entry.get("content"), str):
+                stored.append(entry)
+                continue
+            ref, similarity = next(refs)
+            entry = {key: value for key, value in entry.items() if key != "content"}
+            entry["content_ref"] = ref
+            if similarity is not None:
+                entry["content_similarity"] = similarity
+            stored.append(entry)
+        return stored
+
+    def extend(self, entries, sync=False):
+        """Kayıtları tek yazmayla ekler; sync ise diske yazıldığı fsync ile garanti edilir."""
+        with self._lock:
+            if self.dedupe_content:
+                # Bloblar kayıtlardan önce ve aynı kilit altında yazılır; kayıt hiçbir
+                # zaman eksik bloba işaret etmez ve compact() yazılmakta olan blobu silmez
+                entries = self._store_contents(entries, sync)
+            data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(data)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+                size = f.tell()
+            if self._should_rotate(size):
+                self.rotate()
+
+    # --- Okuma ---
+
+    def _sources(self):
+        """(sıra no, açıcı) çiftleri; eskiden yeniye, en sonda etkin dosya."""
+        with self._lock:
+            self._refresh_manifest()
+            segments = list(self._manifest["segments"])
+            active_seq = self._manifest["next_seq"]
+        sources = [(segment["seq"], lambda s=segment: gzip.open(self._segment_path(s), 'rb'))
+                   for segment in segments]
+        if os.path.exists(self.path):
+            sources.append((active_seq, lambda: open(self.path, 'rb')))
+        return sources
+
+    @staticmethod
+    def _decode(line, path):
+        try:
+            return json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            logger.warning(f"Bozuk kayıt satırı atlandı: {path}")
+            return None
+
+    def _resolve(self, entry):
+        """İçerik özeti taşıyan kaydın içeriğini blob deposundan geri koyar (iç alanlar çıkarılır)."""
+        entry.pop("content_similarity", None)
+        ref = entry.pop("content_ref", None)
+        if ref is not None:
+            entry["content"] = self.blobs.get(ref) if self.blobs is not None else None
+        return entry
+
+    def __iter__(self):
+        """Kayıtları eskiden yeniye okur; bölütler sırası gelince açılır (bozuk satırlar atlanır)."""
+        for _, opener in self._sources():
+            try:
+                with opener() as f:
+                    for line in f:
+                        if line.strip():
+                            entry = self._decode(line, self.path)
+                            if entry is not None:
+                                yield self._resolve(entry)
+            except FileNotFoundError:
+                continue  # Okurken sıkıştırma ile değiştirilmiş bölüt
+
+    def iter_reverse(self, before=None):
+        """
+        Kayıtları yeniden eskiye (konumlarıyla) okur.
+
+        Etkin dosya sondan okunur; daha eski kayıt gerekirse bölütler yeniden
+        eskiye birer birer açılır.
+
+        Args:
+            before: Yalnızca bu konumdan önceki kayıtlar (sayfalama imleci)
+
+        Yields:
+            ((sıra no, satır başı konumu), kayıt) çiftleri
+        """
+        before_seq, before_offset = before if before is not None else (None, None)
+        for seq, opener in reversed(self._sources()):
+            if before_seq is not None and seq > before_seq:
+                continue
+            end = before_offset if seq == before_seq else None
+            try:
+                with opener() as f:
+                    if isinstance(f, gzip.GzipFile):
+                        # Sıkıştırılmış bölüt (en fazla max_segment_bytes) bellekte açılır
+                        f = io.BytesIO(f.read())
+                    for offset, line in _iter_reverse_lines(f, end):
+                        if line.strip():
+                            entry = self._decode(line, self.path)
+                            if entry is not None:
+                                yield (seq, offset), self._resolve(entry)
+            except FileNotFoundError:
+                continue
+
+    def tail(self, limit):
+        """Son `limit` kaydı eskiden yeniye döndürür (dosyanın sonundan okunur)."""
+        entries, _ = self.page(limit)
+        return entries[::-1]
+
+    def page(self, limit=20, cursor=None):
+        """
+        Geçmişi yeniden eskiye sayfa sayfa döndürür.
+
+        Args:
+            limit: Sayfadaki kayıt sayısı
+            cursor: Önceki sayfanın döndürdüğü imleç (None: en yeni kayıtlar).
+                compact() sonrasında eski imleçler geçersiz olur.
+
+        Returns:
+            (kayıtlar, sonraki imleç) - daha eski kayıt yoksa imleç None olur
+        """
+        if limit <= 0:
+            return [], cursor
+        entries, position = [], None
+        for position, entry in self.iter_reverse(cursor):
+            entries.append(entry)
+            if len(entries) == limit:
+                break
+        return entries, (position if len(entries) == limit else None)
+
+    def find(self, object_name=None, since=None, until=None, limit=100):
+        """Nesne adı ve zaman aralığına göre kayıtları yeniden eskiye döndürür (tüm dosyayı tarar)."""
+        since, until = _iso(since), _iso(until)
+        matches = [entry for entry in self if _matches(entry, object_name, since, until)]
+        matches.sort(key=lambda entry: entry.get("timestamp", ""), reverse=True)
+        return matches[:limit]
+
+    def latest(self, object_name, since=None):
+        """
+        Nesnenin en yeni kaydını döndürür; yoksa None.
+
+        Dosya sondan okunur ve `since` öncesine inilince durulur (kayıtlar zaman
+        sırasıyla eklendiği için), böylece yalnızca zaman penceresi taranır.
+        """
+        since = _iso(since)
+        for _, entry in self.iter_reverse():
+            if since is not None and (entry.get("timestamp") or "") < since:
+                return None
+            if entry.get("object") == object_name:
+                return entry
+        return None
+
+    def search(self, text, limit=20, object_name=None, by_relevance=False):
+        """
+        İçerik veya anahtar kelimelerinde tüm kelimeler geçen kayıtları yeniden eskiye
+        döndürür (tüm dosyayı tarar; by_relevance bu katmanda kullanılmaz).
+        """
+        words = _fold(text).split()
+        if not words:
+            return []
+        matches = []
+        for _, entry in self.iter_reverse():
+            if object_name is not None and entry.get("object") != object_name:
+                continue
+            haystack = _fold((entry.get("content") or "") + " " + " ".join(entry.get("keywords") or []))
+            if all(word in haystack for word in words):
+                matches.append(entry)
+                if len(matches) == limit:
+                    break
+        return matches
+
+    # --- Sıkıştırma ---
+
+    def _iter_segments(self, segments):
+        for segment in segments:
+            with gzip.open(self._segment_path(segment), 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        entry = self._decode(line, segment["file"])
+                        if entry is not None:
+                            yield entry
+
+    def _active_refs(self):
+        """Etkin dosyadaki kayıtların içerik özetleri."""
+        refs = set()
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    if b'"content_ref"' in line:
+                        entry = self._decode(line, self.path)
+                        if entry is not None and "content_ref" in entry:
+                            refs.add(entry["content_ref"])
+        return refs
+
+    def compact(self, max_age=None, dedupe=True):
+        """
+        Bölütleri yeniden yazar: yinelenen kayıtlardan yalnızca en yenisi, max_age
+        saniyeden yeni kayıtlar tutulur. Etkin dosyaya dokunulmaz; yazmalar (başka
+        süreçlerdeki dahil) sıkıştırma sürerken devam edebilir. İçerik deposu
+        kullanılıyorsa hiçbir kaydın artık işaret etmediği bloblar silinir.
+
+        Raises:
+            HistoryLockedError: Başka bir süreç veya iş parçacığı zaten sıkıştırıyorsa
+
+        Returns:
+            Kayıt ve bayt sayılarını içeren özet sözlüğü
+        """
+        if not self._compaction_lock.acquire(blocking=False):
+            raise HistoryLockedError(f"Geçmiş başka bir işlem tarafından sıkıştırılıyor: {self.path}")
+        try:
+            return self._compact(max_age, dedupe)
+        finally:
+            self._compaction_lock.release()
+
+    def _compact(self, max_age, dedupe):
+        with self._lock:
+            self._refresh_manifest()
+            segments = list(self._manifest["segments"])
+            generation = self._manifest.get("generation", 0) + 1
+        stats = {"segments_before": len(segments), "entries_before": 0, "expired": 0, "duplicates": 0,
+                 "bytes_before": sum(segment["bytes"] for segment in segments)}
+        if not segments:
+            return dict(stats, segments_after=0, entries_after=0, bytes_after=0)
+
+        cutoff = (datetime.now() - timedelta(seconds=max_age)).isoformat() if max_age is not None else None
+
+        # 1. geçiş: her içeriğin son görüldüğü sıra
+        last_seen = {}
+        if dedupe:
+            for position, entry in enumerate(self._iter_segments(segments)):
+                last_seen[_entry_key(entry)] = position
+
+        # 2. geçiş: tutulacak kayıtları yeni bölütlere yaz (eski sıra numaraları yeniden kullanılır)
+        seqs = [segment["seq"] for segment in segments]
+        new_segments, buffer, buffered, first, last = [], [], 0, None, None
+        refs = set()  # Kalan kayıtların işaret ettiği bloblar
+
+        def write_buffer():
+            seq = seqs[len(new_segments)]
+            data = b"".join(buffer)
+            new_segments.append(self._write_segment(f"history-{seq:06d}-c{generation}.jsonl.gz",
+                                                    data, len(buffer), first, last, seq))
+
+        for position, entry in enumerate(self._iter_segments(segments)):
+            stats["entries_before"] += 1
+            if cutoff is not None and (entry.get("timestamp") or "") < cutoff:
+                stats["expired"] += 1
+                continue
+            if dedupe and last_seen.get(_entry_key(entry)) != position:
+                stats["duplicates"] += 1
+                continue
+            if "content_ref" in entry:
+                refs.add(entry["content_ref"])
+            line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+            # Sıra numarası kaldıkça bölüt boyutu aşılınca yeni bölüte geç
+            if buffer and buffered + len(line) > self.max_segment_bytes and len(new_segments) + 1 < len(seqs):
+                write_buffer()
+                buffer, buffered, first = [], 0, None
+            buffer.append(line)
+            buffered += len(line)
+            first = first or entry.get("timestamp")
+            last = entry.get("timestamp")
+        if buffer:
+            write_buffer()
+
+        with self._lock:
+            # Manifest diskten yeniden okunur; sıkıştırma sürerken (bu ya da başka
+            # bir süreçte) eklenen bölütler korunur
+            self._refresh_manifest()
+            compacted = {segment["file"] for segment in segments}
+            added = [segment for segment in self._manifest["segments"] if segment["file"] not in compacted]
+            self._manifest["segments"] = new_segments + added
+            self._manifest["generation"] = generation
+            self._save_manifest()
+            if self.blobs is not None:
+                # Bloblar kayıtlarla aynı kilit altında yazıldığından burada yeni blob
+                # yazılamaz; eklenen bölütlerin ve etkin dosyanın blobları da tutulur
+                refs.update(entry["content_ref"] for entry in self._iter_segments(added)
+                            if "content_ref" in entry)
+                refs.update(self._active_refs())
+                stats["blobs_removed"], stats["blob_bytes_freed"] = self.blobs.retain(refs)
+        for segment in segments:
+            try:
+                os.remove(self._segment_path(segment))
+            except FileNotFoundError:
+                pass
+
+        stats.update(segments_after=len(new_segments),
+                     entries_after=sum(segment["count"] for segment in new_segments),
+                     bytes_after=sum(segment["bytes"] for segment in new_segments))
+        logger.info(f"Geçmiş sıkıştırıldı: {stats}")
+        return stats
+
+    def close(self):
+        if self.blobs is not None:
+            self.blobs.close()
+        self._lock.close()
+        self._compaction_lock.close()
+
+
+class SqliteBackend:
+    """
+    Geçmişi indeksli bir SQLite veritabanında tutan saklama katmanı.
+
+    Nesne adı ve zaman üzerinde indeksler, içerik ve anahtar kelimeler üzerinde
+    içeriksiz (contentless) bir FTS5 indeksi bulunur; metin yalnızca ana tabloda
+    saklanır. WAL kipinde okumalar yazmaları beklemez; her iş parçacığı kendi
+    bağlantısını kullanır, yazmalar tek kilit altında yapılır.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                object TEXT,
+                keywords TEXT,
+                content TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_analyses_object_time ON analyses (object, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_analyses_time ON analyses (timestamp);
+        """)
+        try:
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts "
+                         "USING fts5(content, keywords, content='')")
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 kullanılamıyor, metin araması LIKE ile yapılacak: {e}")
+            self.has_fts = False
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row_to_entry(row):
+        return {
+            "timestamp": row[0],
+            "object": row[1],
+            "keywords": json.loads(row[2]) if row[2] else [],
+            "content": row[3],
+        }
+
+    def _insert(self, conn, entry):
+        keywords = entry.get("keywords") or []
+        cursor = conn.execute(
+            "INSERT INTO analyses (timestamp, object, keywords, content) VALUES (?, ?, ?, ?)",
+            (entry.get("timestamp"), entry.get("object"),
+             json.dumps(keywords, ensure_ascii=False), entry.get("content")),
+        )
+        if self.has_fts:
+            conn.execute("INSERT INTO analyses_fts (rowid, content, keywords) VALUES (?, ?, ?)",
+                         (cursor.lastrowid, _fold(entry.get("content") or ""), _fold(" ".join(keywords))))
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def extend(self, entries, sync=True):
+        """Kayıtları tek bir işlemde ekler (commit her durumda yapılır)."""
+        conn = self._conn()
+        with self._write_lock:
+            with conn:
+                for entry in entries:
+                    self._insert(conn, entry)
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def __iter__(self):
+        cursor = self._conn().execute("SELECT timestamp, object, keywords, content FROM analyses ORDER BY id")
+        for row in cursor:
+            yield self._row_to_entry(row)
+
+    def tail(self, limit):
+        if limit <= 0:
+            return []
+        rows = self._conn().execute(
+            "SELECT timestamp, object, keywords, content FROM analyses ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self._row_to_entry(row) for row in reversed(rows)]
+
+    def page(self, limit=20, cursor=None):
+        """Geçmişi yeniden eskiye sayfa sayfa döndürür; imleç son kaydın id'sidir."""
+        if limit <= 0:
+            return [], cursor
+        condition, params = ("WHERE id < ?", [cursor]) if cursor is not None else ("", [])
+        rows = self._conn().execute(
+            f"SELECT id, timestamp, object, keywords, content FROM analyses {condition} "
+            f"ORDER BY id DESC LIMIT ?", params + [limit]
+        ).fetchall()
+        next_cursor = rows[-1][0] if len(rows) == limit else None
+        return [self._row_to_entry(row[1:]) for row in rows], next_cursor
+
+    def find(self, object_name=None, since=None, until=None, limit=100):
+        """Nesne adı ve zaman aralığına göre kayıtları yeniden eskiye döndürür."""
+        conditions, params = [], []
+        if object_name is not None:
+            conditions.append("object = ?")
+            params.append(object_name)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(_iso(since))
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(_iso(until))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._conn().execute(
+            f"SELECT timestamp, object, keywords, content FROM analyses {where} "
+            f"ORDER BY timestamp DESC LIMIT ?", params + [limit]
+        ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def latest(self, object_name, since=None):
+        """Nesnenin en yeni kaydını döndürür (nesne/zaman indeksiyle); yoksa None."""
+        entries = self.find(object_name=object_name, since=since, limit=1)
+        return entries[0] if entries else None
+
+    def search(self, text, limit=20, object_name=None, by_relevance=False):
+        """
+        İçerik ve anahtar kelimelerde tüm kelimeler geçen kayıtları döndürür.
+
+        Varsayılan sıralama yeniden eskiyedir; FTS5 indeksi rowid sırasıyla
+        gezildiği için LIMIT'e ulaşınca durulur. by_relevance=True ise BM25
+        puanına göre sıralanır (tüm eşleşmeler puanlandığından daha yavaştır).
+        """
+        words = _fold(text).split()
+        if not words:
+            return []
+        object_filter = "AND a.object = ?" if object_name is not None else ""
+        object_params = [object_name] if object_name is not None else []
+
+        if self.has_fts:
+            # Kelimeler FTS sorgu sözdizimi olarak yorumlanmasın diye tırnak içine alınır
+            match = " ".join('"' + word.replace('"', '""') + '"' for word in words)
+            rows = self._conn().execute(
+                "SELECT a.timestamp, a.object, a.keywords, a.content FROM analyses_fts f "
+                f"JOIN analyses a ON a.id = f.rowid WHERE analyses_fts MATCH ? {object_filter} "
+                f"ORDER BY {'f.rank' if by_relevance else 'f.rowid DESC'} LIMIT ?",
+                [match] + object_params + [limit]
+            ).fetchall()
+        else:
+            conditions = " AND ".join("(lower(a.content) LIKE ? OR lower(a.keywords) LIKE ?)" for _ in words)
+            params = [f"%{word}%" for word in words for _ in range(2)]
+            rows = self._conn().execute(
+                f"SELECT a.timestamp, a.object, a.keywords, a.content FROM analyses a "
+                f"WHERE {conditions} {object_filter} ORDER BY a.id DESC LIMIT ?",
+                params + object_params + [limit]
+            ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+BACKENDS = {
+    "jsonl": JsonlBackend,
+    "sqlite": SqliteBackend,
+}
+
+# Saklama katmanına göre varsayılan dosya
+DEFAULT_FILES = {
+    "jsonl": "data/history.jsonl",
+    "sqlite": "data/history.db",
+}
+
+
+# Yazma kuyruğunda toplu yazmayı hemen başlatan / yazıcıyı durduran işaretler
+_FLUSH = object()
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """
+    Kayıtları sınırlı bir bellek kuyruğunda toplayıp arka planda toplu yazan yazıcı.
+
+    Bir toplu yazma, batch_size kayda ulaşınca ya da ilk kayıttan bu yana
+    flush_interval saniye geçince yapılır; her toplu yazmada bir kez fsync
+    edilir. Kuyruk doluysa kaydeden taraf yer açılana kadar bekletilir (geri
+    basınç; her put_timeout saniyede bir uyarı yazılır). Kayıt tek başına
+    doğrudan yazılmaz: dosya zaman sırasını korumalıdır, çünkü latest() sondan
+    okurken ilk eski kayıtta durur. Yazıcı çalışmıyorsa bekleyen tüm kayıtlar
+    sırayla doğrudan yazılır.
+
+    Henüz diske yazılmamış kayıtlar pending() ile okunabilir; okuyucular
+    yazıcıyı beklemeden bunları diskteki kayıtlarla birleştirir. close()
+    sonrasında gelen kayıtlar doğrudan yazılır.
+    """
+
+    def __init__(self, backend, max_queue=1000, batch_size=64, flush_interval=1.0, put_timeout=5.0):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._lock = threading.Lock()
+        # close() _STOP'u kuyruğa koyduktan sonra hiçbir kayıt kuyruğa giremez
+        self._put_lock = threading.Lock()
+        self._pending = deque()  # Kuyrukta veya yazılmakta olan kayıtlar (kuyruk sırasıyla)
+        self.metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "failed": 0,
+            "queue_full": 0,       # Kuyruk dolu bulunduğu için bekletilen kayıtlar
+            "sync_writes": 0,      # Kapanıştan sonra ya da yazıcı durmuşken doğrudan yazılanlar
+            "max_depth": 0,
+            "last_batch_size": 0,
+            "last_batch_seconds": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, daemon=True, name="history-writer")
+        self._thread.start()
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.metrics[name] += value
+
+    def put(self, entry):
+        with self._put_lock:
+            if self._closed:
+                self.backend.extend([entry], sync=True)
+                self._count("sync_writes")
+                return
+
+            # Yazıcı kaydı diske yazana kadar okuyucular onu bekleyenlerde görür
+            with self._lock:
+                self._pending.append(entry)
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                self._count("queue_full")
+                logger.warning(f"Kayıt kuyruğu dolu ({self._queue.maxsize}), yazıcı bekleniyor")
+                while True:
+                    try:
+                        self._queue.put(entry, timeout=self.put_timeout)
+                        break
+                    except queue.Full:
+                        if not self._thread.is_alive():
+                            logger.error("Kayıt yazıcısı durmuş, bekleyen kayıtlar doğrudan yazılıyor")
+                            self._write_pending()
+                            return
+                        logger.warning(f"Kayıt kuyruğu {self.put_timeout} saniyedir boşalmadı, bekleniyor")
+
+        with self._lock:
+            self.metrics["enqueued"] += 1
+            self.metrics["max_depth"] = max(self.metrics["max_depth"], self._queue.qsize())
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            if item is _FLUSH:
+                self._queue.task_done()
+                continue
+
+            batch, markers, stop = [item], 0, False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _FLUSH or item is _STOP:
+                    markers += 1
+                    stop = item is _STOP
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            for _ in range(len(batch) + markers):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch):
+        start = time.perf_counter()
+        try:
+            with metrics.timer("stage_seconds", stage="store_batch"):
+                self.backend.extend(batch, sync=True)
+        except Exception as e:
+            logger.error(f"{len(batch)} kayıt yazılamadı: {e}")
+            with self._lock:
+                self._drop_pending(len(batch))
+                self.metrics["failed"] += len(batch)
+            return
+        with self._lock:
+            self._drop_pending(len(batch))
+            self.metrics["written"] += len(batch)
+            self.metrics["batches"] += 1
+            self.metrics["last_batch_size"] = len(batch)
+            self.metrics["last_batch_seconds"] = time.perf_counter() - start
+
+    def _write_pending(self):
+        """Yazıcı yokken bekleyen tüm kayıtları kuyruk sırasıyla tek seferde yazar."""
+        with self._lock:
+            entries = list(self._pending)
+            self._pending.clear()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+        self.backend.extend(entries, sync=True)
+        self._count("sync_writes", len(entries))
+
+    def _drop_pending(self, count):
+        for _ in range(count):
+            self._pending.popleft()
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def pending(self):
+        """Henüz diske yazılmamış kayıtların anlık kopyası (eskiden yeniye)."""
+        with self._lock:
+            return [dict(entry) for entry in self._pending]
+
+    def flush(self):
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler."""
+        if self._closed or not self._thread.is_alive():
+            return
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self):
+        """Kalan kayıtları yazar ve yazıcıyı durdurur."""
+        with self._put_lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def info(self):
+        with self._lock:
+            return dict(self.metrics, depth=self._queue.qsize())
+
+
+def _read_history_file(path):
+    """JSON dizisi veya JSON Lines biçimindeki geçmiş dosyasını okur."""
+    if path.endswith(".jsonl"):
+        return list(JsonlBackend(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 class DataStorage:
-    def __init__(self, storage_file="data/history.json"):
-        """Veri saklama sınıfı."""
-        self.storage_file = storage_file
-        
+    def __init__(self, storage_file=None, legacy_file="data/history.json", backend=None,
+                 write_behind=False, max_queue=1000, batch_size=64, flush_interval=1.0,
+                 max_segment_bytes=DEFAULT_SEGMENT_BYTES, max_segment_age=None,
+                 dedupe_content=False, near_duplicate_threshold=None):
+        """
+        Veri saklama sınıfı.
+
+        Args:
+            storage_file: Geçmiş dosyası (varsayılan: saklama katmanına göre DEFAULT_FILES)
+            legacy_file: Eski JSON dizisi dosyası (varsa ilk açılışta taşınır)
+            backend: 'jsonl' veya 'sqlite' (varsayılan: config.STORAGE_BACKEND)
+            write_behind: True ise kayıtlar kuyruğa alınıp arka planda toplu yazılır
+            max_queue: Yazma kuyruğunun en fazla kayıt sayısı (dolunca kaydeden beklenir)
+            batch_size: Bir toplu yazmadaki en fazla kayıt sayısı
+            flush_interval: Kuyruktaki kaydın en fazla bekleyeceği süre (saniye)
+            max_segment_bytes: JSON Lines dosyası bu boyutta sıkıştırılmış bölüte taşınır
+            max_segment_age: En eski kaydı bu kadar eski (saniye) olan dosya da bölüte taşınır
+            dedupe_content: True ise aynı içerik bir kez saklanır, kayıtlar özetine işaret eder
+                (yalnızca jsonl)
+            near_duplicate_threshold: Verilirse (ör. 0.9) aynı nesnenin son içeriklerine bu
+                shingle benzerliğini geçen içerik de var olan bloba bağlanır (küçük farklar saklanmaz)
+        """
+        backend = backend or config.STORAGE_BACKEND
+        if backend not in BACKENDS:
+            logger.warning(f"Bilinmeyen saklama katmanı: {backend}, jsonl kullanılacak")
+            backend = "jsonl"
+        self.storage_file = storage_file or DEFAULT_FILES[backend]
+
         # Klasörü oluştur (yoksa)
-        os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-        
-        # Dosyayı kontrol et ve gerekirse oluştur
-        if not os.path.exists(self.storage_file):
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump([], f)
-    
+        if os.path.dirname(self.storage_file):
+            os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
+
+        # Eski biçimdeki geçmişi bir kez taşı
+        if backend == "jsonl":
+            if legacy_file:
+                try:
+                    migrate_json_array(legacy_file, self.storage_file)
+                except Exception as e:
+                    logger.error(f"Eski geçmiş taşınırken hata: {e}")
+            self.backend = JsonlBackend(self.storage_file, max_segment_bytes=max_segment_bytes,
+                                        max_segment_age=max_segment_age, dedupe_content=dedupe_content,
+                                        near_duplicate_threshold=near_duplicate_threshold)
+        else:
+            self.backend = SqliteBackend(self.storage_file)
+            # Aynı klasördeki JSON Lines geçmişi (yoksa eski JSON dizisi) aktarılır
+            self._import_history([os.path.splitext(self.storage_file)[0] + ".jsonl", legacy_file])
+
+        # Kayıt kullanıcıyı bekletmesin diye arka planda toplu yazılır; çıkışta kuyruk boşaltılır
+        self.writer = None
+        if write_behind:
+            self.writer = WriteBehindQueue(self.backend, max_queue=max_queue, batch_size=batch_size,
+                                           flush_interval=flush_interval)
+            metrics.gauge("queue_depth", self.writer.depth, queue="history_writer")
+            atexit.register(self.close)
+
+    def _import_history(self, sources):
+        """Veritabanı boşsa var olan ilk geçmiş dosyasını içeri aktarır."""
+        try:
+            if self.backend.count():
+                return
+            for source in sources:
+                # Tamamı bölütlere taşınmış JSON Lines geçmişinde etkin dosya olmayabilir
+                if source and (os.path.exists(source) or (source.endswith(".jsonl") and
+                                                          os.path.isdir(os.path.splitext(source)[0] + ".segments"))):
+                    entries = _read_history_file(source)
+                    self.backend.extend(entries)
+                    logger.info(f"{len(entries)} kayıt {source} dosyasından {self.storage_file} dosyasına aktarıldı")
+                    return
+        except Exception as e:
+            logger.error(f"Eski geçmiş aktarılırken hata: {e}")
+
+    @metrics.timed("stage_seconds", stage="store")
     def save_data(self, object_name, keywords, content):
         """Nesne, anahtar kelimeler ve içeriği kaydeder."""
         try:
-            # Mevcut verileri oku
-            current_data = self._read_data()
-            
             # Yeni veriyi oluştur
             new_entry = {
                 "timestamp": datetime.now().isoformat(),
@@ -38,31 +1162,174 @@ class DataStorage:
                 "keywords": keywords,
                 "content": content
             }
-            
-            # Veriyi ekle
-            current_data.append(new_entry)
-            
-            # Veriyi kaydet
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(current_data, f, ensure_ascii=False, indent=2)
-            
+
+            if self.writer is not None:
+                self.writer.put(new_entry)
+                logger.info(f"Veri kayıt kuyruğuna alındı: {object_name}")
+                return True
+
+            # Veriyi dosyanın sonuna ekle (mevcut kayıtlar okunmaz)
+            self.backend.append(new_entry)
+
             logger.info(f"Veri başarıyla kaydedildi: {object_name}")
             return True
-            
+
         except Exception as e:
             logger.error(f"Veri kaydedilirken hata: {e}")
             return False
-    
+
+    def flush(self):
+        """Kuyrukta bekleyen kayıtları yazar (write_behind kapalıysa bir şey yapmaz)."""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self):
+        """Bekleyen kayıtları yazar ve dosya/veritabanı bağlantılarını kapatır."""
+        if self.writer is not None:
+            self.writer.close()
+            logger.info(f"Kayıt yazıcısı kapatıldı: {self.writer.info()}")
+            self.writer = None
+        if hasattr(self.backend, "close"):
+            self.backend.close()
+
+    def info(self):
+        """Yazma kuyruğu ve içerik deposu ölçümlerini döndürür (kuyruk derinliği, toplu yazmalar, tasarruf)."""
+        info = self.writer.info() if self.writer is not None else {}
+        blobs = getattr(self.backend, "blobs", None)
+        if blobs is not None:
+            info["blobs"] = blobs.info()
+        return info
+
+    def _pending(self):
+        """
+        Yazma kuyruğunda bekleyen kayıtlar (eskiden yeniye).
+
+        Okumalar kuyruğu boşaltmaz (yoksa fsync yeniden kullanıcının yoluna girer);
+        bunun yerine diskteki kayıtlar bu anlık kopyayla birleştirilir. Kopya diskten
+        önce alınır: arada yazılan kayıt iki tarafta da görünebilir, hiçbirinde
+        görünmemesi mümkün değildir.
+        """
+        return self.writer.pending() if self.writer is not None else []
+
+    @staticmethod
+    def _merge(entries, pending):
+        """Diskten okunan kayıtlara, aralarında olmayan bekleyen kayıtları ekler."""
+        if not pending:
+            return entries
+        seen = {(entry.get("timestamp"), entry.get("object")) for entry in entries}
+        return entries + [entry for entry in pending
+                          if (entry.get("timestamp"), entry.get("object")) not in seen]
+
+    def compact(self, max_age_days=None, dedupe=True):
+        """
+        Geçmiş bölütlerinden yinelenen ve max_age_days günden eski kayıtları atar.
+
+        Uzun süre çalışan kurulumlarda düzenli olarak (ör. compact_history.py ile) çağrılır.
+        """
+        if not hasattr(self.backend, "compact"):
+            logger.warning("Bu saklama katmanı sıkıştırmayı desteklemiyor")
+            return {}
+        try:
+            self.flush()
+            max_age = max_age_days * 86400 if max_age_days is not None else None
+            return self.backend.compact(max_age=max_age, dedupe=dedupe)
+        except HistoryLockedError:
+            raise
+        except Exception as e:
+            logger.error(f"Geçmiş sıkıştırılırken hata: {e}")
+            return {}
+
     def _read_data(self):
-        """JSON dosyasından verileri okur."""
+        """Tüm kayıtları okur."""
         try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            pending = self._pending()
+            return self._merge(list(self.backend), pending)
         except Exception as e:
             logger.error(f"Veri okunurken hata: {e}")
             return []
-    
+
     def get_previous_data(self, limit=5):
         """Son kaydedilen verileri döndürür."""
-        data = self._read_data()
-        return data[-limit:] if data else []
\ No newline at end of file
+        try:
+            pending = self._pending()
+            if limit <= 0:
+                return []
+            return self._merge(self.backend.tail(limit), pending[-limit:])[-limit:]
+        except Exception as e:
+            logger.error(f"Veri okunurken hata: {e}")
+            return []
+
+    def browse_history(self, limit=20, cursor=None):
+        """
+        Geçmişi yeniden eskiye sayfa sayfa döndürür.
+
+        Örnek:
+            entries, cursor = storage.browse_history(20)
+            while cursor is not None:
+                entries, cursor = storage.browse_history(20, cursor)
+
+        İmleçler diskteki konumları gösterdiği için bu okuma, diğerlerinden farklı
+        olarak kuyruğu önce diske yazar.
+
+        Returns:
+            (kayıtlar, sonraki sayfanın imleci veya None)
+        """
+        try:
+            self.flush()
+            return self.backend.page(limit, cursor)
+        except Exception as e:
+            logger.error(f"Geçmiş okunurken hata: {e}")
+            return [], None
+
+    def find(self, object_name=None, since=None, until=None, limit=100):
+        """
+        Nesne adı ve zaman aralığına göre kayıtları yeniden eskiye döndürür.
+
+        Örnek: bu haftaki tüm el çantası analizleri
+            storage.find("handbag", since=datetime.now() - timedelta(days=7))
+        """
+        try:
+            pending = self._pending()
+            entries = self.backend.find(object_name=object_name, since=since, until=until, limit=limit)
+            if not pending:
+                return entries
+            since, until = _iso(since), _iso(until)
+            entries = self._merge(entries, [entry for entry in pending
+                                            if _matches(entry, object_name, since, until)])
+            entries.sort(key=lambda entry: entry.get("timestamp", ""), reverse=True)
+            return entries[:limit]
+        except Exception as e:
+            logger.error(f"Kayıtlar sorgulanırken hata: {e}")
+            return []
+
+    def latest(self, object_name, since=None):
+        """Nesnenin (since'ten yeni) en son kaydını döndürür; yoksa None."""
+        try:
+            since_iso = _iso(since)
+            for entry in reversed(self._pending()):
+                if since_iso is not None and entry.get("timestamp", "") < since_iso:
+                    break
+                if entry.get("object") == object_name:
+                    return entry
+            return self.backend.latest(object_name, since=since)
+        except Exception as e:
+            logger.error(f"Son kayıt okunurken hata: {e}")
+            return None
+
+    def search(self, text, limit=20, object_name=None, by_relevance=False):
+        """İçerik ve anahtar kelimelerde metin araması yapar (SQLite'ta FTS5 ile)."""
+        try:
+            pending = self._pending()
+            entries = self.backend.search(text, limit=limit, object_name=object_name, by_relevance=by_relevance)
+            words = _fold(text).split()
+            if not pending or not words:
+                return entries
+            # Bekleyen kayıtlar diskteki tüm kayıtlardan yenidir; önce onlar gelir
+            matches = [entry for entry in reversed(pending)
+                       if (object_name is None or entry.get("object") == object_name)
+                       and all(word in _fold((entry.get("content") or "") + " " +
+                                             " ".join(entry.get("keywords") or [])) for word in words)]
+            return self._merge(matches, entries)[:limit]
+        except Exception as e:
+            logger.error(f"Metin araması sırasında hata: {e}")
+            return []
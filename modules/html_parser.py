@@ -0,0 +1,309 @@
+# modules/html_parser.py
+# DuckDuckGo sonuç sayfası için değiştirilebilir HTML ayrıştırma katmanı
+
+import codecs
+import logging
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+import config
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Kapanış etiketi olmayan HTML öğeleri
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+                 "link", "meta", "param", "source", "track", "wbr"}
+
+# Akış halinde ayrıştırmada bir seferde işlenecek bayt sayısı
+CHUNK_SIZE = 16 * 1024
+
+
+def resolve_ddg_link(href):
+    """DuckDuckGo yönlendirme bağlantısından gerçek URL'yi çıkarır."""
+    if 'uddg=' in href:
+        real_url = href[href.find('uddg=') + 5:]
+        # Yönlendirme parametrelerini at ve URL decode işlemi yap
+        return unquote(real_url.split('&', 1)[0])
+    return href
+
+
+def _has_class(class_attr, name):
+    return bool(class_attr) and name in class_attr.split()
+
+
+class _DDGResultParser(HTMLParser):
+    """Sonuçları okudukça toplayan, yeterli sonuç bulununca durdurulabilen akış ayrıştırıcı."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.results = []
+        self._open = []            # Açık etiketler; derinlik bu yığının boyudur
+        self._result_depth = None  # Açık sonuç bloğunun derinliği
+        self._field = None         # 'title' veya 'snippet'
+        self._field_depth = None
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+        self._open.append(tag)
+        depth = len(self._open)
+        class_attr = dict(attrs).get('class')
+
+        if self._result_depth is None:
+            if _has_class(class_attr, 'result'):
+                self._result_depth = depth
+                self._current = {'title': [], 'link': None, 'snippet': []}
+            return
+
+        if self._field is None:
+            if tag == 'a' and _has_class(class_attr, 'result__a') and self._current['link'] is None:
+                self._field, self._field_depth = 'title', depth
+                self._current['link'] = resolve_ddg_link(dict(attrs).get('href') or '')
+            elif _has_class(class_attr, 'result__snippet') and not self._current['snippet']:
+                self._field, self._field_depth = 'snippet', depth
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/> gibi kendiliğinden kapanan etiketler derinliği değiştirmez
+        pass
+
+    def handle_endtag(self, tag):
+        # Açılmamış etiketin kapanışı yok sayılır; kapatılmamış etiketler (ör. <p>)
+        # kendilerini içeren etiket kapanınca onunla birlikte kapanır
+        if tag in VOID_ELEMENTS or tag not in self._open:
+            return
+        while self._open:
+            depth = len(self._open)
+            closed = self._open.pop()
+            if self._field is not None and depth == self._field_depth:
+                self._field = None
+            if self._result_depth is not None and depth == self._result_depth:
+                self._finish_result()
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        if self._field is not None:
+            text = data.strip()
+            if text:
+                self._current[self._field].append(text)
+
+    def _finish_result(self):
+        current = self._current
+        self._result_depth, self._current, self._field = None, None, None
+        if current['title'] and current['link']:
+            self.results.append({
+                'title': ''.join(current['title']),
+                'link': current['link'],
+                'snippet': ''.join(current['snippet']),
+            })
+
+
+def _parse_stdlib(content, num_results, encoding):
+    """Standart kütüphane ayrıştırıcısı; sayfayı parça parça çözüp yeterli sonuçta durur."""
+    parser = _DDGResultParser()
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    view = memoryview(content)
+    for start in range(0, len(view), CHUNK_SIZE):
+        parser.feed(decoder.decode(view[start:start + CHUNK_SIZE]))
+        if len(parser.results) >= num_results:
+            break
+    else:
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+    return parser.results[:num_results]
+
+
+def _parse_selectolax(content, num_results, encoding):
+    """
+    selectolax (lexbor, C) ile ayrıştırır; bayt içeriği doğrudan kullanır.
+
+    Akış halinde ayrıştırma olmadığından sayfanın tamamı ayrıştırılır;
+    num_results yalnızca sonuç toplamayı sınırlar.
+    """
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(content)
+    results = []
+    for node in tree.css('.result'):
+        title_elem = node.css_first('.result__a')
+        if title_elem is None:
+            continue
+        snippet_elem = node.css_first('.result__snippet')
+        results.append({
+            'title': title_elem.text(separator='', strip=True),
+            'link': resolve_ddg_link(title_elem.attributes.get('href') or ''),
+            'snippet': snippet_elem.text(separator='', strip=True) if snippet_elem is not None else '',
+        })
+        if len(results) >= num_results:
+            break
+    return results
+
+
+def _parse_lxml(content, num_results, encoding):
+    """
+    lxml (libxml2, C) ile ayrıştırır; bayt içeriği doğrudan kullanır.
+
+    Ağaç bir kerede kurulduğundan sayfanın tamamı ayrıştırılır; num_results
+    yalnızca sonuç toplamayı sınırlar.
+    """
+    import lxml.html
+
+    def class_xpath(name):
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+    def text_of(elem):
+        return ''.join(part.strip() for part in elem.itertext())
+
+    parser = lxml.html.HTMLParser(encoding=encoding)
+    tree = lxml.html.fromstring(content, parser=parser)
+    results = []
+    for node in tree.xpath(f"//*[{class_xpath('result')}]"):
+        title_elem = node.xpath(f".//a[{class_xpath('result__a')}]")
+        if not title_elem:
+            continue
+        snippet_elem = node.xpath(f".//*[{class_xpath('result__snippet')}]")
+        results.append({
+            'title': text_of(title_elem[0]),
+            'link': resolve_ddg_link(title_elem[0].get('href') or ''),
+            'snippet': text_of(snippet_elem[0]) if snippet_elem else '',
+        })
+        if len(results) >= num_results:
+            break
+    return results
+
+
+# Ana metin çıkarımında içeriği atlanacak bölümler
+SKIPPED_ELEMENTS = {"script", "style", "noscript", "template", "svg", "nav", "header",
+                    "footer", "aside", "form", "button", "select", "iframe"}
+
+# Metni toplanacak blok öğeler
+TEXT_BLOCK_ELEMENTS = {"p", "li", "h1", "h2", "h3", "blockquote", "td"}
+
+
+class MainTextExtractor(HTMLParser):
+    """
+    Sayfanın ana metnini parça parça beslenerek çıkaran akış ayrıştırıcı.
+
+    Menü, betik, form gibi bölümler atlanır; paragraf benzeri bloklardan
+    yeterince uzun olanlar toplanır. max_chars dolunca `done` True olur.
+    """
+
+    def __init__(self, max_chars=5000, min_block_chars=40):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.min_block_chars = min_block_chars
+        self.blocks = []
+        self.length = 0
+        self._skip_depth = 0
+        self._block_depth = 0
+        self._buffer = []
+
+    @property
+    def done(self):
+        return self.length >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_ELEMENTS:
+            self._skip_depth += 1
+        elif tag in TEXT_BLOCK_ELEMENTS:
+            self._block_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_ELEMENTS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in TEXT_BLOCK_ELEMENTS and self._block_depth:
+            self._block_depth -= 1
+            if not self._block_depth:
+                self._flush_block()
+
+    def handle_data(self, data):
+        if self._block_depth and not self._skip_depth and not self.done:
+            self._buffer.append(data)
+
+    def _flush_block(self):
+        text = " ".join("".join(self._buffer).split())
+        self._buffer = []
+        if len(text) >= self.min_block_chars and not self.done:
+            text = text[:self.max_chars - self.length]
+            self.blocks.append(text)
+            self.length += len(text)
+
+    def text(self):
+        return "\n".join(self.blocks)
+
+
+def extract_main_text(chunks, encoding='utf-8', max_chars=5000):
+    """
+    Bayt parçalarından (ör. response.iter_content) sayfanın ana metnini çıkarır.
+
+    Parçalar geldikçe çözülüp ayrıştırılır; max_chars dolunca okuma bırakılır.
+    """
+    extractor = MainTextExtractor(max_chars=max_chars)
+    decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    for chunk in chunks:
+        extractor.feed(decoder.decode(chunk))
+        if extractor.done:
+            break
+    return extractor.text()
+
+
+# Tercih sırasına göre ayrıştırıcılar: (ad, ayrıştırma fonksiyonu, gerekli modül)
+BACKENDS = [
+    ("selectolax", _parse_selectolax, "selectolax.lexbor"),
+    ("lxml", _parse_lxml, "lxml.html"),
+    ("stdlib", _parse_stdlib, None),
+]
+
+_available_backends = None
+
+
+def available_backends():
+    """Kurulu olan ayrıştırıcıların adlarını tercih sırasıyla döndürür."""
+    global _available_backends
+    if _available_backends is None:
+        import importlib
+        names = []
+        for name, _, module in BACKENDS:
+            if module is None:
+                names.append(name)
+                continue
+            try:
+                importlib.import_module(module)
+                names.append(name)
+            except ImportError:
+                pass
+        _available_backends = names
+    return _available_backends
+
+
+def get_backend(name=None):
+    """İstenen (yoksa yapılandırmadaki ya da en hızlı kurulu) ayrıştırıcıyı döndürür."""
+    name = name or config.HTML_PARSER
+    available = available_backends()
+    if name == "auto" or name not in available:
+        if name != "auto":
+            logger.warning(f"HTML ayrıştırıcı bulunamadı: {name}, varsayılan kullanılacak")
+        name = available[0]
+    return next(backend for backend_name, backend, _ in BACKENDS if backend_name == name)
+
+
+def parse_ddg_results(content, num_results=5, encoding='utf-8', backend=None):
+    """
+    DuckDuckGo HTML sonuç sayfasından sonuçları çıkarır.
+
+    Args:
+        content: Yanıt gövdesi (bayt olarak, ör. response.content)
+        num_results: Çıkarılacak en fazla sonuç sayısı (stdlib ayrıştırıcısı bu sayıya
+            ulaşınca okumayı bırakır; selectolax ve lxml sayfanın tamamını ayrıştırır)
+        encoding: Sayfanın karakter kodlaması
+        backend: 'selectolax', 'lxml', 'stdlib' veya None (otomatik)
+
+    Returns:
+        {'title', 'link', 'snippet'} sözlüklerinden oluşan liste
+    """
+    if isinstance(content, str):
+        content = content.encode(encoding)
+    return get_backend(backend)(content, num_results, encoding or 'utf-8')
@@ -0,0 +1,151 @@
+# modules/http_client.py
+# Tüm dış HTTP istekleri için ortak, bağlantı havuzlu istemci
+
+import logging
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (bağlantı, okuma) zaman aşımı - çağıran belirtmezse kullanılır
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class HostLimitTimeout(requests.exceptions.Timeout):
+    """Ana bilgisayarın eşzamanlılık sınırında zaman aşımı süresince yer açılmadı."""
+
+
+def _total_timeout(timeout):
+    """(bağlantı, okuma) çiftini ya da tek değeri toplam bekleme süresine çevirir."""
+    if isinstance(timeout, tuple):
+        return None if None in timeout else sum(timeout)
+    return timeout
+
+
+class HttpClient:
+    """
+    Ana bilgisayar başına bağlantı havuzu ve keep-alive kullanan HTTP istemcisi.
+
+    Tüm istekler varsayılan zaman aşımı, geçici hatalarda üstel bekleme ile
+    yeniden deneme ve ana bilgisayar başına eşzamanlılık sınırı ile yapılır.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=2, backoff_factor=0.3,
+                 pool_connections=20, pool_maxsize=10, per_host_limit=4, transport=None):
+        """
+        Args:
+            timeout: Varsayılan (bağlantı, okuma) zaman aşımı
+            retries: Bağlantı hataları ve 429/5xx yanıtlarında yeniden deneme sayısı
+            backoff_factor: Yeniden denemeler arasındaki üstel bekleme çarpanı
+            pool_connections: Önbellekte tutulacak ana bilgisayar havuzu sayısı
+            pool_maxsize: Ana bilgisayar başına açık tutulacak bağlantı sayısı
+            per_host_limit: Aynı ana bilgisayara eşzamanlı en fazla istek sayısı
+            transport: İstekleri gönderen nesne (ör. replay.RecordingTransport); None ise doğrudan gönderilir
+        """
+        self.timeout = timeout
+        self.per_host_limit = per_host_limit
+        self.transport = transport
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),  # POST (ör. Serper) kotayı harcamasın
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _host_limit(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._host_limits.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_limits[host] = semaphore
+            return semaphore
+
+    def request(self, method, url, **kwargs):
+        """
+        İsteği ortak oturum üzerinden gönderir.
+
+        Ana bilgisayarın eşzamanlılık sınırında en fazla isteğin zaman aşımı kadar
+        beklenir; yer açılmazsa HostLimitTimeout yükseltilir.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        semaphore = self._host_limit(url)
+        if not semaphore.acquire(timeout=_total_timeout(kwargs["timeout"])):
+            raise HostLimitTimeout(f"{urlparse(url).netloc} için eşzamanlı istek sınırı "
+                                   f"({self.per_host_limit}) zaman aşımında boşalmadı")
+        try:
+            if self.transport is not None:
+                return self.transport.send(self.session, method, url, **kwargs)
+            return self.session.request(method, url, **kwargs)
+        finally:
+            semaphore.release()
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Uygulama genelinde paylaşılan HttpClient örneğini döndürür."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(transport=_transport_from_config())
+    return _client
+
+
+def _transport_from_config():
+    """Ortam değişkenine göre kayıt veya tekrar oynatma aktarıcısını oluşturur."""
+    if config.HTTP_REPLAY_URL:
+        from modules.replay import ReplayTransport
+        logger.info(f"HTTP istekleri tekrar oynatma sunucusuna yönlendiriliyor: {config.HTTP_REPLAY_URL}")
+        return ReplayTransport(config.HTTP_REPLAY_URL)
+    if config.HTTP_RECORD_CASSETTE:
+        from modules.replay import Cassette, RecordingTransport
+        logger.info(f"HTTP yanıtları kasete kaydediliyor: {config.HTTP_RECORD_CASSETTE}")
+        return RecordingTransport(Cassette(config.HTTP_RECORD_CASSETTE))
+    return None
+
+
+def set_transport(transport):
+    """Paylaşılan istemcinin aktarıcısını değiştirir (None: doğrudan gönderim)."""
+    get_client().transport = transport
+
+
+def get(url, **kwargs):
+    """Paylaşılan istemci ile GET isteği gönderir."""
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    """Paylaşılan istemci ile POST isteği gönderir."""
+    return get_client().post(url, **kwargs)
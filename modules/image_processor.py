@@ -7,6 +7,8 @@ import requests
 from PIL import Image
 from io import BytesIO
 import logging    # Hata ve işlem kayıtlarını (log) tutmak için
+from modules import http_client  # Paylaşılan bağlantı havuzlu HTTP istemcisi
+from modules import metrics
 
 #Loglama ayarları
 logging.basicConfig(level=logging.INFO)
@@ -21,12 +23,13 @@ def is_url(source):
     """Verilen kaynağın URL mi yoksa dosya yolu mu olduğunu kontrol eder."""
     return source.startswith(('http://', 'https://'))
 
+@metrics.timed("stage_seconds", stage="fetch")
 def get_image_from_source(source):
     """URL veya dosya yolundan görüntü yükler."""
     try:
         if is_url(source):
             logger.info(f"URL'den görüntü indiriliyor: {source}")
-            response = requests.get(source, stream=True, timeout=10)
+            response = http_client.get(source, stream=True, timeout=10)
             response.raise_for_status()  # HTTP hatalarını kontrol et
             image = Image.open(BytesIO(response.content))
         else:
@@ -51,6 +54,7 @@ def get_image_from_source(source):
         logger.error(f"Beklenmeyen hata: {e}")
         raise
 
+@metrics.timed("stage_seconds", stage="preprocess")
 def preprocess_image(image, target_size=(640, 640)):
     # Görüntü kontrastını artır
     from PIL import ImageEnhance
@@ -0,0 +1,211 @@
+# modules/keyword_expander.py
+# Kelime vektörleriyle anahtar kelime genişletme
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from modules.keyword_extractor import (CONTEXT_RULES, OBJECT_CATEGORIES, SPACY_MODELS,
+                                       TR_RELATED_WORDS, get_nlp)
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def default_vocabulary():
+    """Kural tablolarındaki tüm kelimelerden alan sözlüğünü oluşturur."""
+    words = []
+    for name, attributes in OBJECT_CATEGORIES.items():
+        words.append(name)
+        words.extend(attributes)
+    for name, related in TR_RELATED_WORDS.items():
+        words.append(name)
+        words.extend(related)
+    for term, base_keywords, sub_rules in CONTEXT_RULES:
+        words.append(term)
+        words.extend(base_keywords)
+        for _, sub_keywords in sub_rules:
+            words.extend(sub_keywords)
+    return list(dict.fromkeys(word.lower() for word in words))
+
+
+class EmbeddingExpander:
+    """
+    Alan sözlüğündeki kelimelerin normalize vektör matrisini kullanarak ilişkili kelimeler bulur.
+
+    Matris bir kez SpaCy vektörlerinden hesaplanır ve diske .npy olarak yazılır;
+    sonraki çalıştırmalarda bellek eşlemeli (mmap) olarak açılır. Benzerlik
+    araması tek bir matris-vektör (toplu sorguda matris-matris) çarpımıdır.
+    """
+
+    def __init__(self, vocabulary=None, lang="tr", cache_dir="data/embeddings",
+                 top_k=3, min_similarity=0.45, offline=None):
+        """
+        Args:
+            vocabulary: Aday kelimeler (varsayılan: kural tablolarındaki kelimeler)
+            lang: Kullanılacak SpaCy modelinin dili
+            cache_dir: Vektör matrisinin saklanacağı klasör
+            top_k: Nesne başına döndürülecek ilişkili kelime sayısı
+            min_similarity: Kabul edilecek en düşük kosinüs benzerliği
+            offline: Model bulunamazsa indirme yapma
+        """
+        self.vocabulary = list(vocabulary) if vocabulary is not None else default_vocabulary()
+        self.lang = lang
+        self.cache_dir = cache_dir
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self.offline = offline
+
+        self.words = None    # Matris satırlarına karşılık gelen kelimeler
+        self.matrix = None   # (kelime sayısı x boyut) birim uzunluklu vektörler
+        self._nlp = None
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @property
+    def available(self):
+        """Vektör matrisi kullanılabilir mi?"""
+        self._ensure_loaded()
+        return self.matrix is not None and len(self.words) > 0
+
+    def _paths(self):
+        model_name = SPACY_MODELS.get(self.lang, self.lang)
+        base = os.path.join(self.cache_dir, model_name)
+        return base + ".npy", base + ".json"
+
+    def _vocabulary_hash(self):
+        return hashlib.sha1("\n".join(self.vocabulary).encode("utf-8")).hexdigest()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                if not self._load_matrix():
+                    self._build_matrix()
+            except Exception as e:
+                logger.error(f"Kelime vektör matrisi hazırlanamadı: {e}")
+                self.words, self.matrix = None, None
+            self._loaded = True
+
+    def _load_matrix(self):
+        """Diskteki matrisi sözlük değişmediyse bellek eşlemeli olarak açar."""
+        matrix_path, meta_path = self._paths()
+        if not (os.path.exists(matrix_path) and os.path.exists(meta_path)):
+            return False
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("vocabulary_hash") != self._vocabulary_hash():
+            logger.info("Alan sözlüğü değişmiş, vektör matrisi yeniden oluşturulacak")
+            return False
+
+        self.words = meta["words"]
+        self.matrix = np.load(matrix_path, mmap_mode="r")
+        logger.info(f"Kelime vektör matrisi yüklendi: {self.matrix.shape}")
+        return True
+
+    def _build_matrix(self):
+        """SpaCy vektörlerinden normalize matrisi hesaplar ve diske yazar."""
+        self._nlp = get_nlp(self.lang, offline=self.offline)
+        if self._nlp is None:
+            logger.warning("SpaCy modeli yok, vektör tabanlı genişletme devre dışı")
+            return
+
+        words, rows = [], []
+        for word in self.vocabulary:
+            vector = self._vector(word)
+            if vector is not None:
+                words.append(word)
+                rows.append(vector)
+        if not rows:
+            logger.warning("Alan sözlüğündeki kelimeler için vektör bulunamadı")
+            return
+
+        # Satırlar _vector'da birim uzunluğa getirildi
+        matrix = np.vstack(rows).astype(np.float32)
+
+        matrix_path, meta_path = self._paths()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Yarım kalan yazımlar eski dosyayı bozmasın diye geçici dosyaya yazılır
+        with open(matrix_path + ".tmp", "wb") as f:
+            np.save(f, matrix)
+        os.replace(matrix_path + ".tmp", matrix_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"vocabulary_hash": self._vocabulary_hash(), "words": words}, f, ensure_ascii=False)
+        os.replace(meta_path + ".tmp", meta_path)
+
+        self.words = words
+        self.matrix = np.load(matrix_path, mmap_mode="r")
+        logger.info(f"Kelime vektör matrisi oluşturuldu: {self.matrix.shape}")
+
+    def _vector(self, text):
+        """Metindeki kelime vektörlerinin ortalamasını döndürür (vektör yoksa None)."""
+        if self._nlp is None:
+            self._nlp = get_nlp(self.lang, offline=self.offline)
+            if self._nlp is None:
+                return None
+
+        # vocab[token] bilinmeyen her kelimeyi sözlüğe ekler (uzun süre çalışan
+        # süreçte bellek büyür); önce dizgi deposunda olup olmadığına bakılır
+        vocab = self._nlp.vocab
+        vectors = []
+        for token in text.lower().split():
+            if token in vocab.strings and vocab.has_vector(token):
+                vectors.append(vocab.get_vector(token))
+        if not vectors:
+            return None
+        vector = np.mean(vectors, axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def expand(self, object_name, top_k=None):
+        """Tek bir nesne adı için ilişkili kelimeleri döndürür."""
+        return self.expand_batch([object_name], top_k)[0]
+
+    def expand_batch(self, object_names, top_k=None):
+        """
+        Birden fazla nesne adını tek bir matris çarpımıyla genişletir.
+
+        Returns:
+            Her nesne adı için ilişkili kelime listesi (aynı sırada)
+        """
+        top_k = top_k or self.top_k
+        results = [[] for _ in object_names]
+        if not object_names or not self.available:
+            return results
+
+        indices, queries = [], []
+        for i, name in enumerate(object_names):
+            vector = self._vector(name)
+            if vector is not None:
+                indices.append(i)
+                queries.append(vector)
+        if not queries:
+            return results
+
+        # (sorgu sayısı x kelime sayısı) benzerlik matrisi
+        scores = np.asarray(np.vstack(queries).astype(np.float32) @ self.matrix.T)
+
+        # Nesne adının kendisi ve parçaları elenebileceği için birkaç fazla aday al
+        candidates = min(top_k + 4, scores.shape[1])
+        top = np.argpartition(-scores, candidates - 1, axis=1)[:, :candidates]
+
+        for row, i in enumerate(indices):
+            name_lower = object_names[i].lower()
+            ordered = top[row][np.argsort(-scores[row, top[row]])]
+            for j in ordered:
+                if scores[row, j] < self.min_similarity or len(results[i]) >= top_k:
+                    break
+                word = self.words[j]
+                if word == name_lower or word in name_lower.split():
+                    continue
+                results[i].append(word)
+        return results
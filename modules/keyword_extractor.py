@@ -2,227 +2,361 @@
 # Ayşenur Arslan - 16.04.2025
 # Türkçe destek eklenmiş versiyon
 
-import nltk
-import spacy
-from nltk.corpus import wordnet as wn
 import logging
+import subprocess
+import sys
+import threading
 
-# Gerekli NLTK verilerini indir
-try:
-    nltk.download('wordnet', quiet=True)
-    nltk.download('omw-1.4', quiet=True)
-except Exception as e:
-    pass  # İndirme hatası durumunda sessizce devam et
-
-# SpaCy modellerini yükle
-try:
-    # İngilizce model
-    nlp_en = spacy.load("en_core_web_md")
-    
-    # Türkçe model (varsa)
-    try:
-        nlp_tr = spacy.load("tr_core_news_md")
-    except OSError:
-        # Model yoksa indir (eğer varsa)
-        import os
-        try:
-            os.system("python -m spacy download tr_core_news_md")
-            nlp_tr = spacy.load("tr_core_news_md")
-        except:
-            logging.warning("Türkçe SpaCy modeli bulunamadı, alternatif yöntemler kullanılacak")
-            nlp_tr = None
-except OSError:
-    # Model yoksa indir
-    import os
-    os.system("python -m spacy download en_core_web_md")
-    nlp_en = spacy.load("en_core_web_md")
-    nlp_tr = None
+import config
+from modules import metrics
+from modules.pattern_matcher import PatternMatcher
+from utils.helpers import LRUCache
 
 # Loglama ayarları
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Dil koduna göre kullanılacak SpaCy modelleri
+SPACY_MODELS = {
+    "en": "en_core_web_md",
+    "tr": "tr_core_news_md",
+}
+
+# NLTK ve SpaCy kaynakları ilk gerçek kullanımda yüklenir (import sırasında değil)
+_nlp_models = {}
+_wordnet = None
+_wordnet_loaded = False
+_resource_lock = threading.Lock()
+
+
+def _is_offline(offline):
+    """Çağrıda belirtilmediyse yapılandırmadaki çevrimdışı modu kullanır."""
+    return config.OFFLINE_MODE if offline is None else offline
+
+
+def _load_spacy_model(model_name, offline):
+    """SpaCy modelini yükler; yoksa ve çevrimdışı değilse indirmeyi dener."""
+    try:
+        import spacy
+    except ImportError:
+        logger.warning("SpaCy kurulu değil, alternatif yöntemler kullanılacak")
+        return None
+
+    try:
+        return spacy.load(model_name)
+    except OSError:
+        if offline:
+            logger.warning(f"SpaCy modeli bulunamadı ({model_name}), çevrimdışı modda indirilmeyecek")
+            return None
+
+    try:
+        logger.info(f"SpaCy modeli indiriliyor: {model_name}")
+        subprocess.run([sys.executable, "-m", "spacy", "download", model_name], check=True)
+        return spacy.load(model_name)
+    except Exception as e:
+        logger.warning(f"SpaCy modeli yüklenemedi ({model_name}): {e}")
+        return None
+
+
+def get_nlp(lang="en", offline=None):
+    """
+    İstenen dil için SpaCy modelini döndürür.
+
+    Model ilk çağrıda yüklenir ve önbellekte tutulur; eşzamanlı çağrılar
+    modeli yalnızca bir kez yükler. Model kullanılamıyorsa None döner.
+    """
+    if lang in _nlp_models:
+        return _nlp_models[lang]
+
+    with _resource_lock:
+        if lang not in _nlp_models:
+            model_name = SPACY_MODELS.get(lang)
+            _nlp_models[lang] = _load_spacy_model(model_name, _is_offline(offline)) if model_name else None
+        return _nlp_models[lang]
+
+
+def get_wordnet(offline=None):
+    """NLTK WordNet derlemini ilk kullanımda hazırlar; kullanılamıyorsa None döner."""
+    global _wordnet, _wordnet_loaded
+    if _wordnet_loaded:
+        return _wordnet
+
+    with _resource_lock:
+        if not _wordnet_loaded:
+            try:
+                import nltk
+                for resource in ("wordnet", "omw-1.4"):
+                    try:
+                        nltk.data.find(f"corpora/{resource}")
+                    except LookupError:
+                        if _is_offline(offline):
+                            raise
+                        nltk.download(resource, quiet=True)
+                from nltk.corpus import wordnet as wn
+                wn.ensure_loaded()
+                _wordnet = wn
+            except Exception as e:
+                logger.warning(f"WordNet kullanılamıyor: {e}")
+            _wordnet_loaded = True
+        return _wordnet
+
+
+# Türkçe yaygın bağlantılı kelimeler sözlüğü
+TR_RELATED_WORDS = {
+    "araba": ["otomobil", "taşıt", "araç", "vasıta", "sürüş"],
+    "telefon": ["cep telefonu", "akıllı telefon", "iletişim", "arama", "mobil"],
+    "bilgisayar": ["laptop", "masaüstü", "pc", "teknoloji", "yazılım"],
+    "masa": ["mobilya", "çalışma", "yemek", "ofis", "ahşap"],
+    "sandalye": ["oturma", "koltuk", "mobilya", "iskemle", "dinlenme"],
+    "köpek": ["evcil hayvan", "dostluk", "sadakat", "havlama", "yavru"],
+    "kedi": ["evcil hayvan", "miyav", "tüylü", "yumuşak", "sevimli"],
+    "uçak": ["havacılık", "seyahat", "uçuş", "havayolu", "yolculuk"],
+    "bisiklet": ["pedal", "spor", "ulaşım", "tekerlekli", "sürmek"],
+    "insan": ["kişi", "birey", "toplum", "yaşam", "insan hakları"],
+    # Daha fazla nesne ve ilişkili kelimeler eklenebilir
+}
+
+# Nesne adı için kategori ve nitelik tanımlamaları
+# (kısmi eşleşmede tablodaki ilk uygun kategori seçilir, sıra önemlidir)
+OBJECT_CATEGORIES = {
+    # Giyim/Aksesuar
+    "çanta": ["aksesuar", "moda", "taşıma"],
+    "sırt çantası": ["aksesuar", "seyahat", "okul", "ergonomi"],
+    "el çantası": ["moda", "aksesuar", "kadın"],
+    "cüzdan": ["deri", "para", "kart", "taşıma"],
+    "ayakkabı": ["giyim", "konfor", "moda"],
+    "gözlük": ["aksesuar", "güneş", "optik"],
+    "saat": ["aksesuar", "zaman", "bileklik"],
+
+    # Yiyecek
+    "sandviç": ["ekmek", "aperatif yemek", "lezzetli atıştırmalık"],
+    "sosisli": ["sos", "sosis", "ketçap", "fast food"],
+    "hamburger": ["köfte", "ekmek", "hızlı yemek"],
+    "pizza": ["hamur işi", "İtalyan", "dilim"],
+    "salata": ["sebze", "sağlıklı", "yeşillik"],
+    "kahve": ["içecek", "kafein", "sıcak"],
+
+    # Elektronik
+    "telefon": ["akıllı telefon", "iletişim", "elektronik"],
+    "bilgisayar": ["teknoloji", "yazılım", "donanım"],
+    "tablet": ["taşınabilir", "ekran", "uygulama"],
+    "televizyon": ["ekran", "yayın", "eğlence"],
+    "kulaklık": ["ses", "müzik", "kablosuz"],
+
+    # Mobilya
+    "koltuk": ["oturma", "rahatlık", "salon"],
+    "masa": ["çalışma", "yemek", "ahşap"],
+    "sandalye": ["oturma", "destek", "ergonomik"],
+
+    # Araçlar
+    "araba": ["taşıt", "ulaşım", "motor", "yakıt"],
+    "bisiklet": ["spor", "ulaşım", "pedal"],
+    "motosiklet": ["hız", "motor", "iki teker"],
+
+    # Hayvanlar
+    "kedi": ["evcil hayvan", "miyav", "tüylü"],
+    "köpek": ["evcil hayvan", "sadakat", "havlama"],
+    "kuş": ["kanat", "uçmak", "tüy"],
+    "balık": ["su", "yüz me", "akvaryum"],
+    "at": ["binek", "sırt", "koşu"],
+}
+
+# Bağlamsal zenginleştirme kuralları (yalnızca Türkçe):
+# (ana terim, her zaman eklenecek kelimeler, [(alt terimler, eklenecek kelimeler), ...])
+# İlk eşleşen ana kural ve onun ilk eşleşen alt kuralı uygulanır.
+CONTEXT_RULES = [
+    ("çanta", [], [
+        (("sırt",), ["okul", "seyahat", "ergonomi", "dağcılık"]),
+        (("el",), ["moda", "kadın", "aksesuar", "şık"]),
+        (("laptop", "bilgisayar"), ["teknoloji", "taşıma", "koruma", "laptop"]),
+    ]),
+    ("sandviç", ["ekmek", "aperatif", "atıştırmalık", "lezzetli"], [
+        (("sosisli",), ["sos", "sosis", "ketçap", "fast food"]),
+        (("ton",), ["balık", "ton balığı", "deniz ürünü"]),
+        (("peynir",), ["kaşar", "çedar", "kahvaltılık"]),
+    ]),
+]
+
+# Nesne adından türetilen Türkçe kelime kalıpları: (tetikleyici terimler, kalıplar)
+# İlk eşleşen grup uygulanır; hiçbiri eşleşmezse varsayılan kalıplar kullanılır.
+KEYWORD_TEMPLATES = [
+    (("çanta",), ["en iyi {name} modelleri", "{name} fiyatları", "kaliteli {name}", "{name} markaları"]),
+    (("yemek", "yiyecek", "sandviç", "pizza", "hamburger"),
+     ["{name} tarifi", "kolay {name} yapımı", "pratik {name}", "{name} malzemeleri"]),
+]
+DEFAULT_KEYWORD_TEMPLATES = ["{name} nedir", "{name} özellikleri", "{name} türleri",
+                             "{name} kullanımı", "{name} hakkında"]
+
+# Geçmiş sorgulara göre kurallar:
+# (önceki anahtar kelimede aranan terimler, nesne adında aranan terimler, kalıplar)
+HISTORY_RULES = [
+    (("çanta", "giyim", "aksesuar"), ("çanta",), ["modern {name}", "{name} kombinleri"]),
+    (("yemek", "sandviç", "tarif"), ("sandviç", "yemek"), ["ev yapımı {name}", "hızlı {name} yapımı"]),
+]
+
+
+class KeywordRules:
+    """Kural tablolarını bir kez derleyip tek geçişli eşleştiricilere dönüştürür."""
+
+    def __init__(self, categories=OBJECT_CATEGORIES, context_rules=CONTEXT_RULES,
+                 templates=KEYWORD_TEMPLATES, default_templates=DEFAULT_KEYWORD_TEMPLATES,
+                 history_rules=HISTORY_RULES):
+        self.categories = categories
+        self.context_rules = context_rules
+        self.templates = templates
+        self.default_templates = default_templates
+        self.history_rules = history_rules
+
+        self._category_names = list(categories)
+        self._category_order = {name: i for i, name in enumerate(self._category_names)}
+
+        # Nesne adında aranan tüm terimler tek bir otomatta toplanır
+        object_terms = list(categories)
+        for term, _, sub_rules in context_rules:
+            object_terms.append(term)
+            for sub_terms, _ in sub_rules:
+                object_terms.extend(sub_terms)
+        for triggers, _ in templates:
+            object_terms.extend(triggers)
+        for _, triggers, _ in history_rules:
+            object_terms.extend(triggers)
+        self.object_matcher = PatternMatcher(object_terms)
+
+        # Geçmişteki anahtar kelimelerde aranan terimler
+        self.history_matcher = PatternMatcher(
+            term for history_terms, _, _ in history_rules for term in history_terms)
+
+        # "nesne adı kategori adının parçası mı" sorgusu için alt dizgi dizini
+        # (alt dizgi -> onu içeren ilk kategorinin sırası)
+        self._substring_index = {"": 0}
+        for order, name in enumerate(categories):
+            for start in range(len(name)):
+                for end in range(start + 1, len(name) + 1):
+                    self._substring_index.setdefault(name[start:end], order)
+
+    def match_category(self, object_lower, found):
+        """
+        Nesne adına uyan kategoriyi döndürür.
+
+        Tam eşleşme önceliklidir; yoksa kategori adının nesne adında geçtiği ya da
+        nesne adının kategori adında geçtiği ilk kategori seçilir.
+        """
+        if object_lower in self.categories:
+            return object_lower
+
+        best = self._substring_index.get(object_lower)
+        for term in found:
+            order = self._category_order.get(term)
+            if order is not None and (best is None or order < best):
+                best = order
+        return self._category_names[best] if best is not None else None
+
+    def context_keywords(self, found):
+        """Bağlamsal zenginleştirme kelimelerini döndürür."""
+        for term, base_keywords, sub_rules in self.context_rules:
+            if term not in found:
+                continue
+            keywords = list(base_keywords)
+            for sub_terms, sub_keywords in sub_rules:
+                if any(sub_term in found for sub_term in sub_terms):
+                    keywords.extend(sub_keywords)
+                    break
+            return keywords
+        return []
+
+    def template_keywords(self, object_name, found):
+        """Nesne adından kalıp tabanlı Türkçe anahtar kelimeler üretir."""
+        for triggers, patterns in self.templates:
+            if any(trigger in found for trigger in triggers):
+                break
+        else:
+            patterns = self.default_templates
+        return [pattern.format(name=object_name) for pattern in patterns]
+
+    def history_fingerprint(self, last_keywords):
+        """
+        Önceki anahtar kelimelerin geçmiş kurallarına etkisini özetleyen küçük bir anahtar döndürür.
+
+        Her kelime için terimleri geçen kuralların sırası tutulur; aynı parmak izine
+        sahip iki geçmiş, history_keywords için aynı sonucu verir.
+        """
+        signature = set()
+        for keyword in last_keywords:
+            keyword_found = self.history_matcher.found(keyword)
+            matched = tuple(i for i, (history_terms, _, _) in enumerate(self.history_rules)
+                            if any(term in keyword_found for term in history_terms))
+            if matched:
+                signature.add(matched)
+        return frozenset(signature)
+
+    def history_keywords(self, object_name, found, last_keywords):
+        """Önceki sorgunun anahtar kelimelerine göre ek kelimeler üretir."""
+        keywords = []
+        for keyword in last_keywords:
+            keyword_found = self.history_matcher.found(keyword)
+            for history_terms, object_terms, patterns in self.history_rules:
+                if any(term in keyword_found for term in history_terms) and \
+                        any(term in found for term in object_terms):
+                    keywords.extend(pattern.format(name=object_name) for pattern in patterns)
+                    break
+        return keywords
+
+
+DEFAULT_RULES = KeywordRules()
+
+
 class KeywordExtractor:
-    def __init__(self, keyword_count=5):
-        """Anahtar kelime çıkarıcı sınıfı."""
+    def __init__(self, keyword_count=5, rules=None, cache_size=512, expander=None):
+        """
+        Anahtar kelime çıkarıcı sınıfı.
+
+        Args:
+            keyword_count: Döndürülecek en fazla anahtar kelime sayısı
+            rules: Derlenmiş kural tabloları (varsayılan: DEFAULT_RULES)
+            cache_size: Üretilen anahtar kelimeler için LRU önbellek boyutu
+            expander: Kelime vektörleriyle ilişkili kelime bulan genişletici (isteğe bağlı)
+        """
         self.keyword_count = keyword_count
+        self.rules = rules or DEFAULT_RULES
+        self.expander = expander
+        # (nesne adı, dil, geçmiş parmak izi) -> üretilen anahtar kelimeler
+        self.cache = LRUCache(maxsize=cache_size)
         self.history = []  # Önceki anahtar kelimeler için geçmiş
         
         # Türkçe yaygın bağlantılı kelimeler sözlüğü
-        self.tr_related_words = {
-            "araba": ["otomobil", "taşıt", "araç", "vasıta", "sürüş"],
-            "telefon": ["cep telefonu", "akıllı telefon", "iletişim", "arama", "mobil"],
-            "bilgisayar": ["laptop", "masaüstü", "pc", "teknoloji", "yazılım"],
-            "masa": ["mobilya", "çalışma", "yemek", "ofis", "ahşap"],
-            "sandalye": ["oturma", "koltuk", "mobilya", "iskemle", "dinlenme"],
-            "köpek": ["evcil hayvan", "dostluk", "sadakat", "havlama", "yavru"],
-            "kedi": ["evcil hayvan", "miyav", "tüylü", "yumuşak", "sevimli"],
-            "uçak": ["havacılık", "seyahat", "uçuş", "havayolu", "yolculuk"],
-            "bisiklet": ["pedal", "spor", "ulaşım", "tekerlekli", "sürmek"],
-            "insan": ["kişi", "birey", "toplum", "yaşam", "insan hakları"],
-            # Daha fazla nesne ve ilişkili kelimeler eklenebilir
-        }
+        self.tr_related_words = TR_RELATED_WORDS
         
-    def generate_keywords(self, object_name, is_turkish=False):
-        """Nesne adından anahtar kelimeler üretir."""
+    @metrics.timed("stage_seconds", stage="keywords")
+    def generate_keywords(self, object_name, is_turkish=False, use_history=True):
+        """
+        Nesne adından anahtar kelimeler üretir (aynı girdi ve geçmiş için önbellekten).
+
+        use_history=False ise önceki anahtar kelimeler kullanılmaz ve sonuç
+        geçmişe eklenmez; birbirinden bağımsız öğeleri eşzamanlı işleyen
+        çağıranlar (boru hattı, HTTP servisi) bu kipi kullanır.
+        """
         try:
-            keywords = set()
-
-            # Nesne adı için kategori ve nitelik tanımlamaları
-            object_categories = {
-               # Giyim/Aksesuar
-               "çanta": ["aksesuar", "moda", "taşıma"],
-               "sırt çantası": ["aksesuar", "seyahat", "okul", "ergonomi"],
-               "el çantası": ["moda", "aksesuar", "kadın"],
-               "cüzdan": ["deri", "para", "kart", "taşıma"],
-               "ayakkabı": ["giyim", "konfor", "moda"],
-               "gözlük": ["aksesuar", "güneş", "optik"],
-               "saat": ["aksesuar", "zaman", "bileklik"],
-            
-               # Yiyecek
-               "sandviç": ["ekmek", "aperatif yemek", "lezzetli atıştırmalık"],
-               "sosisli": ["sos", "sosis", "ketçap", "fast food"],
-               "hamburger": ["köfte", "ekmek", "hızlı yemek"],
-               "pizza": ["hamur işi", "İtalyan", "dilim"],
-               "salata": ["sebze", "sağlıklı", "yeşillik"],
-               "kahve": ["içecek", "kafein", "sıcak"],
-            
-               # Elektronik
-               "telefon": ["akıllı telefon", "iletişim", "elektronik"],
-               "bilgisayar": ["teknoloji", "yazılım", "donanım"],
-               "tablet": ["taşınabilir", "ekran", "uygulama"],
-               "televizyon": ["ekran", "yayın", "eğlence"],
-               "kulaklık": ["ses", "müzik", "kablosuz"],
-            
-               # Mobilya
-               "koltuk": ["oturma", "rahatlık", "salon"],
-               "masa": ["çalışma", "yemek", "ahşap"],
-               "sandalye": ["oturma", "destek", "ergonomik"],
-            
-               # Araçlar
-               "araba": ["taşıt", "ulaşım", "motor", "yakıt"],
-               "bisiklet": ["spor", "ulaşım", "pedal"],
-               "motosiklet": ["hız", "motor", "iki teker"],
-            
-               # Hayvanlar
-               "kedi": ["evcil hayvan", "miyav", "tüylü"],
-               "köpek": ["evcil hayvan", "sadakat", "havlama"],
-               "kuş": ["kanat", "uçmak", "tüy"],
-               "balık": ["su", "yüz me", "akvaryum"],
-               "at": ["binek", "sırt", "koşu"] 
-               }
-        
-            # Sürüm kontrolü ve bağlam duyarlı eşleştirme
-            object_lower = object_name.lower().strip()
-            matched_object = None
-        
-            # Tam eşleşme veya kısmi eşleşme kontrol et
-            if object_lower in object_categories:
-               matched_object = object_lower
-            else:
-                # Kısmi eşleşme dene
-                for obj in object_categories:
-                    if obj in object_lower or object_lower in obj:
-                        matched_object = obj
-                        break
-        
-            # Eşleşme bulunduysa kategorilerini ekle
-            if matched_object:
-                keywords.update(object_categories[matched_object])
-        
-            # Eğer nesne adı Türkçe ise ve Türkçe özel işlem yap
-            if is_turkish:
-                # 1. Türkçe önceden tanımlanmış ilişkili kelimeler
-                if object_lower in self.tr_related_words:
-                    for related_word in self.tr_related_words[object_lower]:
-                        keywords.add(related_word)
-            
-                # Bağlamsal zenginleştirme - Özel durumlar için
-                if "çanta" in object_lower:
-                   if "sırt" in object_lower:
-                       keywords.update(["okul", "seyahat", "ergonomi", "dağcılık"])
-                   elif "el" in object_lower:
-                       keywords.update(["moda", "kadın", "aksesuar", "şık"])
-                   elif "laptop" in object_lower or "bilgisayar" in object_lower:
-                        keywords.update(["teknoloji", "taşıma", "koruma", "laptop"])
-                    
-                elif "sandviç" in object_lower:
-                   keywords.update(["ekmek", "aperatif", "atıştırmalık", "lezzetli"])
-                   if "sosisli" in object_lower:
-                      keywords.update(["sos", "sosis", "ketçap", "fast food"])
-                   elif "ton" in object_lower:
-                       keywords.update(["balık", "ton balığı", "deniz ürünü"])
-                   elif "peynir" in object_lower:
-                       keywords.update(["kaşar", "çedar", "kahvaltılık"])
-            
-                # 2. Türkçe SpaCy modeli varsa kullan
-                # (mevcut kodunuzu koruyun)
-            
-                 # 3. Türkçe anahtar kelimeler ekle - bunu zenginleştirelim
-                if "çanta" in object_lower:
-                    keywords.add("en iyi " + object_name + " modelleri")
-                    keywords.add(object_name + " fiyatları")
-                    keywords.add("kaliteli " + object_name)
-                    keywords.add(object_name + " markaları")
-                elif any(food in object_lower for food in ["yemek", "yiyecek", "sandviç", "pizza", "hamburger"]):
-                    keywords.add(object_name + " tarifi")
-                    keywords.add("kolay " + object_name + " yapımı")
-                    keywords.add("pratik " + object_name)
-                    keywords.add(object_name + " malzemeleri")
-                else:
-                    keywords.add(object_name + " nedir")
-                    keywords.add(object_name + " özellikleri")
-                    keywords.add(object_name + " türleri")
-                    keywords.add(object_name + " kullanımı")
-                    keywords.add(object_name + " hakkında")
-            
-                # Geçmiş sorguları dikkate alan gelişmiş bağlam oluşturma
-                # Bir önceki sorgu ile bağlantı kurmaya çalış
-                if self.history:
-                    last_object_keywords = self.history[-1]
-                    # Önceki nesne ile benzer kategoride mi kontrol et
-                    for keyword in last_object_keywords:
-                        if any(category in keyword for category in ["çanta", "giyim", "aksesuar"]) and "çanta" in object_lower:
-                            keywords.add("modern " + object_name)
-                            keywords.add(object_name + " kombinleri")
-                        elif any(food in keyword for food in ["yemek", "sandviç", "tarif"]) and any(food in object_lower for food in ["sandviç", "yemek"]):
-                              keywords.add("ev yapımı " + object_name)
-                              keywords.add("hızlı " + object_name + " yapımı")
-                
-            else:
-               # İngilizce için orijinal kod
-               # (Mevcut kodunuz burada kalabilir)
-               pass
-
-            # Sonuçları filtrele ve sınırla
-            filtered_keywords = [k for k in keywords if k != object_name and len(k) > 2]
-            result = filtered_keywords[:self.keyword_count]
-
-            # Eğer sonuç listesi boşsa veya çok az ise, varsayılan anahtar kelimeler ekle
-            if len(result) < 3:
-                if is_turkish:
-                     result.extend([
-                          object_name + " nedir", 
-                          object_name + " özellikleri", 
-                          object_name + " kullanımı",
-                          object_name + " hakkında bilgi",
-                          object_name + " türleri"
-                     ])
-                else:
-                    result.extend([
-                        object_name + " types", 
-                        object_name + " uses", 
-                        object_name + " features",
-                        object_name + " about",
-                        object_name + " information"
-                    ])
-                # Tekrar eden öğeleri kaldır ve limitle
-                result = list(set(result))[:self.keyword_count]
-   
+            object_name = " ".join(object_name.split())
+
+            # Geçmiş yalnızca Türkçe üretimi etkiler
+            last_keywords = self.history[-1] if use_history and is_turkish and self.history else None
+            fingerprint = frozenset()
+            if last_keywords:
+                fingerprint = self.rules.history_fingerprint(last_keywords)
+
+            cache_key = (object_name, is_turkish, fingerprint)
+            cached = self.cache.get(cache_key)
+            metrics.count("cache_requests_total", cache="keywords", result="miss" if cached is None else "hit")
+            if cached is None:
+                cached = tuple(self._build_keywords(object_name, is_turkish, last_keywords))
+                self.cache.put(cache_key, cached)
+            result = list(cached)
+
             # Geçmişe ekle
-            self.history.append(set(result))
-            if len(self.history) > 10:  # Maksimum 10 geçmiş öğesi tut
-                self.history.pop(0)
+            if use_history:
+                self.history.append(set(result))
+                if len(self.history) > 10:  # Maksimum 10 geçmiş öğesi tut
+                    self.history.pop(0)
 
             logger.info(f"Üretilen anahtar kelimeler ({('Türkçe' if is_turkish else 'İngilizce')}): {result}")
             return result
@@ -235,4 +369,64 @@ class KeywordExtractor:
                        object_name + " bilgi", object_name + " türleri"]
             else:
                 return [object_name + " types", object_name + " uses", object_name + " features", 
-                       object_name + " about", object_name + " information"]
\ No newline at end of file
+                       object_name + " about", object_name + " information"]
+
+    def _build_keywords(self, object_name, is_turkish, last_keywords=None):
+        """Kural tablolarını uygulayarak anahtar kelime listesini oluşturur."""
+        keywords = set()
+
+        # Tüm kural terimleri nesne adında tek geçişte aranır
+        object_lower = object_name.lower().strip()
+        found = self.rules.object_matcher.found(object_lower)
+
+        # Tam veya kısmi eşleşen kategorinin niteliklerini ekle
+        matched_object = self.rules.match_category(object_lower, found)
+        if matched_object:
+            keywords.update(self.rules.categories[matched_object])
+
+        # Eğer nesne adı Türkçe ise ve Türkçe özel işlem yap
+        if is_turkish:
+            # 1. Türkçe önceden tanımlanmış ilişkili kelimeler
+            keywords.update(self.tr_related_words.get(object_lower, []))
+
+            # Kelime vektörlerine göre alan sözlüğünden ilişkili kelimeler
+            if self.expander is not None:
+                keywords.update(self.expander.expand(object_lower))
+
+            # 2. Bağlamsal zenginleştirme - Özel durumlar için
+            keywords.update(self.rules.context_keywords(found))
+
+            # 3. Türkçe kalıp tabanlı anahtar kelimeler
+            keywords.update(self.rules.template_keywords(object_name, found))
+
+            # Geçmiş sorguları dikkate alan gelişmiş bağlam oluşturma
+            if last_keywords:
+                keywords.update(self.rules.history_keywords(object_name, found, last_keywords))
+
+        # Sonuçları filtrele ve sınırla
+        filtered_keywords = [k for k in keywords if k != object_name and len(k) > 2]
+        result = filtered_keywords[:self.keyword_count]
+
+        # Eğer sonuç listesi boşsa veya çok az ise, varsayılan anahtar kelimeler ekle
+        if len(result) < 3:
+            if is_turkish:
+                 result.extend([
+                      object_name + " nedir", 
+                      object_name + " özellikleri", 
+                      object_name + " kullanımı",
+                      object_name + " hakkında bilgi",
+                      object_name + " türleri"
+                 ])
+            else:
+                result.extend([
+                    object_name + " types", 
+                    object_name + " uses", 
+                    object_name + " features",
+                    object_name + " about",
+                    object_name + " information"
+                ])
+            # Tekrar eden öğeleri kaldır ve limitle
+            result = list(set(result))[:self.keyword_count]
+
+        return result
+
@@ -0,0 +1,180 @@
+# modules/knowledge_store.py
+# Tespit edilebilen tüm sınıflar için önceden çekilmiş yerel bilgi deposu
+
+import json
+import logging
+import os
+import threading
+import time
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# YOLOv8 (COCO) modelinin 80 sınıfı
+COCO_CLASSES = [
+    "person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat",
+    "traffic light", "fire hydrant", "stop sign", "parking meter", "bench", "bird", "cat",
+    "dog", "horse", "sheep", "cow", "elephant", "bear", "zebra", "giraffe", "backpack",
+    "umbrella", "handbag", "tie", "suitcase", "frisbee", "skis", "snowboard", "sports ball",
+    "kite", "baseball bat", "baseball glove", "skateboard", "surfboard", "tennis racket",
+    "bottle", "wine glass", "cup", "fork", "knife", "spoon", "bowl", "banana", "apple",
+    "sandwich", "orange", "broccoli", "carrot", "hot dog", "pizza", "donut", "cake", "chair",
+    "couch", "potted plant", "bed", "dining table", "toilet", "tv", "laptop", "mouse",
+    "remote", "keyboard", "cell phone", "microwave", "oven", "toaster", "sink",
+    "refrigerator", "book", "clock", "vase", "scissors", "teddy bear", "hair drier",
+    "toothbrush",
+]
+
+CUSTOM_DATASET_YAML = "custom_objects_dataset/data.yaml"
+
+# Kayıtların yenilenmeden kullanılabileceği süre (saniye)
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+# Kayıtların varsayılan dili (önek almaz; eski depolar bu dilde sayılır)
+DEFAULT_LANG = "tr"
+
+
+def load_custom_classes(path=CUSTOM_DATASET_YAML):
+    """Özel veri setinin data.yaml dosyasındaki sınıf adlarını döndürür."""
+    try:
+        import yaml
+        with open(path, 'r', encoding='utf-8') as f:
+            names = yaml.safe_load(f).get('names', {})
+    except Exception as e:
+        logger.warning(f"Özel sınıflar okunamadı ({path}): {e}")
+        return []
+    if isinstance(names, dict):
+        return [name for _, name in sorted(names.items())]
+    return list(names)
+
+
+def detectable_classes(custom_yaml=CUSTOM_DATASET_YAML):
+    """COCO ve özel modelin tüm sınıf adları (tekrarsız, sıralı)."""
+    return list(dict.fromkeys(COCO_CLASSES + load_custom_classes(custom_yaml)))
+
+
+def _normalize(name):
+    return " ".join(name.lower().split())
+
+
+def _key(name, lang):
+    key = _normalize(name)
+    return key if lang == DEFAULT_LANG else f"{lang}:{key}"
+
+
+class KnowledgeStore:
+    """
+    Sınıf başına Türkçe ad, anahtar kelimeler, Wikipedia özeti ve ilk arama
+    sonuçlarını tutan tek dosyalık JSON deposu.
+
+    Depo küçük olduğu için açılışta tamamen belleğe okunur; kayıtlar sınıf adı
+    ve dil ile anahtarlanır, hem İngilizce sınıf adıyla hem Türkçe adıyla
+    bulunabilir. Arama sorgusu anahtara girmez: sorgu anahtar kelimelerin
+    sırasına ve o anki bağlama göre değişebilir.
+    """
+
+    def __init__(self, path="data/knowledge_store.json", max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._index = {}
+        for key, entry in self._entries.items():
+            self._index_entry(key, entry)
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Bilgi deposu okunamadı: {e}")
+            return {}
+
+    def _index_entry(self, key, entry):
+        lang = entry.get('lang', DEFAULT_LANG)
+        self._index[_key(entry.get('name', key), lang)] = key
+        if entry.get('tr_name'):
+            self._index[_key(entry['tr_name'], lang)] = key
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return _key(name, DEFAULT_LANG) in self._index
+
+    def get(self, name, lang=DEFAULT_LANG, fresh_only=True):
+        """İngilizce veya Türkçe ada ve dile göre kaydı döndürür; yoksa (ya da eskiyse) None."""
+        key = self._index.get(_key(name, lang))
+        if key is None:
+            return None
+        entry = self._entries[key]
+        if fresh_only and not self.is_fresh(entry):
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry.get('updated_at', 0) <= self.max_age
+
+    def put(self, name, entry, lang=DEFAULT_LANG):
+        """Kaydı ekler veya günceller (save() çağrılana kadar yalnızca bellekte)."""
+        key = _key(name, lang)
+        entry = dict(entry, name=name, lang=lang, updated_at=time.time())
+        with self._lock:
+            self._entries[key] = entry
+            self._index_entry(key, entry)
+
+    def stale(self, names, lang=DEFAULT_LANG):
+        """Kaydı olmayan veya süresi dolmuş sınıf adlarını döndürür."""
+        return [name for name in names if self.get(name, lang) is None]
+
+    def save(self):
+        """Depoyu atomik olarak diske yazar."""
+        with self._lock:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+
+
+def prefetch(store, names, translator, keyword_extractor, web_searcher, refresh=False, save_every=10,
+             lang=DEFAULT_LANG):
+    """
+    Sınıflar için bilgi kayıtlarını çekip depoya yazar.
+
+    Varsayılan olarak yalnızca eksik veya süresi dolmuş kayıtlar yenilenir;
+    refresh=True ise tüm sınıflar yeniden çekilir.
+
+    Returns:
+        Güncellenen sınıf sayısı
+    """
+    targets = list(names) if refresh else store.stale(names, lang)
+    logger.info(f"{len(targets)}/{len(names)} sınıf için bilgi çekilecek")
+
+    updated = 0
+    for i, name in enumerate(targets, 1):
+        try:
+            tr_name = translator.translate(name)
+            # Kayıtlar önceki sınıfların bağlamından bağımsız olmalı
+            keyword_extractor.history.clear()
+            keywords = keyword_extractor.generate_keywords(tr_name, is_turkish=True)
+            knowledge = web_searcher.fetch_knowledge(tr_name, keywords, lang=lang)
+            if not knowledge['results'] and not knowledge['wikipedia']:
+                logger.warning(f"Bilgi bulunamadı, atlandı: {name}")
+                continue
+            store.put(name, dict(knowledge, tr_name=tr_name, keywords=keywords), lang)
+            updated += 1
+            logger.info(f"[{i}/{len(targets)}] {name} ({tr_name}) kaydedildi")
+            # Uzun süren çekimde kesinti olursa ilerleme kaybolmasın
+            if updated % save_every == 0:
+                store.save()
+        except Exception as e:
+            logger.error(f"{name} için bilgi çekilirken hata: {e}")
+
+    if updated:
+        store.save()
+    return updated
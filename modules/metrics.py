@@ -0,0 +1,259 @@
+# modules/metrics.py
+# Aşama süreleri ve önbellek isabetleri için hafif, süreç içi ölçüm katmanı
+
+import bisect
+import functools
+import json
+import threading
+import time
+
+import config
+
+# Süre histogramlarının üst sınırları (saniye)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Prometheus çıktısındaki ölçüm adlarının ön eki
+PREFIX = "goruntu_"
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    """Sabit kovalı histogram; gözlem başına bir ikili arama ve kilit."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Son kova: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q, counts=None, total=None):
+        """Kova üst sınırına göre yaklaşık yüzdelik (son kovada gözlenen en büyük değer)."""
+        counts = counts if counts is not None else self.counts
+        total = total if total is not None else self.count
+        if not total:
+            return 0.0
+        rank, seen = q * total, 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self):
+        with self._lock:
+            counts, total, total_sum, maximum = list(self.counts), self.count, self.sum, self.max
+        return {
+            "count": total,
+            "sum": round(total_sum, 6),
+            "avg": round(total_sum / total, 6) if total else 0.0,
+            "max": round(maximum, 6),
+            "p50": self.quantile(0.5, counts, total),
+            "p95": self.quantile(0.95, counts, total),
+            "p99": self.quantile(0.99, counts, total),
+            "buckets": counts,
+        }
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """
+    Ada ve etiketlere göre histogram, sayaç ve anlık değer (gauge) tutan kayıt.
+
+    Ölçümler bellekte toplanır; snapshot() JSON'a uygun sözlük,
+    prometheus() Prometheus metin biçimi döndürür. enabled=False iken
+    zamanlayıcılar ve sayaçlar hiçbir şey yapmaz.
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._histograms = {}   # ad -> {etiket anahtarı: Histogram}
+        self._counters = {}     # ad -> {etiket anahtarı: değer}
+        self._gauges = {}       # ad -> {etiket anahtarı: fonksiyon}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, **labels):
+        return self._histogram(name, _label_key(labels))
+
+    def _histogram(self, name, key):
+        series = self._histograms.get(name)
+        histogram = series.get(key) if series is not None else None
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, {}).setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def timer(self, name, **labels):
+        """Bloğun süresini ölçen bağlam yöneticisi: with metrics.timer('stage_seconds', stage='fetch'): ..."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name, **labels))
+
+    def observe(self, name, value, **labels):
+        if self.enabled:
+            self.histogram(name, **labels).observe(value)
+
+    def timed(self, name, **labels):
+        """Fonksiyonun her çağrısının süresini ölçen dekoratör."""
+        key = _label_key(labels)
+
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Timer(self._histogram(name, key)):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def gauge(self, name, fn, **labels):
+        """Dışa aktarım anında fn() ile okunan anlık değer kaydeder (ör. kuyruk derinliği)."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = fn
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def _read_gauges(self):
+        with self._lock:
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+        values = {}
+        for name, series in gauges.items():
+            for key, fn in series.items():
+                try:
+                    values.setdefault(name, {})[key] = float(fn())
+                except Exception:
+                    continue  # Kapanmış bileşenin değeri okunamayabilir
+        return values
+
+    def snapshot(self):
+        """Tüm ölçümleri JSON'a yazılabilir sözlük olarak döndürür."""
+        with self._lock:
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        def labelled(series, convert):
+            return [dict(dict(key), value=convert(value)) for key, value in sorted(series.items())]
+
+        return {
+            "buckets": list(self.buckets),
+            "histograms": {name: labelled(series, Histogram.snapshot) for name, series in histograms.items()},
+            "counters": {name: labelled(series, lambda value: value) for name, series in counters.items()},
+            "gauges": {name: labelled(series, lambda value: value)
+                       for name, series in self._read_gauges().items()},
+        }
+
+    def prometheus(self):
+        """Ölçümleri Prometheus metin biçiminde döndürür."""
+        with self._lock:
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        lines = []
+        for name, series in sorted(histograms.items()):
+            metric = PREFIX + name
+            lines.append(f"# TYPE {metric} histogram")
+            for key, histogram in sorted(series.items()):
+                data = histogram.snapshot()
+                cumulative = 0
+                for bound, bucket_count in zip(list(self.buckets) + ["+Inf"], data["buckets"]):
+                    cumulative += bucket_count
+                    lines.append(f"{metric}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+                lines.append(f"{metric}_sum{_format_labels(key)} {data['sum']}")
+                lines.append(f"{metric}_count{_format_labels(key)} {data['count']}")
+        for name, series in sorted(counters.items()):
+            metric = PREFIX + name
+            lines.append(f"# TYPE {metric} counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{metric}{_format_labels(key)} {value}")
+        for name, series in sorted(self._read_gauges().items()):
+            metric = PREFIX + name
+            lines.append(f"# TYPE {metric} gauge")
+            for key, value in sorted(series.items()):
+                lines.append(f"{metric}{_format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Anlık görüntüyü dosyaya yazar (.prom uzantısında Prometheus, diğerlerinde JSON)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith(".prom"):
+                f.write(self.prometheus())
+            else:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+
+# Uygulama genelinde kullanılan kayıt (GORUNTU_METRICS=0 ile kapatılır)
+REGISTRY = MetricsRegistry(enabled=config.METRICS_ENABLED)
+
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+observe = REGISTRY.observe
+count = REGISTRY.count
+gauge = REGISTRY.gauge
+snapshot = REGISTRY.snapshot
+prometheus = REGISTRY.prometheus
+dump = REGISTRY.dump
@@ -8,13 +8,15 @@ import torch
 # YOLOv8 için ultralytics kütüphanesini kullanma
 from ultralytics import YOLO
 
+from modules import metrics
+
 # Loglama ayarları
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ObjectDetector:
     def __init__(self, model_path=None, confidence_threshold=0.3, custom_model=False, device=None, 
-                 ensemble=True, optimize=True):
+                 ensemble=True, optimize=True, translator=None):
         """
         Nesne tanıma modelini yükler.
         
@@ -25,11 +27,15 @@ class ObjectDetector:
             device: Modelin çalışacağı cihaz ('cuda', 'cpu' vs.)
             ensemble: Birden fazla modeli birleştirerek kullan (daha iyi sonuçlar için)
             optimize: Modeli optimize ederek hızlandır ve iyileştir
+            translator: Verilirse, model yüklenirken sınıf id'sine göre Türkçe etiket tablosu oluşturulur
         """
         self.confidence_threshold = confidence_threshold
         self.custom_model = custom_model
         self.ensemble = ensemble
         self.optimize = optimize
+        self.translator = translator
+        self.label_tables = []  # Her model için sınıf id -> Türkçe etiket tablosu
+        self.last_primary_object = None  # Son tespitteki ana nesne
         
         # Device kontrolü
         if device is None:
@@ -109,6 +115,11 @@ class ObjectDetector:
                 model.to(self.device)
                 
             logger.info(f"{len(self.models)} model başarıyla yüklendi.")
+
+            # Türkçe etiket tablolarını model yüklenirken bir kez oluştur
+            if self.translator is not None:
+                self.label_tables = [self.translator.build_label_table(model.names)
+                                     for model in self.models]
                 
         except Exception as e:
             logger.error(f"Model yüklenirken hata: {e}")
@@ -124,141 +135,180 @@ class ObjectDetector:
         Returns:
             (en_önemli_nesne_adı, işaretlenmiş_görüntü) çifti
         """
+        primary_object, marked_image = self.detect_primary(image)
+        self.last_primary_object = primary_object
+        return (primary_object['name'] if primary_object else None), marked_image
+
+    def detect_primary(self, image: Image.Image) -> Tuple[Optional[Dict[str, Any]], Image.Image]:
+        """
+        detect_objects gibi çalışır ancak ana nesnenin tüm bilgisini (Türkçe adı,
+        güveni) döndürür; sonuç last_primary_object'e yazılmaz.
+        
+        Returns:
+            (ana_nesne sözlüğü veya None, işaretlenmiş_görüntü) çifti
+        """
+        return self.detect_batch([image])[0]
+
+    @metrics.timed("stage_seconds", stage="detect")
+    def detect_batch(self, images: List[Image.Image]) -> List[Tuple[Optional[Dict[str, Any]], Image.Image]]:
+        """
+        Birden çok görüntüyü her modelden tek bir toplu çağrıyla geçirir.
+        
+        Args:
+            images: PIL görüntü listesi
+            
+        Returns:
+            Her görüntü için (ana_nesne sözlüğü veya None, işaretlenmiş_görüntü) çifti
+        """
         try:
-            # Tüm tespitleri saklayacak liste
-            all_detections = []
+            # Görüntü başına tüm tespitleri saklayacak listeler
+            detections = [[] for _ in images]
             
             # Tüm modellerden tahmin al
             for i, model in enumerate(self.models):
-                logger.info(f"Model {i+1} ile tespit yapılıyor...")
+                logger.info(f"Model {i+1} ile {len(images)} görüntüde tespit yapılıyor...")
                 
                 # Görüntü boyutunu ayarla (farklı modeller için farklı boyutlar)
                 img_size = 640 if i == 0 else 320 + i * 160  # ilk model 640, sonraki modeller farklı boyutlar
                 
-                # YOLOv8 ile nesneleri tespit et
-                results = model(image, imgsz=img_size, device=self.device)
-                
-                # İlk sonucu al
-                result = results[0]
+                # YOLOv8 ile nesneleri tespit et (görüntü başına bir sonuç)
+                with metrics.timer("model_seconds", model=i + 1):
+                    results = model(list(images), imgsz=img_size, device=self.device)
                 
-                # Debug için tüm sonuçları logla
-                for box in result.boxes:
-                    cls_id = int(box.cls[0])
-                    name = result.names[cls_id] 
-                    conf = float(box.conf[0])
-                    logger.info(f"Model {i+1} Tespiti: {name} (Güven: {conf:.2f})")
-                
-                # Güven eşiğini geçen nesneleri filtrele
-                for box in result.boxes:
-                    if box.conf[0] >= self.confidence_threshold:
-                        cls_id = int(box.cls[0])
-                        object_name = result.names[cls_id]
-                        confidence = float(box.conf[0])
-                        
-                        # Her modele göre güven skorunu ayarla
-                        # Eğer özel modelimiz ise daha fazla ağırlık ver
-                        if i == 0 and self.custom_model:
-                            confidence *= 1.2  # Özel modele %20 bonus
-                        
-                        # Bounding box koordinatları
-                        bbox = (
-                            float(box.xyxy[0][0]), 
-                            float(box.xyxy[0][1]),
-                            float(box.xyxy[0][2]),
-                            float(box.xyxy[0][3])
-                        )
-                        
-                        # Nesne boyutu (görüntüye oranı)
-                        box_width = bbox[2] - bbox[0]
-                        box_height = bbox[3] - bbox[1]
-                        box_area = box_width * box_height
-                        image_area = image.width * image.height
-                        relative_size = box_area / image_area
-                        
-                        # Nesne merkezinin koordinatları
-                        center_x = (bbox[0] + bbox[2]) / 2
-                        center_y = (bbox[1] + bbox[3]) / 2
-                        
-                        # Görüntü merkezine olan uzaklık
-                        image_center_x = image.width / 2
-                        image_center_y = image.height / 2
-                        distance_to_center = ((center_x - image_center_x) ** 2 + 
-                                             (center_y - image_center_y) ** 2) ** 0.5
-                        
-                        # Normalize edilmiş merkeze uzaklık (0-1 arası)
-                        normalized_distance = distance_to_center / ((image.width/2)**2 + (image.height/2)**2)**0.5
-                        
-                        # Merkeze yakınlık skoru (0-1 arası, 1 en yakın)
-                        center_score = 1 - normalized_distance
-                        
-                        # Nesne önemi skoru hesapla
-                        importance_score = 0
-                        
-                        # Önemli nesne listesinde ise ekstra puan
-                        if object_name.lower() in [x.lower() for x in self.priority_objects]:
-                            importance_score += 0.4
-                        
-                        # Ana önem skorunu hesapla
-                        importance_score += (
-                            confidence * 0.2 +  # Güven skoru etkisi
-                            relative_size * 0.25 +  # Boyut etkisi
-                            center_score * 0.15  # Merkeze yakınlık etkisi
-                        )
-                        
-                        # Model indeksine göre ağırlık ver
-                        model_weight = 1.0
-                        if self.ensemble:
-                            # İlk model özel model ise daha fazla ağırlık ver
-                            if i == 0 and self.custom_model:
-                                model_weight = 1.3
-                            else:
-                                model_weight = 1.0 - (i * 0.1)  # Sonraki modellere azalan ağırlık
-                        
-                        importance_score *= model_weight
-                        
-                        # İnsan tespitinde daha düşük öncelik ver
-                        if object_name.lower() == 'person':
-                            # Eğer görüntünün büyük kısmını kaplıyorsa (muhtemelen ana nesne değil)
-                            if relative_size > 0.4:
-                                importance_score -= 0.3
-                        
-                        all_detections.append({
-                            'name': object_name,
-                            'confidence': confidence,
-                            'bbox': bbox,
-                            'relative_size': relative_size,
-                            'center_score': center_score,
-                            'importance_score': importance_score,
-                            'model_index': i
-                        })
-            
-            if not all_detections:
-                logger.warning("Yeterli güven düzeyinde nesne tespit edilemedi!")
-                return None, image
-            
-            # Ensemble sonuçlarını işleme
-            if self.ensemble:
-                # Tespitleri birleştir ve ortalama
-                merged_detections = self._merge_detections(all_detections)
-                all_detections = merged_detections
-            
-            # Debug: Tüm tespit edilen nesnelerin önem skorlarını göster
-            for obj in all_detections:
-                logger.info(f"Nesne: {obj['name']}, Önem skoru: {obj['importance_score']:.3f}, "
-                           f"Boyut: {obj['relative_size']:.3f}, Merkez skoru: {obj['center_score']:.3f}")
-            
-            # En önemli nesneyi bul
-            primary_object = max(all_detections, key=lambda x: x['importance_score'])
+                for image, result, image_detections in zip(images, results, detections):
+                    image_detections.extend(self._collect_detections(i, image, result))
             
-            # Tüm tespit edilen nesneleri işaretle, ana nesneyi vurgula
-            marked_image = self._mark_objects(image, all_detections, primary_object)
-            
-            return primary_object['name'], marked_image
+            return [self._select_primary(image, all_detections)
+                    for image, all_detections in zip(images, detections)]
                 
         except Exception as e:
             logger.error(f"Nesne tespiti sırasında hata: {e}")
             raise
 
+    def _collect_detections(self, i, image, result):
+        """i. modelin bir görüntüdeki sonucundan güven eşiğini geçen tespitleri önem skoruyla çıkarır."""
+        all_detections = []
+        
+        # Debug için tüm sonuçları logla
+        for box in result.boxes:
+            cls_id = int(box.cls[0])
+            name = result.names[cls_id] 
+            conf = float(box.conf[0])
+            logger.info(f"Model {i+1} Tespiti: {name} (Güven: {conf:.2f})")
+        
+        # Güven eşiğini geçen nesneleri filtrele
+        for box in result.boxes:
+            if box.conf[0] >= self.confidence_threshold:
+                cls_id = int(box.cls[0])
+                object_name = result.names[cls_id]
+                tr_name = self.label_tables[i].get(cls_id) if self.label_tables else None
+                confidence = float(box.conf[0])
+                
+                # Her modele göre güven skorunu ayarla
+                # Eğer özel modelimiz ise daha fazla ağırlık ver
+                if i == 0 and self.custom_model:
+                    confidence *= 1.2  # Özel modele %20 bonus
+                
+                # Bounding box koordinatları
+                bbox = (
+                    float(box.xyxy[0][0]), 
+                    float(box.xyxy[0][1]),
+                    float(box.xyxy[0][2]),
+                    float(box.xyxy[0][3])
+                )
+                
+                # Nesne boyutu (görüntüye oranı)
+                box_width = bbox[2] - bbox[0]
+                box_height = bbox[3] - bbox[1]
+                box_area = box_width * box_height
+                image_area = image.width * image.height
+                relative_size = box_area / image_area
+                
+                # Nesne merkezinin koordinatları
+                center_x = (bbox[0] + bbox[2]) / 2
+                center_y = (bbox[1] + bbox[3]) / 2
+                
+                # Görüntü merkezine olan uzaklık
+                image_center_x = image.width / 2
+                image_center_y = image.height / 2
+                distance_to_center = ((center_x - image_center_x) ** 2 + 
+                                     (center_y - image_center_y) ** 2) ** 0.5
+                
+                # Normalize edilmiş merkeze uzaklık (0-1 arası)
+                normalized_distance = distance_to_center / ((image.width/2)**2 + (image.height/2)**2)**0.5
+                
+                # Merkeze yakınlık skoru (0-1 arası, 1 en yakın)
+                center_score = 1 - normalized_distance
+                
+                # Nesne önemi skoru hesapla
+                importance_score = 0
+                
+                # Önemli nesne listesinde ise ekstra puan
+                if object_name.lower() in [x.lower() for x in self.priority_objects]:
+                    importance_score += 0.4
+                
+                # Ana önem skorunu hesapla
+                importance_score += (
+                    confidence * 0.2 +  # Güven skoru etkisi
+                    relative_size * 0.25 +  # Boyut etkisi
+                    center_score * 0.15  # Merkeze yakınlık etkisi
+                )
+                
+                # Model indeksine göre ağırlık ver
+                model_weight = 1.0
+                if self.ensemble:
+                    # İlk model özel model ise daha fazla ağırlık ver
+                    if i == 0 and self.custom_model:
+                        model_weight = 1.3
+                    else:
+                        model_weight = 1.0 - (i * 0.1)  # Sonraki modellere azalan ağırlık
+                
+                importance_score *= model_weight
+                
+                # İnsan tespitinde daha düşük öncelik ver
+                if object_name.lower() == 'person':
+                    # Eğer görüntünün büyük kısmını kaplıyorsa (muhtemelen ana nesne değil)
+                    if relative_size > 0.4:
+                        importance_score -= 0.3
+                
+                all_detections.append({
+                    'name': object_name,
+                    'tr_name': tr_name,
+                    'confidence': confidence,
+                    'bbox': bbox,
+                    'relative_size': relative_size,
+                    'center_score': center_score,
+                    'importance_score': importance_score,
+                    'model_index': i
+                })
+
+        return all_detections
+
+    def _select_primary(self, image, all_detections):
+        """Tespitleri birleştirip en önemli nesneyi seçer ve görüntüyü işaretler."""
+        if not all_detections:
+            logger.warning("Yeterli güven düzeyinde nesne tespit edilemedi!")
+            return None, image
+        
+        # Ensemble sonuçlarını işleme
+        if self.ensemble:
+            # Tespitleri birleştir ve ortalama
+            merged_detections = self._merge_detections(all_detections)
+            all_detections = merged_detections
+        
+        # Debug: Tüm tespit edilen nesnelerin önem skorlarını göster
+        for obj in all_detections:
+            logger.info(f"Nesne: {obj['name']}, Önem skoru: {obj['importance_score']:.3f}, "
+                       f"Boyut: {obj['relative_size']:.3f}, Merkez skoru: {obj['center_score']:.3f}")
+        
+        # En önemli nesneyi bul
+        primary_object = max(all_detections, key=lambda x: x['importance_score'])
+        
+        # Tüm tespit edilen nesneleri işaretle, ana nesneyi vurgula
+        marked_image = self._mark_objects(image, all_detections, primary_object)
+        
+        return primary_object, marked_image
+
     def _merge_detections(self, detections):
         """
         Farklı modellerden gelen tespitleri birleştirir ve benzer olanları ortalar.
@@ -335,6 +385,7 @@ class ObjectDetector:
                     # Yeni birleştirilmiş tespit oluştur
                     merged_det = {
                         'name': obj_name,
+                        'tr_name': base_det.get('tr_name'),
                         'confidence': avg_conf * 1.1,  # Çoklu tespit bonusu
                         'bbox': tuple(weighted_bbox),
                         'relative_size': avg_size,
@@ -0,0 +1,70 @@
+# modules/pattern_matcher.py
+# Çoklu kalıp eşleştirme (Aho-Corasick)
+
+from collections import deque
+
+
+class PatternMatcher:
+    """
+    Birden fazla alt dizgiyi metin üzerinde tek geçişte arayan Aho-Corasick otomatı.
+
+    Otomat bir kez derlenir; arama maliyeti kalıp sayısından bağımsız olarak
+    metin uzunluğu ve bulunan eşleşme sayısı ile orantılıdır.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = []
+        self._goto = [{}]    # Durum -> {karakter: sonraki durum}
+        self._fail = [0]     # Durum -> hata bağlantısı
+        self._output = [[]]  # Durum -> bu durumda biten kalıp indeksleri
+
+        for pattern in dict.fromkeys(patterns):  # Sırayı koruyarak tekrarları at
+            if pattern:
+                self._add(pattern)
+        self._build()
+
+    def _add(self, pattern):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # Hata bağlantısındaki çıktıları önceden birleştir (aramada zincir takibi gerekmez)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """Metindeki tüm eşleşmeleri (başlangıç, bitiş, kalıp) olarak üretir."""
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self.patterns
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                pattern = patterns[index]
+                yield end - len(pattern), end, pattern
+
+    def found(self, text):
+        """Metinde geçen kalıpların kümesini döndürür."""
+        return {pattern for _, _, pattern in self.iter_matches(text)}
+
+    def __len__(self):
+        return len(self.patterns)
@@ -0,0 +1,289 @@
+# modules/pipeline.py
+# Toplu analiz için sınırlı kuyruklarla birbirine bağlı eşzamanlı aşamalar
+
+import glob
+import logging
+import os
+import queue
+import threading
+import time
+
+from modules import metrics
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp", ".tif", ".tiff")
+
+# Aşama işçilerini durduran işaret
+_STOP = object()
+
+
+def iter_batch_sources(spec):
+    """
+    Toplu kip kaynaklarını döndürür.
+
+    Args:
+        spec: Klasör (içindeki görüntüler), glob deseni (ör. 'fotolar/*.jpg')
+            ya da her satırında bir URL/dosya yolu bulunan metin dosyası
+            ('#' ile başlayan satırlar atlanır)
+    """
+    if os.path.isdir(spec):
+        return sorted(os.path.join(spec, name) for name in os.listdir(spec)
+                      if name.lower().endswith(IMAGE_EXTENSIONS))
+    if os.path.isfile(spec):
+        if spec.lower().endswith(IMAGE_EXTENSIONS):
+            return [spec]
+        with open(spec, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return sorted(glob.glob(spec))
+
+
+def research(keyword_extractor, web_searcher, tr_object_name, use_history=True):
+    """
+    Anahtar kelime üretir, web'de arar ve içeriği çıkarır; sonuç yoksa None.
+
+    use_history=False ise önceki analizlerin anahtar kelime ve arama geçmişi
+    kullanılmaz; aynı nesneleri paylaşan eşzamanlı çağrılar böyle çalışmalıdır.
+    """
+    keywords = keyword_extractor.generate_keywords(tr_object_name, is_turkish=True, use_history=use_history)
+    search_results = web_searcher.search_web(tr_object_name, keywords, lang="tr", use_history=use_history)
+    if not search_results:
+        return None
+    # İçerik çıkarma - object_name ve keywords parametrelerini geçirerek zenginleştir
+    content = web_searcher.extract_content(search_results, tr_object_name, keywords, lang="tr")
+    return {"keywords": keywords, "content": content}
+
+
+class Stage:
+    """
+    Boru hattının bir aşaması.
+
+    Args:
+        name: Aşama adı (ölçümlerde ve hata mesajlarında)
+        fn: İş öğesini (sözlük) alıp güncelleyen fonksiyon; öğede 'done' True
+            yapılırsa sonraki aşamalar atlanır
+        workers: Aşamanın eşzamanlı işçi sayısı
+    """
+
+    def __init__(self, name, fn, workers=1):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+
+
+class Pipeline:
+    """
+    Aşamaları sınırlı kuyruklarla birbirine bağlayıp eşzamanlı çalıştırır.
+
+    Her aşamanın kendi işçileri vardır; kuyruklar dolunca önceki aşama
+    bekler (geri basınç), böylece bellek kullanımı sınırlı kalır. Aşamada
+    oluşan hata öğeye yazılır ve öğe doğrudan çıkışa gönderilir. Çıkış
+    sırası giriş sırasıyla aynı olmayabilir.
+
+    Args:
+        stages: Stage listesi
+        queue_size: Aşamalar arasındaki her kuyruğun kapasitesi
+    """
+
+    def __init__(self, stages, queue_size=8):
+        self.stages = stages
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self.metrics = {}
+        self._queues = []
+
+    def _count(self, stage, name, value=1):
+        with self._lock:
+            self.metrics[stage.name][name] += value
+
+    def _worker(self, index):
+        stage = self.stages[index]
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1]
+        output = self._queues[-1]
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                break
+            start = time.perf_counter()
+            try:
+                stage.fn(item)
+                self._count(stage, "processed")
+            except Exception as e:
+                logger.error(f"{stage.name} aşamasında hata ({item.get('source')}): {e}")
+                item["error"] = f"{stage.name}: {e}"
+                item["done"] = True
+                self._count(stage, "failed")
+            elapsed = time.perf_counter() - start
+            self._count(stage, "busy_seconds", elapsed)
+            metrics.observe("pipeline_stage_seconds", elapsed, stage=stage.name)
+            (output if item.get("done") else outbox).put(item)
+
+        # Aşamanın son işçisi sonraki aşamanın işçilerini durdurur
+        with self._lock:
+            self._alive[index] -= 1
+            last = self._alive[index] == 0
+        if last:
+            stops = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            for _ in range(stops):
+                outbox.put(_STOP)
+
+    def _feed(self, sources):
+        inbox = self._queues[0]
+        for i, source in enumerate(sources):
+            inbox.put({"index": i, "source": source, "started": time.perf_counter()})
+        for _ in range(self.stages[0].workers):
+            inbox.put(_STOP)
+
+    def run(self, sources, sink=None):
+        """
+        Kaynakları boru hattından geçirir; biten her öğe için sink(öğe) çağrılır.
+
+        Returns:
+            Öğe sayısı, süre, saniyedeki öğe ve aşama ölçümlerini içeren özet
+        """
+        self.metrics = {stage.name: {"workers": stage.workers, "processed": 0, "failed": 0,
+                                     "busy_seconds": 0.0, "max_queue": 0}
+                        for stage in self.stages}
+        # Aşama girişleri + ortak çıkış kuyruğu (çıkış sınırsız: tüketici aşamaları bekletmesin)
+        self._queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages] + [queue.Queue()]
+        self._alive = [stage.workers for stage in self.stages]
+        for stage, inbox in zip(self.stages, self._queues):
+            metrics.gauge("queue_depth", inbox.qsize, queue=f"pipeline_{stage.name}")
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._feed, args=(sources,), daemon=True, name="pipeline-feed")]
+        for index, stage in enumerate(self.stages):
+            threads += [threading.Thread(target=self._worker, args=(index,), daemon=True,
+                                         name=f"pipeline-{stage.name}-{n}")
+                        for n in range(stage.workers)]
+        for thread in threads:
+            thread.start()
+
+        completed = failed = 0
+        output = self._queues[-1]
+        while True:
+            try:
+                item = output.get(timeout=0.5)
+            except queue.Empty:
+                self._sample_queues()
+                continue
+            if item is _STOP:
+                break
+            completed += 1
+            failed += 1 if item.get("error") else 0
+            item["seconds"] = round(time.perf_counter() - item.pop("started"), 3)
+            metrics.observe("item_seconds", item["seconds"], status="failed" if item.get("error") else "ok")
+            self._sample_queues()
+            if sink is not None:
+                sink(item)
+
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return {
+            "items": completed,
+            "failed": failed,
+            "seconds": round(elapsed, 3),
+            "items_per_second": round(completed / elapsed, 3) if elapsed > 0 else 0.0,
+            "stages": self.metrics,
+        }
+
+    def _sample_queues(self):
+        with self._lock:
+            for stage, inbox in zip(self.stages, self._queues):
+                stage_metrics = self.metrics[stage.name]
+                stage_metrics["max_queue"] = max(stage_metrics["max_queue"], inbox.qsize())
+
+
+class AnalysisStages:
+    """
+    main.py'deki etkileşimli akışın aşamalarını boru hattı için ayırır:
+    fetch -> preprocess -> detect -> keywords -> search -> store.
+
+    Taze bir geçmiş kaydı olan nesneler (answer_cache) arama ve kayıt
+    aşamalarını atlar. İşaretlenmiş görüntü kaydedilmez. Öğeler aynı
+    KeywordExtractor ve WebSearcher nesnelerini eşzamanlı kullandığından
+    anahtar kelime ve arama geçmişi kullanılmaz; her öğenin sorgusu ve özeti
+    yalnızca kendi nesnesi ve anahtar kelimeleriyle oluşturulur.
+    """
+
+    def __init__(self, object_detector, translator, keyword_extractor, web_searcher, answer_cache):
+        self.object_detector = object_detector
+        self.translator = translator
+        self.keyword_extractor = keyword_extractor
+        self.web_searcher = web_searcher
+        self.answer_cache = answer_cache
+
+    def fetch(self, item):
+        from modules.image_processor import get_image_from_source
+        image = get_image_from_source(item["source"])
+        image.load()  # Dosya/ağ okuması bu aşamada bitsin
+        item["image"] = image
+
+    def preprocess(self, item):
+        from modules.image_processor import preprocess_image
+        item["image"] = preprocess_image(item["image"])
+
+    def detect(self, item):
+        primary_object, _ = self.object_detector.detect_primary(item.pop("image"))
+        if primary_object is None:
+            item["done"] = True
+            return
+        item["object"] = primary_object["name"]
+        item["tr_object"] = primary_object.get("tr_name")
+        item["confidence"] = round(primary_object["confidence"], 3)
+
+    def keywords(self, item):
+        entry = self.answer_cache.lookup(item["object"])
+        if entry is not None:
+            item.update(keywords=entry["keywords"], content=entry["content"], from_history=True, done=True)
+            return
+        if not item["tr_object"]:
+            item["tr_object"] = self.translator.translate(item["object"])
+        item["keywords"] = self.keyword_extractor.generate_keywords(item["tr_object"], is_turkish=True,
+                                                                    use_history=False)
+
+    def search(self, item):
+        results = self.web_searcher.search_web(item["tr_object"], item["keywords"], lang="tr", use_history=False)
+        if not results:
+            item["content"] = None
+            item["done"] = True
+            return
+        item["content"] = self.web_searcher.extract_content(results, item["tr_object"], item["keywords"], lang="tr")
+
+    def store(self, item):
+        self.answer_cache.store(item["object"], item["keywords"], item["content"])
+        item["from_history"] = False
+
+    def build(self, workers=None, queue_size=8):
+        """
+        Boru hattını oluşturur.
+
+        Args:
+            workers: Aşama adı -> işçi sayısı (verilmeyenler için DEFAULT_WORKERS)
+        """
+        workers = dict(DEFAULT_WORKERS, **(workers or {}))
+        return Pipeline([Stage(name, getattr(self, name), workers[name]) for name in STAGE_NAMES],
+                        queue_size=queue_size)
+
+
+STAGE_NAMES = ("fetch", "preprocess", "detect", "keywords", "search", "store")
+
+# Ağ aşamaları çok, CPU aşamaları az işçiyle; YOLO modelleri iş parçacıkları
+# arasında paylaşılmaya uygun olmadığından tespit varsayılan olarak tek işçilidir
+DEFAULT_WORKERS = {"fetch": 4, "preprocess": 2, "detect": 1, "keywords": 2, "search": 4, "store": 1}
+
+
+def parse_workers(specs):
+    """'detect=2' biçimindeki işçi sayısı ayarlarını sözlüğe çevirir."""
+    workers = {}
+    for spec in specs or []:
+        name, _, count = spec.partition("=")
+        if name not in STAGE_NAMES or not count.isdigit():
+            raise ValueError(f"Geçersiz işçi ayarı: {spec} (ör. detect=2; aşamalar: {', '.join(STAGE_NAMES)})")
+        workers[name] = int(count)
+    return workers
+
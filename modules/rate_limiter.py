@@ -0,0 +1,200 @@
+# modules/rate_limiter.py
+# Aynı anda yapılan özdeş isteklerin birleştirilmesi ve kota bilinçli hız sınırlama
+
+import calendar
+import json
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Aynı anahtarla süren bir çağrı varsa yenisini başlatmak yerine onun sonucunu bekler.
+
+    Böylece eşzamanlı özdeş sorgular dış servise tek bir istek olarak gider.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.shared = 0  # Başka bir çağrının sonucunu paylaşan istek sayısı
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class TokenBucket:
+    """Saniyede `rate` jeton dolan, en fazla `capacity` jeton biriktiren kova."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens=1):
+        """Yeterli jeton varsa harcar ve True döndürür; beklemez."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def pause(self, seconds):
+        """Kovayı boşaltır; `seconds` saniye boyunca jeton verilmez."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(0.0, self._tokens + (now - self._updated) * self.rate) - seconds * self.rate
+            self._updated = now
+
+
+class QuotaTracker:
+    """
+    Aylık istek kotasını diskte tutar ve kota bitmeden önce isteği reddeder.
+
+    Kullanım ay sonuna kadar yayılır: bir günde harcanabilecek miktar, ayın
+    kalanındaki kullanılabilir kotanın kalan günlere bölümüdür. Son `reserve`
+    istek hiç kullanılmaz. Sayaçlar ay değişince sıfırlanır.
+    """
+
+    def __init__(self, path="data/serper_quota.json", monthly_limit=2000, reserve=100):
+        self.path = path
+        self.monthly_limit = monthly_limit
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Kota dosyası okunamadı, sıfırdan başlanıyor: {e}")
+            return {}
+
+    def _save(self):
+        try:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Kota dosyası yazılamadı: {e}")
+
+    def _current(self, today):
+        """Ay veya gün değiştiyse sayaçları günceller."""
+        month, day = today.strftime("%Y-%m"), today.isoformat()
+        if self._state.get("month") != month:
+            self._state = {"month": month, "used": 0, "exhausted": False}
+        if self._state.get("day") != day:
+            self._state["day"] = day
+            self._state["used_before_today"] = self._state["used"]
+        return self._state
+
+    def daily_budget(self, today=None):
+        """Bugün harcanabilecek toplam istek sayısı."""
+        today = today or date.today()
+        with self._lock:
+            state = self._current(today)
+            return self._daily_budget(state, today)
+
+    def _daily_budget(self, state, today):
+        if state.get("exhausted"):
+            return 0
+        days_left = calendar.monthrange(today.year, today.month)[1] - today.day + 1
+        available = self.monthly_limit - self.reserve - state["used_before_today"]
+        return max(0, math.ceil(available / days_left))
+
+    def try_consume(self, today=None):
+        """Kota izin veriyorsa bir isteği sayar ve True döndürür."""
+        today = today or date.today()
+        with self._lock:
+            state = self._current(today)
+            used_today = state["used"] - state["used_before_today"]
+            if used_today >= self._daily_budget(state, today):
+                return False
+            state["used"] += 1
+            self._save()
+            return True
+
+    def mark_exhausted(self):
+        """Servis kota aşımı bildirdiğinde ayın geri kalanı için isteği durdurur."""
+        with self._lock:
+            self._current(date.today())["exhausted"] = True
+            self._save()
+
+    def info(self):
+        with self._lock:
+            state = self._current(date.today())
+            return {
+                "month": state["month"],
+                "used": state["used"],
+                "monthly_limit": self.monthly_limit,
+                "daily_budget": self._daily_budget(state, date.today()),
+                "exhausted": bool(state.get("exhausted")),
+            }
+
+
+class ProviderLimiter:
+    """Bir sağlayıcı için anlık hız sınırı (TokenBucket) ile aylık kotayı birleştirir."""
+
+    def __init__(self, name, rate=2.0, burst=5, quota=None):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.quota = quota
+        self.denied = 0
+
+    def acquire(self):
+        """İstek yapılabilecekse True döndürür; reddedilen istekler sayılır."""
+        if not self.bucket.try_acquire():
+            self.denied += 1
+            logger.info(f"{self.name} hız sınırına ulaşıldı")
+            return False
+        if self.quota is not None and not self.quota.try_consume():
+            self.denied += 1
+            logger.info(f"{self.name} kotası korunuyor, istek yapılmadı")
+            return False
+        return True
+
+    def backoff(self, seconds):
+        """Servis geçici hız sınırı bildirdiğinde istekleri `seconds` saniye durdurur."""
+        logger.warning(f"{self.name} hız sınırı bildirdi, {seconds:.1f} sn beklenecek")
+        self.bucket.pause(seconds)
@@ -0,0 +1,216 @@
+# modules/replay.py
+# Dış servis yanıtlarını kaydedip yerel bir sunucudan tekrar oynatma (yük testi için)
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tekrar oynatmada özgün adresin taşındığı başlık
+REPLAY_URL_HEADER = "X-Replay-Url"
+
+# Kasete yazılan yanıt başlıkları (diğerleri sunucu tarafından yeniden üretilir)
+RECORDED_HEADERS = ("Content-Type",)
+
+
+def interaction_key(method, url, body):
+    """İsteği yöntem, tam adres ve gövdeye göre tanımlayan anahtar."""
+    if body is None:
+        body = b""
+    elif isinstance(body, str):
+        body = body.encode("utf-8")
+    return f"{method.upper()} {url} {hashlib.sha1(body).hexdigest()}"
+
+
+class Cassette:
+    """
+    Kaydedilmiş istek/yanıt çiftlerini tutan JSON Lines dosyası.
+
+    Aynı isteğe ait birden çok kayıt varsa tekrar oynatmada sırayla döndürülür.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.interactions = {}
+        self._cursors = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._add(json.loads(line))
+
+    def __len__(self):
+        return sum(len(items) for items in self.interactions.values())
+
+    def _add(self, interaction):
+        self.interactions.setdefault(interaction["key"], []).append(interaction)
+
+    def record(self, response):
+        """requests yanıtını (ve onu üreten isteği) kasete ekler."""
+        request = response.request
+        interaction = {
+            "key": interaction_key(request.method, request.url, request.body),
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            "body": base64.b64encode(response.content).decode("ascii"),
+            "elapsed": response.elapsed.total_seconds(),
+        }
+        with self._lock:
+            self._add(interaction)
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(interaction, ensure_ascii=False) + "\n")
+
+    def lookup(self, key):
+        """Anahtara ait sıradaki kaydı döndürür; yoksa None."""
+        with self._lock:
+            items = self.interactions.get(key)
+            if not items:
+                return None
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            return items[cursor % len(items)]
+
+
+class RecordingTransport:
+    """İstekleri gerçek servise gönderir ve yanıtları kasete yazar."""
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+    def send(self, session, method, url, **kwargs):
+        response = session.request(method, url, **kwargs)
+        try:
+            self.cassette.record(response)
+        except Exception as e:
+            logger.warning(f"Yanıt kasete yazılamadı: {url} - {e}")
+        return response
+
+
+class ReplayTransport:
+    """
+    İstekleri yerel tekrar oynatma sunucusuna yönlendirir.
+
+    İstek gerçek servise gidecekmiş gibi hazırlanır (parametreler, gövde),
+    böylece istemci tarafındaki maliyet ölçüme dahil olur; yalnızca hedef
+    adres değişir ve özgün adres bir başlıkta taşınır.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, session, method, url, **kwargs):
+        prepared = requests.Request(
+            method, url,
+            params=kwargs.pop("params", None),
+            data=kwargs.pop("data", None),
+            json=kwargs.pop("json", None),
+            headers=kwargs.pop("headers", None),
+        ).prepare()
+        headers = dict(prepared.headers)
+        headers[REPLAY_URL_HEADER] = prepared.url
+        return session.request(method, self.base_url + "/", data=prepared.body, headers=headers, **kwargs)
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = self.headers.get(REPLAY_URL_HEADER, "")
+
+        delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        if server.error_rate and random.random() < server.error_rate:
+            server.count("errors")
+            self._respond(server.error_status, {"Content-Type": "text/plain"}, b"injected error")
+            return
+
+        interaction = server.cassette.lookup(interaction_key(self.command, url, body))
+        if interaction is None:
+            server.count("misses")
+            logger.warning(f"Kasette bulunamadı: {self.command} {url}")
+            self._respond(404, {"Content-Type": "text/plain"}, b"not recorded")
+            return
+
+        server.count("hits")
+        self._respond(interaction["status"], interaction["headers"], base64.b64decode(interaction["body"]))
+
+    def _respond(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_HEAD = _handle
+
+    def log_message(self, format, *args):
+        # Yük altında her istek için log yazılmasın
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Kasetteki yanıtları yapay gecikme ve hata ekleyerek sunan yerel sunucu.
+
+    Args:
+        cassette: Cassette nesnesi
+        latency: Her yanıt öncesi sabit gecikme (saniye)
+        jitter: Gecikmeye eklenecek en fazla rastgele süre (saniye)
+        error_rate: Kayıt yerine hata döndürülecek isteklerin oranı (0-1)
+        error_status: Eklenen hatanın HTTP durum kodu
+    """
+
+    daemon_threads = True
+
+    def __init__(self, cassette, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 host="127.0.0.1", port=0):
+        super().__init__((host, port), _ReplayHandler)
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stats = {"hits": 0, "misses": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def start(self):
+        """Sunucuyu arka plandaki bir iş parçacığında başlatır."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True, name="replay-server")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
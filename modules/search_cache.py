@@ -0,0 +1,164 @@
+# modules/search_cache.py
+# Web araması ve Wikipedia sonuçları için kalıcı TTL önbelleği
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from modules import metrics
+from utils.helpers import LRUCache
+
+# Loglama ayarları
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sağlayıcı başına sonuçların taze sayılacağı süre (saniye)
+DEFAULT_TTLS = {
+    "serper": 24 * 3600,
+    "duckduckgo": 12 * 3600,
+    "wikipedia": 7 * 24 * 3600,
+}
+DEFAULT_TTL = 6 * 3600
+
+# Süresi dolan sonucun arka planda yenilenirken hâlâ sunulabileceği ek süre
+DEFAULT_STALE_TTL = 7 * 24 * 3600
+
+
+class SearchCache:
+    """
+    Sağlayıcı, sorgu, dil ve sonuç sayısına göre anahtarlanan kalıcı önbellek.
+
+    Sık kullanılan girdiler bellekteki LRU katmanından, diğerleri SQLite
+    dosyasından okunur; dosya yeniden başlatmalarda korunur. Süresi dolmuş
+    ama bayat sayılabilecek girdiler hemen döndürülür ve arka planda yenilenir.
+    """
+
+    def __init__(self, db_path="data/search_cache.db", ttls=None, stale_ttl=DEFAULT_STALE_TTL,
+                 memory_size=1024):
+        self.db_path = db_path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.stale_ttl = stale_ttl
+        self._memory = LRUCache(maxsize=memory_size)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(provider, query, lang=None, num_results=None):
+        return json.dumps([provider, query, lang, num_results], ensure_ascii=False)
+
+    def _ttl(self, provider):
+        return self.ttls.get(provider, DEFAULT_TTL)
+
+    def _lookup(self, key):
+        """Girdiyi (kayıt zamanı, değer) olarak döndürür; yoksa None."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = (row[1], json.loads(row[0]))
+        self._memory.put(key, entry)
+        return entry
+
+    def get(self, provider, query, lang=None, num_results=None, allow_stale=False):
+        """Taze (allow_stale ise bayat da olabilir) değeri döndürür; yoksa None."""
+        entry = self._lookup(self.make_key(provider, query, lang, num_results))
+        if entry is None:
+            return None
+        age = time.time() - entry[0]
+        limit = self._ttl(provider) + (self.stale_ttl if allow_stale else 0)
+        return entry[1] if age <= limit else None
+
+    def set(self, provider, query, lang, num_results, value):
+        """Değeri bellek ve diskteki önbelleğe yazar."""
+        key = self.make_key(provider, query, lang, num_results)
+        stored_at = time.time()
+        self._memory.put(key, (stored_at, value))
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), stored_at),
+                )
+                self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Önbelleğe yazılamadı: {e}")
+
+    def get_or_fetch(self, provider, query, lang, num_results, fetch, executor=None):
+        """
+        Önbellekteki sonucu döndürür, yoksa fetch() ile çekip saklar.
+
+        Süresi dolmuş ama bayatlık penceresindeki sonuç hemen döndürülür ve
+        executor verilmişse arka planda yenilenir. Boş sonuçlar saklanmaz.
+        """
+        key = self.make_key(provider, query, lang, num_results)
+        entry = self._lookup(key)
+
+        if entry is not None:
+            age = time.time() - entry[0]
+            if age <= self._ttl(provider):
+                self.hits += 1
+                metrics.count("cache_requests_total", cache="search", provider=provider, result="hit")
+                return entry[1]
+            if executor is not None and age <= self._ttl(provider) + self.stale_ttl:
+                self.stale_hits += 1
+                metrics.count("cache_requests_total", cache="search", provider=provider, result="stale")
+                self._schedule_refresh(key, provider, query, lang, num_results, fetch, executor)
+                return entry[1]
+
+        self.misses += 1
+        metrics.count("cache_requests_total", cache="search", provider=provider, result="miss")
+        value = fetch()
+        if value:
+            self.set(provider, query, lang, num_results, value)
+        return value
+
+    def _schedule_refresh(self, key, provider, query, lang, num_results, fetch, executor):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = fetch()
+                if value:
+                    self.set(provider, query, lang, num_results, value)
+            except Exception as e:
+                logger.warning(f"Önbellek yenilenirken hata ({provider}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        logger.info(f"Bayat önbellek sonucu döndürüldü, arka planda yenileniyor: {provider} - {query}")
+        executor.submit(refresh)
+
+    def info(self):
+        """Önbellek isabet istatistiklerini döndürür."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "memory": self._memory.info(),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
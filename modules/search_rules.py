@@ -0,0 +1,241 @@
+# modules/search_rules.py
+# Arama sorgusu oluşturma, sonuç puanlama ve içerik biçimlendirme kuralları
+
+from collections import Counter
+
+from modules.pattern_matcher import PatternMatcher
+from utils.helpers import LRUCache
+
+# Nesne kategorileri (sıra önemlidir: nesne adında terimi geçen ilk kategori seçilir).
+# Her kategorinin varyantlarından nesne adında terimi geçen ilki, terimsiz varyant ise
+# varsayılan olarak kullanılır. Bir alan varyantta yoksa kategorideki değeri geçerlidir.
+#
+#   terms            : Nesne adında aranan terimler
+#   query            : Arama sorgusu kalıbı ({name}: nesne adı)
+#   keyword_prefixes : (anahtar kelimede aranan terim, sorgunun başına eklenecek metin)
+#   header / intro   : İçeriğin başlığı ({title}: baş harfleri büyük nesne adı) ve giriş cümlesi
+#   snippet_suffix   : Kısa özetlerin sonuna eklenecek açıklama
+#   tips_title / tips: İçeriğin sonuna eklenecek öneriler
+#   domain_boost     : (alan adında aranan terimler, puan)
+#   text_boosts      : (nesne adında aranan terimler, sonuçta aranan terimler, özette de ara, puan)
+SEARCH_CATEGORIES = [
+    {
+        "terms": ("çanta",),
+        "header": "## {title} Hakkında Bilgiler",
+        "tips_title": "\n### Öneriler",
+        "domain_boost": (("trendyol", "hepsiburada", "n11", "gittigidiyor"), 10),
+        "text_boosts": [
+            (("el çanta",), ("kadın",), False, 5),
+            (("sırt",), ("okul", "seyahat", "ergonomi"), False, 5),
+        ],
+        "variants": [
+            {
+                "terms": ("sırt",),
+                "query": "{name} seyahat okul ergonomik çantalar",
+                "keyword_prefixes": (("kadın", "kadın "), ("erkek", "erkek ")),
+                "intro": "Ergonomik okul ve seyahat çantalarıyla ilgili sonuçlar aşağıdadır:",
+                "snippet_suffix": " Bu sayfada ergonomik {name} modelleri ve fiyatları hakkında bilgi bulabilirsiniz.",
+                "tips": [
+                    "- Ergonomik sırt çantaları için omuz askılarının kalınlığına ve sırt desteğine dikkat edin.",
+                    "- Okul çantalarında laptop bölmesinin koruyucu olması önemlidir.",
+                ],
+            },
+            {
+                # 1. senaryoya uyumlu - kadın el çantaları
+                "terms": ("el",),
+                "query": "yeni sezon kadın {name} modelleri",
+                "intro": "Yeni sezon kadın el ve sırt çantalarına ait ürünler:",
+                "snippet_suffix": " En yeni sezon kadın {name} modellerini inceleyebilirsiniz.",
+                "tips": [
+                    "- Yeni sezon kadın el çantalarında pastel tonlar ve minimal desenler öne çıkıyor.",
+                    "- Çapraz askılı modeller günlük kullanım için daha pratiktir.",
+                ],
+            },
+            {
+                "query": "{name} modelleri fiyatları",
+            },
+        ],
+    },
+    {
+        "terms": ("sandviç",),
+        "tips_title": "\n### Püf Noktaları",
+        "snippet_suffix": " Burada lezzetli {name} tarifleri ve pişirme önerileri yer almaktadır.",
+        "domain_boost": (("yemek", "tarif", "lezzet", "nefis"), 10),
+        "text_boosts": [
+            (("sosisli",), ("sos", "ketçap", "sosis"), True, 8),
+        ],
+        "variants": [
+            {
+                # 2. senaryoya uyumlu - sosisli sandviç tarifleri
+                "terms": ("sosisli",),
+                "query": "etli ve soslu {name} tarifleri",
+                "header": "## Etli ve Soslu {title} Tarifleri",
+                "intro": "Aşağıdaki kaynaklarda sosisli sandviç tarifleri bulabilirsiniz:",
+                "tips": [
+                    "- Sosisleri önceden hafifçe ızgarada pişirmek lezzeti artırır.",
+                    "- Ev yapımı soslar ile servis edildiğinde daha lezzetli olur.",
+                ],
+            },
+            {
+                # 2. senaryoya uyumlu - lezzetli aperatif sandviç tarifleri
+                "query": "lezzetli aperatif {name} tarifleri",
+                "header": "## Lezzetli Aperatif {title} Tarifleri",
+                "intro": "Aşağıdaki kaynaklarda lezzetli sandviç tariflerine ulaşabilirsiniz:",
+                "tips": [
+                    "- Sandviç ekmeğini hafifçe kızartmak, yumuşamasını engeller.",
+                    "- Malzemeleri incecik dilimlemek, lezzetlerin daha iyi karışmasını sağlar.",
+                ],
+            },
+        ],
+    },
+    {"terms": ("yemek", "pizza", "hamburger", "makarna"), "query": "ev yapımı kolay {name} tarifi"},
+    {"terms": ("telefon", "bilgisayar", "tablet", "laptop"), "query": "en iyi {name} modelleri inceleme"},
+    {"terms": ("masa", "sandalye", "koltuk"), "query": "modern {name} tasarımları fiyatları"},
+    {"terms": ("araba", "bisiklet", "motosiklet"), "query": "{name} özellikleri fiyat karşılaştırma"},
+]
+
+# Önceki arama benzer bir nesne içinse kullanılacak sorgular:
+# (iki nesne adında da geçmesi gereken terimlerden biri, sorgu kalıbı)
+CONTINUATION_RULES = [
+    (("çanta",), "yeni sezon {name} modelleri"),
+    (("sandviç", "yemek"), "farklı {name} tarifleri"),
+]
+
+KEYWORD_TITLE_SCORE = 3    # Anahtar kelime başlıkta geçerse
+KEYWORD_SNIPPET_SCORE = 1  # Anahtar kelime özette geçerse
+
+
+class CategoryMatch:
+    """Bir nesne adına uyan kategori, varyant ve nesne adında bulunan terimler."""
+
+    def __init__(self, category, variant, found):
+        self.category = category
+        self.variant = variant or {}
+        self.found = found
+
+    def get(self, key, default=None):
+        """Alanı önce varyanttan, yoksa kategoriden okur."""
+        if key in self.variant:
+            return self.variant[key]
+        if self.category is not None:
+            return self.category.get(key, default)
+        return default
+
+
+class SearchRules:
+    """Kural tablolarını bir kez derleyip nesne, alan adı ve metin eşleştiricilerine dönüştürür."""
+
+    def __init__(self, categories=SEARCH_CATEGORIES, continuation_rules=CONTINUATION_RULES):
+        self.categories = categories
+        self.continuation_rules = continuation_rules
+
+        object_terms, domain_terms, text_terms = [], [], []
+        for category in categories:
+            object_terms.extend(category.get("terms", ()))
+            for variant in category.get("variants", ()):
+                object_terms.extend(variant.get("terms", ()))
+            if "domain_boost" in category:
+                domain_terms.extend(category["domain_boost"][0])
+            for boost_object_terms, boost_terms, _, _ in category.get("text_boosts", ()):
+                object_terms.extend(boost_object_terms)
+                text_terms.extend(boost_terms)
+        for terms, _ in continuation_rules:
+            object_terms.extend(terms)
+
+        self.object_matcher = PatternMatcher(object_terms)
+        self.domain_matcher = PatternMatcher(domain_terms)
+        self.text_terms = list(dict.fromkeys(text_terms))
+        self._text_matchers = LRUCache(maxsize=64)
+
+    def match(self, object_name):
+        """Nesne adına uyan kategoriyi bulur (kategori yoksa category None olur)."""
+        found = self.object_matcher.found(object_name.lower().strip())
+        for category in self.categories:
+            if any(term in found for term in category["terms"]):
+                variant = None
+                for candidate in category.get("variants", ()):
+                    terms = candidate.get("terms", ())
+                    if not terms or any(term in found for term in terms):
+                        variant = candidate
+                        break
+                return CategoryMatch(category, variant, found)
+        return CategoryMatch(None, None, found)
+
+    def build_query(self, object_name, keywords, last_object=None):
+        """Kategoriye ve önceki aramaya göre bağlamsal sorgu oluşturur."""
+        match = self.match(object_name)
+        template = match.get("query")
+
+        if template:
+            query = template.format(name=object_name)
+            for term, prefix in match.get("keyword_prefixes", ()):
+                if any(term in kw for kw in keywords):
+                    query = prefix + query
+                    break
+        else:
+            # Varsayılan sorgu
+            query = f"{object_name} {' '.join(keywords[:3])}"
+
+        # Önceki arama benzer bir nesne ise sorguyu sürdür
+        if last_object:
+            object_lower = object_name.lower().strip()
+            last_lower = last_object.lower()
+            if last_lower in object_lower or object_lower in last_lower:
+                last_found = self.object_matcher.found(last_lower)
+                for terms, continuation in self.continuation_rules:
+                    if any(term in match.found and term in last_found for term in terms):
+                        query = continuation.format(name=object_name)
+                        break
+        return query
+
+    def _text_matcher(self, keywords):
+        """Sabit metin terimleri ile anahtar kelimeleri tek otomatta birleştirir."""
+        key = tuple(keywords)
+        matcher = self._text_matchers.get(key)
+        if matcher is None:
+            matcher = PatternMatcher(self.text_terms + list(keywords))
+            self._text_matchers.put(key, matcher)
+        return matcher
+
+    def make_scorer(self, object_name, keywords):
+        """
+        Bir aramanın sonuçlarını puanlayan fonksiyon döndürür.
+
+        Kategori ve anahtar kelime eşleştiricileri bir kez hazırlanır; her sonuç
+        için alan adı, başlık ve özet yalnızca birer kez taranır.
+        """
+        match = self.match(object_name)
+        category = match.category or {}
+        keyword_counts = Counter(keywords)
+        text_matcher = self._text_matcher(keyword_counts)
+
+        domain_terms, domain_score = category.get("domain_boost", ((), 0))
+        text_boosts = [(terms, use_snippet, score)
+                       for object_terms, terms, use_snippet, score in category.get("text_boosts", ())
+                       if any(term in match.found for term in object_terms)]
+
+        def score(domain, title_lower, snippet_lower):
+            title_found = text_matcher.found(title_lower)
+            snippet_found = text_matcher.found(snippet_lower)
+
+            total = 0
+            if domain_terms:
+                domain_found = self.domain_matcher.found(domain)
+                if any(term in domain_found for term in domain_terms):
+                    total += domain_score
+            for terms, use_snippet, boost in text_boosts:
+                if any(term in title_found or (use_snippet and term in snippet_found) for term in terms):
+                    total += boost
+
+            # Genel konuyla ilgililik puanı
+            for keyword, count in keyword_counts.items():
+                if keyword in title_found:
+                    total += KEYWORD_TITLE_SCORE * count
+                if keyword in snippet_found:
+                    total += KEYWORD_SNIPPET_SCORE * count
+            return total
+
+        return score
+
+
+DEFAULT_SEARCH_RULES = SearchRules()
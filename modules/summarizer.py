@@ -0,0 +1,64 @@
+# modules/summarizer.py
+# İçerik uzunluğuyla doğrusal çalışan çıkarımsal özetleyici
+
+import heapq
+import re
+
+from modules.pattern_matcher import PatternMatcher
+
+# Cümle sınırı olarak '.' kullanılır (özet yine '. ' ile birleştirilir)
+_SENTENCE_RE = re.compile(r'[^.]+')
+_WORD_RE = re.compile(r'\S+')
+
+OBJECT_WEIGHT = 0.5   # Cümlede nesne adı geçerse
+KEYWORD_WEIGHT = 0.3  # Cümlede geçen her farklı anahtar kelime için
+MIN_SENTENCE_CHARS = 10
+
+
+def summarize(content, object_name=None, keywords=(), max_sentences=10, max_length=1000):
+    """
+    İçerikten en yüksek puanlı cümleleri orijinal sıralarıyla seçerek özet çıkarır.
+
+    Puan: kelime sayısı / 10, nesne adı geçiyorsa +0.5, geçen her anahtar kelime
+    için +0.3. Anahtar kelimeler tek bir Aho-Corasick otomatında toplanır, böylece
+    her cümle bir kez taranır ve toplam maliyet içerik uzunluğuyla doğrusal kalır.
+
+    Args:
+        content: Özetlenecek metin
+        object_name: Aranan nesnenin adı (varsa)
+        keywords: Aramanın anahtar kelimeleri
+        max_sentences: Özete alınacak en fazla cümle sayısı
+        max_length: Özetin en fazla karakter uzunluğu
+
+    Returns:
+        Özet metni
+    """
+    weights = {}
+    for keyword in keywords:
+        if keyword:
+            weights[keyword.lower()] = weights.get(keyword.lower(), 0) + KEYWORD_WEIGHT
+    if object_name:
+        weights[object_name.lower()] = weights.get(object_name.lower(), 0) + OBJECT_WEIGHT
+    matcher = PatternMatcher(weights) if weights else None
+
+    scored = []  # (puan, cümle sırası, cümle)
+    for index, match in enumerate(_SENTENCE_RE.finditer(content)):
+        sentence = match.group()
+        stripped = sentence.strip()
+        if len(stripped) < MIN_SENTENCE_CHARS:
+            continue
+
+        score = sum(1 for _ in _WORD_RE.finditer(stripped)) / 10
+        if matcher is not None:
+            score += sum(weights[pattern] for pattern in matcher.found(sentence.lower()))
+        # Kayan nokta toplama sırası eşit puanlı cümlelerin sırasını bozmasın
+        scored.append((round(score, 6), index, sentence))
+
+    # Eşit puanlarda önce gelen cümle tercih edilir; seçilenler orijinal sıraya dizilir
+    best = heapq.nlargest(max_sentences, scored, key=lambda item: (item[0], -item[1]))
+    best.sort(key=lambda item: item[1])
+
+    summary = '. '.join(sentence for _, _, sentence in best)
+    if len(summary) > max_length:
+        summary = summary[:max_length] + "..."
+    return summary
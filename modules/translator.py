@@ -1,17 +1,18 @@
 # modules/translator.py
-import requests
 from deep_translator import GoogleTranslator
 import logging
+import threading
+
+from modules import http_client
+from modules import metrics
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class Translator:
-    def __init__(self):
-        """İngilizce-Türkçe çeviri sınıfı."""
-        # YOLOv8'in tanıyabildiği yaygın nesnelerin Türkçe karşılıkları
-        self.common_objects = {
-            # İnsanlar ve Kişiler
+# YOLOv8'in tanıyabildiği yaygın nesnelerin Türkçe karşılıkları
+# (modül yüklenirken bir kez oluşturulur, tüm Translator örnekleri paylaşır)
+COMMON_OBJECTS = {
+    # İnsanlar ve Kişiler
     "person": "insan",
     "people": "insanlar",
     "man": "adam",
@@ -41,7 +42,6 @@ class Translator:
     "van": "minibüs",
     "trailer": "römork",
     "tractor": "traktör",
-    "bicycle": "bisiklet",
     
     # Mobilya ve Ev Eşyaları
     "chair": "sandalye",
@@ -112,7 +112,6 @@ class Translator:
     "turtle": "kaplumbağa",
     "hamster": "hamster",
     "rabbit": "tavşan",
-    "mouse": "fare",
     "frog": "kurbağa",
     "snake": "yılan",
     "monkey": "maymun",
@@ -190,7 +189,6 @@ class Translator:
     "kite": "uçurtma",
     "baseball bat": "beyzbol sopası",
     "baseball glove": "beyzbol eldiveni",
-    "skateboard": "kaykay",
     "surfboard": "sörf tahtası",
     "tennis racket": "tenis raketi",
     "basketball": "basketbol topu",
@@ -201,7 +199,6 @@ class Translator:
     "golf ball": "golf topu",
     "ski": "kayak",
     "snowboard": "snowboard",
-    "bicycle": "bisiklet",
     "gym equipment": "spor aleti",
     "dumbbell": "dambıl",
     "treadmill": "koşu bandı",
@@ -249,14 +246,12 @@ class Translator:
     "ruler": "cetvel",
     "eraser": "silgi",
     "calculator": "hesap makinesi",
-    "backpack": "sırt çantası",
     "briefcase": "evrak çantası",
     "stapler": "zımba",
     "file": "dosya",
     "folder": "klasör",
     "whiteboard": "beyaz tahta",
     "blackboard": "kara tahta",
-    "projector": "projektör",
     "map": "harita",
     "globe": "küre",
     "calendar": "takvim",
@@ -316,7 +311,6 @@ class Translator:
     "coin": "madeni para",
     "key": "anahtar",
     "padlock": "asma kilit",
-    "scissors": "makas",
     "toothbrush": "diş fırçası",
     "hair drier": "saç kurutma makinesi",
     "broom": "süpürge",
@@ -332,35 +326,141 @@ class Translator:
     "flag": "bayrak",
     "trash can": "çöp kutusu",
     "recycle bin": "geri dönüşüm kutusu"
-        }
+}
+
+class LabelTable:
+    """Model sınıf id'si ile indekslenen Türkçe etiket tablosu."""
+
+    def __init__(self, names):
+        # YOLO `names` alanı dict ({0: 'person', ...}) veya liste olabilir
+        if isinstance(names, dict):
+            items = sorted((int(k), v) for k, v in names.items())
+        else:
+            items = list(enumerate(names))
+        size = items[-1][0] + 1 if items else 0
+
+        self.names = [None] * size
+        self.labels = [None] * size  # Çözülemeyen sınıflar için None
+        self.unresolved = []
+        self.ready = threading.Event()
+
+        for cls_id, name in items:
+            self.names[cls_id] = name
+            translated = COMMON_OBJECTS.get(name.lower())
+            if translated:
+                self.labels[cls_id] = translated
+            else:
+                self.unresolved.append(cls_id)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, cls_id):
+        return self.labels[cls_id]
+
+    def get(self, cls_id):
+        """Sınıfın Türkçe etiketini döndürür (henüz çevrilmediyse None)."""
+        if 0 <= cls_id < len(self.labels):
+            return self.labels[cls_id]
+        return None
+
+
+class Translator:
+    def __init__(self, use_google=True):
+        """
+        İngilizce-Türkçe çeviri sınıfı.
+
+        Args:
+            use_google: False ise Google Translate atlanıp doğrudan LibreTranslate kullanılır.
+                GoogleTranslator (deep_translator) kendi HTTP oturumunu kullandığından
+                http_client üzerinden kaydedilip tekrar oynatılamaz; yük testlerinde False verilir.
+        """
+        self.common_objects = COMMON_OBJECTS
+        self.use_google = use_google
+        # Arka planda çevrilen sınıf adları (sözlükte olmayanlar)
+        self._resolved = {}
+
+    def build_label_table(self, names, background=True):
+        """
+        Modelin sınıf adlarından id ile indekslenen Türkçe etiket tablosu oluşturur.
+
+        Sözlükte bulunan sınıflar hemen doldurulur; bulunmayanlar arka plandaki
+        bir iş parçacığında çevrilir ve tamamlandığında tabloya yazılır.
+
+        Args:
+            names: YOLO modelinin `names` alanı (sınıf id -> İngilizce ad)
+            background: Çözülemeyen sınıfları arka planda çevir
+
+        Returns:
+            LabelTable nesnesi
+        """
+        table = LabelTable(names)
+
+        if not table.unresolved:
+            table.ready.set()
+            return table
+
+        logger.info(f"Sözlükte bulunmayan {len(table.unresolved)} sınıf çevrilecek: "
+                    f"{[table.names[i] for i in table.unresolved]}")
+
+        if background:
+            threading.Thread(target=self._resolve_labels, args=(table,), daemon=True).start()
+        else:
+            self._resolve_labels(table)
+        return table
+
+    def _resolve_labels(self, table):
+        """Etiket tablosundaki çözülemeyen sınıfları çevirir."""
+        try:
+            for cls_id in table.unresolved:
+                name = table.names[cls_id]
+                translated = self.translate(name)
+                # Çeviri başarısızsa (orijinal metin döndüyse) tabloya yazma
+                if not translated or translated.lower() == name.lower():
+                    continue
+                self._resolved[name.lower()] = translated
+                table.labels[cls_id] = translated
+        except Exception as e:
+            logger.error(f"Etiket tablosu çevrilirken hata: {e}")
+        finally:
+            table.ready.set()
+
+    @metrics.timed("stage_seconds", stage="translate")
     def translate(self, text, from_lang="en", to_lang="tr"):
         """Metni İngilizce'den Türkçe'ye çevirir."""
         try:
             # Önce sözlükte ara (daha hızlı)
-            if text.lower() in self.common_objects:
-                return self.common_objects[text.lower()]
+            text_lower = text.lower()
+            if text_lower in self.common_objects:
+                metrics.count("cache_requests_total", cache="translation", result="hit")
+                return self.common_objects[text_lower]
+            if text_lower in self._resolved:
+                metrics.count("cache_requests_total", cache="translation", result="hit")
+                return self._resolved[text_lower]
+            metrics.count("cache_requests_total", cache="translation", result="miss")
             
             # Sözlükte yoksa Google Translate kullan
-            try:
-                translated = GoogleTranslator(source=from_lang, target=to_lang).translate(text)
-                return translated
-            except Exception as e:
-                logger.warning(f"Google çeviri hatası: {e}, alternatif metot deneniyor")
-                
-                # Alternatif olarak başka bir çeviri metodu kullanın
-                # Örneğin: LibreTranslate (ücretsiz, API key gerektirmez)
+            if self.use_google:
                 try:
-                    url = "https://libretranslate.de/translate"
-                    params = {
-                        "q": text,
-                        "source": from_lang,
-                        "target": to_lang
-                    }
-                    response = requests.post(url, data=params, timeout=5)
-                    if response.status_code == 200:
-                        return response.json()["translatedText"]
-                except Exception as e2:
-                    logger.error(f"Alternatif çeviri hatası: {e2}")
+                    translated = GoogleTranslator(source=from_lang, target=to_lang).translate(text)
+                    return translated
+                except Exception as e:
+                    logger.warning(f"Google çeviri hatası: {e}, alternatif metot deneniyor")
+
+            # Alternatif olarak başka bir çeviri metodu kullanın
+            # Örneğin: LibreTranslate (ücretsiz, API key gerektirmez)
+            try:
+                url = "https://libretranslate.de/translate"
+                params = {
+                    "q": text,
+                    "source": from_lang,
+                    "target": to_lang
+                }
+                response = http_client.post(url, data=params, timeout=5)
+                if response.status_code == 200:
+                    return response.json()["translatedText"]
+            except Exception as e2:
+                logger.error(f"Alternatif çeviri hatası: {e2}")
             
             # Hiçbir çeviri çalışmazsa orijinal metni döndür
             return text
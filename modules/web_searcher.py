@@ -2,46 +2,147 @@
 # Ayşenur Arslan - 16.04.2025
 # Modified for free API usage
 
-import requests
 import json
 import os
-from bs4 import BeautifulSoup
+import threading
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib.parse import urlparse, quote_plus
 
+import config
+from modules import http_client
+from modules import metrics
+from modules.content_fetcher import ContentFetcher
+from modules.html_parser import parse_ddg_results
+from modules.rate_limiter import ProviderLimiter, QuotaTracker, SingleFlight
+from modules.search_cache import SearchCache
+from modules.search_rules import DEFAULT_SEARCH_RULES
+from modules.summarizer import summarize
+
 # Loglama ayarları
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Serper 429 yanıtında Retry-After yoksa beklenecek süre (saniye)
+RATE_LIMIT_BACKOFF = 5.0
+
+# Serper'in kredi bittiğinde döndürdüğü hata mesajı (küçük harfle, tam eşleşme)
+SERPER_NO_CREDITS_MESSAGE = "not enough credits"
+
+
+def _credits_exhausted(response):
+    """
+    429 yanıtının geçici hız sınırı değil, kredi/kota bitişi olup olmadığını döndürür.
+
+    Yalnızca açık bir işaret kabul edilir: değeri 0 olan kredi/kota başlığı ya da
+    Serper'in kredi bitti mesajının kendisi. "per-second quota exceeded" gibi hız
+    sınırı mesajları kotayı ay sonuna kadar kapatmamalıdır.
+    """
+    for name, value in response.headers.items():
+        name = name.lower()
+        if ("credit" in name or "quota" in name) and str(value).strip() == "0":
+            return True
+    try:
+        message = json.loads(response.text or "{}").get("message", "")
+    except Exception:
+        return False
+    return isinstance(message, str) and message.strip().rstrip(".").lower() == SERPER_NO_CREDITS_MESSAGE
+
+
+def _retry_after(response):
+    """Retry-After başlığındaki bekleme süresi (saniye cinsinden değilse varsayılan)."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", RATE_LIMIT_BACKOFF)))
+    except (TypeError, ValueError):
+        return RATE_LIMIT_BACKOFF
+
+
 class WebSearcher:
-    def __init__(self, serper_api_key=None):
-        """Web arama sınıfı."""
+    def __init__(self, serper_api_key=None, search_deadline=8.0, max_workers=8, cache=None, use_cache=True,
+                 full_pages=0, rules=None, serper_limiter=None, knowledge_store=None):
+        """
+        Web arama sınıfı.
+
+        Args:
+            serper_api_key: Serper.dev API anahtarı
+            search_deadline: Arama sağlayıcılarından sonuç beklenecek en uzun süre (saniye)
+            max_workers: Eşzamanlı ağ istekleri için iş parçacığı sayısı
+            cache: Arama sonuçları için SearchCache (varsayılan: data/search_cache.db)
+            use_cache: False ise sonuçlar önbelleğe alınmaz
+            full_pages: extract_content'te tam metni indirilecek ilk sonuç sayısı (0: kapalı)
+            rules: Sorgu, puanlama ve içerik kuralları (varsayılan: DEFAULT_SEARCH_RULES)
+            serper_limiter: Serper için ProviderLimiter (varsayılan: data/serper_quota.json kotası)
+            knowledge_store: Önceden çekilmiş sınıf bilgileri (KnowledgeStore); varsa ağa çıkılmadan kullanılır
+        """
         # Serper.dev ücretsiz bir kota sunuyor (2000 arama/ay)
         self.serper_api_key = serper_api_key or os.environ.get('SERPER_API_KEY', 'a87099e892d00b0fba5cde4bff813e6c7838a3b8')
         self.search_history = []  # Önceki aramalar için geçmiş
+        self.search_deadline = search_deadline
+        self.rules = rules or DEFAULT_SEARCH_RULES
+
+        # Sağlayıcılar ve Wikipedia aynı havuzda paralel çalışır
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-search")
+        self._wiki_futures = {}  # (nesne adı, dil) -> Wikipedia özeti Future nesnesi
+        self._wiki_lock = threading.Lock()  # Eşzamanlı istekler aynı sözlüğü kullanır
+
+        # Aynı anda yapılan özdeş sorgular tek bir dış isteğe indirgenir
+        self._flights = SingleFlight()
+
+        # Serper isteği hız ve aylık kota sınırından geçer; izin yoksa DuckDuckGo kullanılır
+        self.serper_limiter = serper_limiter or ProviderLimiter(
+            "Serper",
+            quota=QuotaTracker(monthly_limit=config.SERPER_MONTHLY_QUOTA,
+                               reserve=config.SERPER_QUOTA_RESERVE))
 
-    def search_web(self, object_name, keywords, num_results=5, lang='tr'):
-        """Web'de arama yapar ve sonuçları döndürür."""
+        # Sağlayıcı sonuçları kalıcı TTL önbelleğinde tutulur
+        self.cache = (cache or SearchCache()) if use_cache else None
+
+        # İlk sonuçların tam sayfa metni paralel indirilip özetleyiciye verilir
+        self.full_pages = full_pages
+        self.content_fetcher = ContentFetcher() if full_pages else None
+
+        # prefetch_knowledge.py ile hazırlanan yerel bilgi deposu
+        self.knowledge_store = knowledge_store
+
+    @metrics.timed("stage_seconds", stage="search")
+    def search_web(self, object_name, keywords, num_results=5, lang='tr', use_history=True):
+        """
+        Web'de arama yapar ve sonuçları döndürür.
+
+        use_history=False ise sorgu önceki aramaya göre sürdürülmez ve arama
+        geçmişe eklenmez (eşzamanlı, birbirinden bağımsız istekler için).
+        """
         try:
             # Sorgu oluşturmadan önce önceki arama ile bağlam kuralım
-            contextual_query = self._build_contextual_query(object_name, keywords)
-        
-            # Önce Serper API ile deneyin (daha iyi sonuçlar verir)
-            results = self._search_serper(contextual_query, num_results, lang)
+            last_object = self.search_history[-1]['object'] if use_history and self.search_history else None
+            contextual_query = self._build_contextual_query(object_name, keywords, last_object)
+
+            # Nesnenin bu dildeki kaydı yerel bilgi deposunda varsa ağa çıkılmaz
+            # (kayıtlar sorguyla değil nesne adı ve dille eşleşir; sorgu anahtar
+            # kelimelerin sırasına göre süreçten sürece değişebilir)
+            entry = self._knowledge(object_name, lang)
+            if entry is not None and entry['results']:
+                logger.info(f"Sonuçlar yerel bilgi deposundan alındı: {object_name}")
+                results = [dict(result) for result in entry['results'][:num_results]]
+            else:
+                # Wikipedia özeti arama sürerken paralel olarak çekilir (extract_content kullanır)
+                if entry is None or not entry.get('wikipedia'):
+                    self._prefetch_wikipedia(object_name, lang)
 
-            # Eğer Serper sonuç vermezse ya da hata olursa DuckDuckGo'yu dene
-            if not results:
-                 results = self._search_duckduckgo(contextual_query, num_results, lang)
+                # Serper ve DuckDuckGo aynı anda sorgulanır, ilk uygun sonuç kullanılır
+                results = self._search_concurrently(contextual_query, num_results, lang)
 
             # Arama geçmişine ekle
-            self.search_history.append({
-                'object': object_name,
-                'keywords': keywords,
-                'query': contextual_query
-            })
+            if use_history:
+                self.search_history.append({
+                    'object': object_name,
+                    'keywords': keywords,
+                    'query': contextual_query
+                })
 
-            if len(self.search_history) > 5:
-               self.search_history.pop(0)
+                if len(self.search_history) > 5:
+                   self.search_history.pop(0)
 
             # Sonuçları geliştir - özel filtreler uygula
             enhanced_results = self._enhance_search_results(object_name, keywords, results)
@@ -52,73 +153,118 @@ class WebSearcher:
             logger.error(f"Web araması sırasında hata: {e}")
             return self._search_duckduckgo(contextual_query, num_results, lang)
     
-    def _build_contextual_query(self, object_name, keywords):
-        """Bağlamsal arama sorgusu oluşturur."""
+    def fetch_knowledge(self, object_name, keywords, num_results=5, lang='tr'):
+        """
+        Bilgi deposu için nesnenin bağlamdan bağımsız sorgusunu, arama sonuçlarını
+        ve Wikipedia özetini çeker (arama geçmişini değiştirmez).
+
+        Returns:
+            {'query', 'results', 'wikipedia'} sözlüğü
+        """
+        query = self.rules.build_query(object_name, keywords)
+        self._prefetch_wikipedia(object_name, lang)
+        results = self._search_concurrently(query, num_results, lang)
+        return {
+            'query': query,
+            'results': results,
+            'wikipedia': self._get_wikipedia_summary(object_name, lang),
+        }
+
+    def _knowledge(self, object_name, lang='tr'):
+        """Nesnenin yerel bilgi deposundaki güncel kaydını döndürür (yoksa None)."""
+        if self.knowledge_store is None or not object_name:
+            return None
+        entry = self.knowledge_store.get(object_name, lang)
+        metrics.count("cache_requests_total", cache="knowledge", result="miss" if entry is None else "hit")
+        return entry
+
+    def _search_concurrently(self, query, num_results=5, lang='tr'):
+        """Arama sağlayıcılarını paralel başlatır ve süre içinde gelen ilk dolu sonucu döndürür."""
+        providers = {
+            self._executor.submit(self._cached, "serper", self._search_serper_limited, query, num_results, lang): "Serper",
+            self._executor.submit(self._cached, "duckduckgo", self._search_duckduckgo, query, num_results, lang): "DuckDuckGo",
+        }
+        pending = set(providers)
+        deadline = time.monotonic() + self.search_deadline
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.error(f"{providers[future]} araması sırasında hata: {e}")
+                    continue
+                if results:
+                    logger.info(f"{providers[future]} sonuçları kullanıldı")
+                    for other in pending:
+                        other.cancel()
+                    return results
+
+        logger.warning(f"Arama sağlayıcıları {self.search_deadline} saniye içinde sonuç döndürmedi")
+        return []
+
+    def _prefetch_wikipedia(self, object_name, lang='tr'):
+        """Wikipedia özetini arka planda çekmeye başlar."""
+        key = (object_name, lang)
+        with self._wiki_lock:
+            if key not in self._wiki_futures:
+                # Kullanılmayan eski istekler birikmesin
+                while len(self._wiki_futures) >= 16:
+                    self._wiki_futures.pop(next(iter(self._wiki_futures)))
+                self._wiki_futures[key] = self._executor.submit(self._cached_wikipedia, object_name, lang)
+
+    def _get_wikipedia_summary(self, object_name, lang='tr'):
+        """Önceden başlatılmış Wikipedia isteğinin sonucunu bekler, yoksa doğrudan çeker."""
+        with self._wiki_lock:
+            future = self._wiki_futures.pop((object_name, lang), None)
+        if future is None:
+            return self._cached_wikipedia(object_name, lang)
         try:
-            # Temel sorgu
-            object_lower = object_name.lower().strip()
-        
-            # Özel kategoriler için sorgu geliştirme
-            if "çanta" in object_lower:
-                if "sırt" in object_lower:
-                    query = f"{object_name} seyahat okul ergonomik çantalar"
-                    # Daha spesifik sorgu için anahtar kelimeleri ekle
-                    if any("kadın" in kw for kw in keywords):
-                        query = f"kadın {query}"
-                    elif any("erkek" in kw for kw in keywords):
-                        query = f"erkek {query}"
-                elif "el" in object_lower:
-                     # 1. senaryoya uyumlu - kadın el çantaları 
-                     query = f"yeni sezon kadın {object_name} modelleri"
-                else:
-                     query = f"{object_name} modelleri fiyatları"
-        
-            elif "sandviç" in object_lower:
-                if "sosisli" in object_lower:
-                    # 2. senaryoya uyumlu - sosisli sandviç tarifleri
-                    query = f"etli ve soslu {object_name} tarifleri"
-                else:
-                    # 2. senaryoya uyumlu - lezzetli aperatif sandviç tarifleri
-                    query = f"lezzetli aperatif {object_name} tarifleri"
-        
-            elif any(food in object_lower for food in ["yemek", "pizza", "hamburger", "makarna"]):
-                query = f"ev yapımı kolay {object_name} tarifi"
-            
-            elif any(tech in object_lower for tech in ["telefon", "bilgisayar", "tablet", "laptop"]):
-                query = f"en iyi {object_name} modelleri inceleme"
-            
-            elif any(furniture in object_lower for furniture in ["masa", "sandalye", "koltuk"]):
-                query = f"modern {object_name} tasarımları fiyatları"
-            
-            elif any(vehicle in object_lower for vehicle in ["araba", "bisiklet", "motosiklet"]):
-                query = f"{object_name} özellikleri fiyat karşılaştırma"
-            
-            else:
-                # Varsayılan sorgu
-                query = f"{object_name} {' '.join(keywords[:3])}"
-        
-            # Bağlam duyarlı aramayı önceki aramalarla zenginleştir
-            if self.search_history:
-                last_object = self.search_history[-1]['object']
-            
-                # Önceki arama benzer bir nesne ise
-                if last_object.lower() in object_lower or object_lower in last_object.lower():
-                   # Benzer ürünler/nesneler için ilişkili sorgu 
-                   if "çanta" in last_object.lower() and "çanta" in object_lower:
-                       query = f"yeni sezon {object_name} modelleri"
-                    
-                   # Yemek kategorisi için süreklilik
-                   elif ("sandviç" in last_object.lower() and "sandviç" in object_lower) or \
-                         ("yemek" in last_object.lower() and "yemek" in object_lower):
-                         query = f"farklı {object_name} tarifleri"
-        
+            return future.result(timeout=self.search_deadline)
+        except Exception as e:
+            logger.warning(f"Wikipedia içeriği alınamadı: {e}")
+            return None
+
+    def _cached(self, provider, search, query, num_results=5, lang='tr'):
+        """Sağlayıcı aramasını önbellek üzerinden yapar; eşzamanlı özdeş aramalar birleştirilir."""
+        def fetch():
+            if self.cache is None:
+                return search(query, num_results, lang)
+            return self.cache.get_or_fetch(provider, query, lang, num_results,
+                                           lambda: search(query, num_results, lang),
+                                           executor=self._executor)
+
+        results = self._flights.do(SearchCache.make_key(provider, query, lang, num_results), fetch)
+        # Sonuçlar sonradan düzenlendiği için önbellekteki nesneler kopyalanır
+        return [dict(result) for result in results] if results else results
+
+    def _cached_wikipedia(self, object_name, lang='tr'):
+        """Wikipedia özetini önbellek üzerinden çeker; eşzamanlı özdeş istekler birleştirilir."""
+        def fetch():
+            if self.cache is None:
+                return self._search_wikipedia(object_name, lang)
+            return self.cache.get_or_fetch("wikipedia", object_name, lang, None,
+                                           lambda: self._search_wikipedia(object_name, lang),
+                                           executor=self._executor)
+
+        return self._flights.do(SearchCache.make_key("wikipedia", object_name, lang), fetch)
+
+    def _build_contextual_query(self, object_name, keywords, last_object=None):
+        """Bağlamsal arama sorgusu oluşturur (last_object: varsa önceki aramanın nesnesi)."""
+        try:
+            query = self.rules.build_query(object_name, keywords, last_object)
+
             logger.info(f"Oluşturulan bağlamsal sorgu: {query}")
             return query
-    
+
         except Exception as e:
             logger.error(f"Bağlamsal sorgu oluşturma hatası: {e}")
             return f"{object_name} {' '.join(keywords[:3])}"
-        
+
     def _enhance_search_results(self, object_name, keywords, results):
         """Arama sonuçlarını daha spesifik hale getirir."""
         if not results:
@@ -126,41 +272,16 @@ class WebSearcher:
         
         enhanced_results = []
         object_lower = object_name.lower()
-    
+
+        # Kategori, alan adı ve anahtar kelime eşleştiricileri bir kez hazırlanır
+        score_result = self.rules.make_scorer(object_name, keywords)
+
         # Arama sonuçlarını kategorize et ve önceliklendir
         for result in results:
-           # Sonuç skorunu hesapla
-           score = 0
-           title_lower = result.get('title', '').lower()
-           snippet_lower = result.get('snippet', '').lower()
-        
-           # URL analizi - daha güvenilir ve konuyla ilgili siteleri seç
-           url = result.get('link', '')
-           domain = urlparse(url).netloc
-        
-           # Alışveriş siteleri için puan artır
-           if "çanta" in object_lower:
-               if any(shop in domain for shop in ["trendyol", "hepsiburada", "n11", "gittigidiyor"]):
-                   score += 10
-               if "kadın" in title_lower and "el çanta" in object_lower:
-                   score += 5
-               if "sırt" in object_lower and any(kw in title_lower for kw in ["okul", "seyahat", "ergonomi"]):
-                   score += 5
-                
-           # Yemek siteleri için puan artır
-           elif "sandviç" in object_lower:
-                if any(food in domain for food in ["yemek", "tarif", "lezzet", "nefis"]):
-                   score += 10
-                if "sosisli" in object_lower and any(kw in title_lower or kw in snippet_lower for kw in ["sos", "ketçap", "sosis"]):
-                   score += 8
-                
-           # Genel konuyla ilgililik puanı
-           for keyword in keywords:
-               if keyword in title_lower:
-                   score += 3
-               if keyword in snippet_lower: 
-                   score += 1
-                
+           # Sonuç skorunu hesapla - alan adı, başlık ve özet birer kez taranır
+           domain = urlparse(result.get('link', '')).netloc
+           score = score_result(domain, result.get('title', '').lower(), result.get('snippet', '').lower())
+
            # Başlık çok uzunsa düzelt
            title = result['title']
            if len(title) > 70:
@@ -188,6 +309,13 @@ class WebSearcher:
     
         return enhanced_results
     
+    def _search_serper_limited(self, query, num_results=5, lang='tr'):
+        """Hız ve kota sınırı izin verirse Serper araması yapar, vermezse boş döner."""
+        if not self.serper_limiter.acquire():
+            return []
+        return self._search_serper(query, num_results, lang)
+
+    @metrics.timed("stage_seconds", stage="serper")
     def _search_serper(self, query, num_results=5, lang='tr'):
         """Serper.dev API ile arama yapar. (Ücretsiz kota: 2000 arama/ay)"""
         try:
@@ -205,7 +333,7 @@ class WebSearcher:
                 "hl": lang,  # Arama dili (örneğin: 'tr' için Türkçe)
             }
             
-            response = requests.post(
+            response = http_client.post(
                 "https://google.serper.dev/search", 
                 headers=headers, 
                 json=payload
@@ -228,8 +356,18 @@ class WebSearcher:
             
         except Exception as e:
             logger.error(f"Serper araması sırasında hata: {e}")
+            response = getattr(e, 'response', None)
+            if response is not None and response.status_code == 429:
+                if _credits_exhausted(response):
+                    # Kota bittiyse ay sonuna kadar DuckDuckGo kullanılır
+                    if self.serper_limiter.quota is not None:
+                        self.serper_limiter.quota.mark_exhausted()
+                else:
+                    # Geçici hız sınırı: kota korunur, Serper bir süre sorgulanmaz
+                    self.serper_limiter.backoff(_retry_after(response))
             return []
 
+    @metrics.timed("stage_seconds", stage="duckduckgo")
     def _search_duckduckgo(self, query, num_results=5, lang='tr'):
         """DuckDuckGo ile ücretsiz arama yapar."""
         try:
@@ -243,40 +381,12 @@ class WebSearcher:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(url, headers=headers)
+            response = http_client.get(url, headers=headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            
-            # DuckDuckGo sonuç sayfasındaki sonuçları çıkar
-            for i, result in enumerate(soup.select('.result')):
-                if i >= num_results:
-                    break
-                    
-                title_elem = result.select_one('.result__a')
-                snippet_elem = result.select_one('.result__snippet')
-                link_elem = result.select_one('.result__a')
-                
-                if not title_elem or not link_elem:
-                    continue
-                    
-                # Link href parametresinden gerçek URL'yi çıkar
-                href = link_elem.get('href', '')
-                if 'uddg=' in href:
-                    start_idx = href.find('uddg=') + 5
-                    real_url = href[start_idx:]
-                    # URL decode işlemi
-                    from urllib.parse import unquote
-                    real_url = unquote(real_url)
-                else:
-                    real_url = href
-                
-                results.append({
-                    'title': title_elem.get_text(strip=True) if title_elem else '',
-                    'link': real_url,
-                    'snippet': snippet_elem.get_text(strip=True) if snippet_elem else ''
-                })
+            # Bayt içerik doğrudan en hızlı kurulu ayrıştırıcıya verilir;
+            # istenen sayıda sonuç çıkarılınca ayrıştırma durur
+            results = parse_ddg_results(response.content, num_results)
             
             return results
             
@@ -287,7 +397,7 @@ class WebSearcher:
             try:
                 # Lite API URL (API key gerektirmez)
                 lite_url = f"https://api.duckduckgo.com/?q={encoded_query}&format=json&no_html=1&skip_disambig=1"
-                response = requests.get(lite_url)
+                response = http_client.get(lite_url)
                 data = response.json()
                 
                 results = []
@@ -305,39 +415,56 @@ class WebSearcher:
                 logger.error(f"Alternatif DuckDuckGo araması sırasında hata: {inner_e}")
                 return []
 
-    def extract_content(self, search_results, object_name):
-        """Arama sonuçlarından içerik çıkarır veya Wikipedia'dan çeker."""
+    @metrics.timed("stage_seconds", stage="extract")
+    def extract_content(self, search_results, object_name, keywords=(), lang='tr'):
+        """
+        Arama sonuçlarından içerik çıkarır veya Wikipedia'dan çeker (keywords özette öne çıkarılır).
+
+        lang, search_web'e verilen dille aynı olmalıdır; önceden başlatılan
+        Wikipedia isteği ve bilgi deposu kaydı bu dille eşleştirilir.
+        """
         try:
             if not search_results:
                return "Bu konu hakkında yeterli bilgi bulunamadı."
             
             all_content = []
-            object_lower = object_name.lower() if object_name else ""
-        
-            # Sonuçlara dayalı özel içerik formatı oluştur
-            if "çanta" in object_lower:
-                all_content.append(f"## {object_name.title()} Hakkında Bilgiler")
-            
-                if "sırt" in object_lower:
-                    all_content.append("Ergonomik okul ve seyahat çantalarıyla ilgili sonuçlar aşağıdadır:")
-                elif "el" in object_lower:
-                    all_content.append("Yeni sezon kadın el ve sırt çantalarına ait ürünler:")
+            entry = self._knowledge(object_name, lang)
+
+            # Tam sayfa metinlerini Wikipedia beklenirken paralel indirmeye başla
+            # (sonuçlar yerel bilgi deposundan geldiyse ağa çıkılmaz)
+            page_texts_future = None
+            urls = [result.get('link') for result in search_results[:self.full_pages]]
+            from_store = entry is not None and \
+                set(urls) <= {result.get('link') for result in entry['results']}
+            if self.content_fetcher is not None and not from_store:
+                page_texts_future = self._executor.submit(self.content_fetcher.fetch_all, urls)
         
-            elif "sandviç" in object_lower:
-                if "sosisli" in object_lower:
-                    all_content.append(f"## Etli ve Soslu {object_name.title()} Tarifleri")
-                    all_content.append("Aşağıdaki kaynaklarda sosisli sandviç tarifleri bulabilirsiniz:")
-                else:
-                    all_content.append(f"## Lezzetli Aperatif {object_name.title()} Tarifleri")
-                    all_content.append("Aşağıdaki kaynaklarda lezzetli sandviç tariflerine ulaşabilirsiniz:")
+            # Sonuçlara dayalı özel içerik formatı oluştur (kategori kurallarından)
+            match = self.rules.match(object_name or "")
+            header = match.get("header")
+            if header:
+                all_content.append(header.format(title=object_name.title()))
+                if match.get("intro"):
+                    all_content.append(match.get("intro"))
         
             # Önce Wikipedia'dan içerik denemesi
             if object_name:
-                wiki_summary = self._search_wikipedia(object_name)
+                if entry is not None and entry.get('wikipedia'):
+                    wiki_summary = entry['wikipedia']
+                else:
+                    wiki_summary = self._get_wikipedia_summary(object_name, lang)
                 if wiki_summary:
                      logger.info("Wikipedia özeti bulundu ve kullanıldı.")
                      all_content.append(f"\n{wiki_summary}\n")
 
+            # Süre sınırında indirilebilen sayfaların ana metinleri
+            page_texts = {}
+            if page_texts_future is not None:
+                try:
+                    page_texts = page_texts_future.result()
+                except Exception as e:
+                    logger.warning(f"Sayfa içerikleri alınamadı: {e}")
+
             # Web sonuçlarından içerik çıkar
             result_contents = []
             for i, result in enumerate(search_results[:5]):
@@ -353,16 +480,15 @@ class WebSearcher:
                     if result.get('snippet'):
                         snippet = result['snippet'].strip()
                         # Snippet iyileştirme
-                        if len(snippet) < 100 and object_name:
-                            if "çanta" in object_lower:
-                                if "sırt" in object_lower:
-                                    snippet += f" Bu sayfada ergonomik {object_name} modelleri ve fiyatları hakkında bilgi bulabilirsiniz."
-                                elif "el" in object_lower:
-                                    snippet += f" En yeni sezon kadın {object_name} modellerini inceleyebilirsiniz."
-                            elif "sandviç" in object_lower:
-                                 snippet += f" Burada lezzetli {object_name} tarifleri ve pişirme önerileri yer almaktadır."
+                        snippet_suffix = match.get("snippet_suffix")
+                        if len(snippet) < 100 and object_name and snippet_suffix:
+                            snippet += snippet_suffix.format(name=object_name)
                     
                         content_piece += f"{snippet}\n"
+
+                    # Tam sayfa metni varsa ekle (uzun içerik özetleyiciden geçer)
+                    if page_texts.get(url):
+                        content_piece += f"{page_texts[url]}\n"
                 
                     result_contents.append(content_piece)
             
@@ -372,28 +498,14 @@ class WebSearcher:
             all_content.extend(result_contents)
         
             # Öneriler ekle
-            if object_name:
-                 if "çanta" in object_lower:
-                     all_content.append("\n### Öneriler")
-                     if "sırt" in object_lower:
-                         all_content.append("- Ergonomik sırt çantaları için omuz askılarının kalınlığına ve sırt desteğine dikkat edin.")
-                         all_content.append("- Okul çantalarında laptop bölmesinin koruyucu olması önemlidir.")
-                     elif "el" in object_lower:
-                         all_content.append("- Yeni sezon kadın el çantalarında pastel tonlar ve minimal desenler öne çıkıyor.")
-                         all_content.append("- Çapraz askılı modeller günlük kullanım için daha pratiktir.")
-                 elif "sandviç" in object_lower:
-                     all_content.append("\n### Püf Noktaları")
-                     if "sosisli" in object_lower:
-                        all_content.append("- Sosisleri önceden hafifçe ızgarada pişirmek lezzeti artırır.")
-                        all_content.append("- Ev yapımı soslar ile servis edildiğinde daha lezzetli olur.")
-                     else:
-                        all_content.append("- Sandviç ekmeğini hafifçe kızartmak, yumuşamasını engeller.")
-                        all_content.append("- Malzemeleri incecik dilimlemek, lezzetlerin daha iyi karışmasını sağlar.")
+            if object_name and match.get("tips_title"):
+                all_content.append(match.get("tips_title"))
+                all_content.extend(match.get("tips", []))
         
             content = "\n".join(all_content)
 
             if len(content) > 1500:
-                content = self._summarize_content(content)
+                content = self._summarize_content(content, object_name, keywords)
 
             return content
 
@@ -401,43 +513,16 @@ class WebSearcher:
             logger.error(f"İçerik çıkarma sırasında hata: {e}")
             return "\n\n".join([result.get('snippet', '') for result in search_results if result.get('snippet')])
 
-    def _summarize_content(self, content, max_length=1000):
-        """Metni özetler."""
-        sentences = content.split('.')
-        scored_sentences = []
-
-        for sentence in sentences:
-            if len(sentence.strip()) < 10:
-                continue
-
-            score = len(sentence.strip().split()) / 10
-
-            if self.search_history:
-                last_search = self.search_history[-1]
-                if last_search['object'].lower() in sentence.lower():
-                    score += 0.5
-                for kw in last_search['keywords']:
-                    if kw.lower() in sentence.lower():
-                        score += 0.3
-
-            scored_sentences.append((sentence, score))
-
-        scored_sentences.sort(key=lambda x: x[1], reverse=True)
-        summary_sentences = [s[0] for s in scored_sentences[:min(10, len(scored_sentences))]]
-        summary_sentences.sort(key=lambda s: sentences.index(s) if s in sentences else 999)
-
-        summary = '. '.join(summary_sentences)
-
-        if len(summary) > max_length:
-            summary = summary[:max_length] + "..."
-
-        return summary
+    def _summarize_content(self, content, object_name=None, keywords=(), max_length=1000):
+        """Metni özetler (aranan nesne ve anahtar kelimeleri öne çıkarılır)."""
+        return summarize(content, object_name=object_name, keywords=keywords or (), max_length=max_length)
 
+    @metrics.timed("stage_seconds", stage="wikipedia")
     def _search_wikipedia(self, object_name, lang='tr'):
         """Wikipedia API kullanarak özet içerik çeker."""
         try:
             url = f"https://{lang}.wikipedia.org/api/rest_v1/page/summary/{object_name.replace(' ', '_')}"
-            response = requests.get(url, timeout=5)
+            response = http_client.get(url, timeout=5)
             response.raise_for_status()
 
             data = response.json()
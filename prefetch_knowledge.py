@@ -0,0 +1,47 @@
+#prefetch_knowledge.py
+# Tespit edilebilen tüm sınıflar için yerel bilgi deposunu hazırlar
+#
+# Kullanım:
+#   python prefetch_knowledge.py                 # eksik veya süresi dolmuş kayıtları çeker
+#   python prefetch_knowledge.py --refresh       # tüm kayıtları yeniden çeker
+#   python prefetch_knowledge.py --only cup book # yalnızca verilen sınıfları çeker
+
+import argparse
+import logging
+import sys
+
+from modules.translator import Translator
+from modules.keyword_extractor import KeywordExtractor
+from modules.keyword_expander import EmbeddingExpander
+from modules.web_searcher import WebSearcher
+from modules.knowledge_store import (CUSTOM_DATASET_YAML, DEFAULT_MAX_AGE, KnowledgeStore,
+                                     detectable_classes, prefetch)
+
+# Loglama ayarları
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sınıf bilgi deposunu hazırla / yenile")
+    parser.add_argument("--store", default="data/knowledge_store.json", help="Bilgi deposu dosyası")
+    parser.add_argument("--custom-yaml", default=CUSTOM_DATASET_YAML, help="Özel modelin data.yaml dosyası")
+    parser.add_argument("--max-age-days", type=float, default=DEFAULT_MAX_AGE / 86400,
+                        help="Bu süreden eski kayıtlar yenilenir")
+    parser.add_argument("--refresh", action="store_true", help="Tüm kayıtları yeniden çek")
+    parser.add_argument("--only", nargs="+", help="Yalnızca bu sınıfları çek")
+    args = parser.parse_args()
+
+    store = KnowledgeStore(args.store, max_age=args.max_age_days * 86400)
+    names = args.only or detectable_classes(args.custom_yaml)
+
+    # Anahtar kelimeler main.py ile aynı yapılandırmayla üretilir
+    keyword_extractor = KeywordExtractor(expander=EmbeddingExpander())
+    updated = prefetch(store, names, Translator(), keyword_extractor, WebSearcher(), refresh=args.refresh)
+    print(f"{updated} sınıf güncellendi, depoda {len(store)} kayıt var: {args.store}")
+
+if __name__ == "__main__":
+    main()
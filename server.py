@@ -0,0 +1,229 @@
+#server.py
+# Analiz akışını HTTP üzerinden sunan servis (istek/yanıt kullanımı için)
+#
+# Kullanım:
+#   python server.py --port 8080 --max-batch-size 8 --max-wait-ms 5
+#
+#   curl -X POST localhost:8080/analyze -H 'Content-Type: application/json' \
+#        -d '{"source": "https://example.com/image.jpg"}'
+#   curl -X POST localhost:8080/detect -H 'Content-Type: image/jpeg' --data-binary @foto.jpg
+#   curl localhost:8080/metrics               # JSON
+#   curl localhost:8080/metrics/prometheus    # Prometheus metin biçimi
+
+import argparse
+import functools
+import json
+import logging
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+from PIL import Image
+
+from main import build_components
+from modules import metrics
+from modules.batch_scheduler import MicroBatcher
+from modules.image_processor import get_image_from_source, is_url, preprocess_image
+from modules.pipeline import research
+
+logger = logging.getLogger(__name__)
+
+# Kabul edilen en büyük istek gövdesi (bayt)
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+
+class BadRequest(ValueError):
+    """İstemciden kaynaklanan hata (400 olarak döner)."""
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send_json(200, self.server.metrics())
+        elif self.path == "/metrics/prometheus":
+            body = metrics.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": "bulunamadı"})
+
+    def do_POST(self):
+        routes = {"/detect": self.server.detect, "/analyze": self.server.analyze}
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send_json(404, {"error": "bulunamadı"})
+            return
+        start = time.perf_counter()
+        status = 200
+        try:
+            result = handler(self._read_image())
+            result["seconds"] = round(time.perf_counter() - start, 3)
+            self._send_json(200, result)
+        except BadRequest as e:
+            status = 400
+            self._send_json(400, {"error": str(e)}, {"Connection": "close"} if self.close_connection else None)
+        except queue.Full:
+            status = 503
+            self.server.count("rejected")
+            self._send_json(503, {"error": "tespit kuyruğu dolu"}, {"Retry-After": "1"})
+        except Exception as e:
+            status = 500
+            logger.error(f"{self.path} isteği işlenirken hata: {e}")
+            self._send_json(500, {"error": str(e)})
+        metrics.observe("request_seconds", time.perf_counter() - start, path=self.path, status=status)
+
+    def _read_image(self):
+        """Gövdedeki görüntüyü ya da JSON'daki {'source': ...} kaynağını yükler."""
+        # Gövde okunmadan dönülürse kalan baytlar aynı bağlantıdaki sonraki istek
+        # sanılmasın diye bağlantı kapatılır
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.close_connection = True
+            raise BadRequest("Content-Length geçersiz")
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise BadRequest(f"Gövde boş ya da {MAX_BODY_BYTES} bayttan büyük")
+        body = self.rfile.read(length)
+
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                source = json.loads(body)["source"]
+            except (ValueError, KeyError, TypeError):
+                raise BadRequest("JSON gövdesi {'source': ...} biçiminde olmalı")
+            # Sunucudaki dosyalar yalnızca açıkça izin verilirse okunur
+            if not is_url(source) and not self.server.allow_local_files:
+                raise BadRequest("Yalnızca http(s) adresleri kabul edilir")
+            return get_image_from_source(source)
+
+        try:
+            image = Image.open(BytesIO(body))
+            return image.convert("RGB") if image.mode != "RGB" else image
+        except Exception as e:
+            raise BadRequest(f"Görüntü okunamadı: {e}")
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """
+    Her isteği ayrı bir iş parçacığında işleyen analiz sunucusu.
+
+    Tespit istekleri MicroBatcher ile toplanıp modele birlikte verilir;
+    anahtar kelime ve arama aşamaları istek iş parçacığında geçmiş
+    kullanılmadan çalışır (istekler birbirinin bağlamını almaz) ve taze
+    geçmiş kayıtları AnswerCache'ten döndürülür.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, components, max_batch_size=8, max_wait=0.005, max_queue=64,
+                 allow_local_files=False):
+        super().__init__(address, AnalysisHandler)
+        (self.translator, self.object_detector, self.keyword_extractor, self.web_searcher,
+         self.data_storage, self.answer_cache) = components
+        self.allow_local_files = allow_local_files
+        self.batcher = MicroBatcher(self.object_detector.detect_batch, max_batch_size=max_batch_size,
+                                    max_wait=max_wait, max_queue=max_queue, name="detect-batcher")
+        metrics.gauge("queue_depth", self.batcher.depth, queue="detect")
+        self.counters = {"detect": 0, "analyze": 0, "rejected": 0}
+        self._counter_lock = threading.Lock()
+
+    def count(self, name):
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    def detect(self, image):
+        self.count("detect")
+        primary_object, _ = self.batcher(preprocess_image(image))
+        if primary_object is None:
+            return {"object": None}
+        return {
+            "object": primary_object["name"],
+            "tr_object": primary_object.get("tr_name") or self.translator.translate(primary_object["name"]),
+            "confidence": round(primary_object["confidence"], 3),
+            "bbox": [round(value, 1) for value in primary_object["bbox"]],
+        }
+
+    def analyze(self, image):
+        result = self.detect(image)
+        self.count("analyze")
+        if result["object"] is None:
+            return result
+        entry, from_history = self.answer_cache.get_or_compute(
+            result["object"],
+            # İstekler eşzamanlı işlendiğinden anahtar kelime/arama geçmişi paylaşılmaz
+            functools.partial(research, self.keyword_extractor, self.web_searcher, result["tr_object"],
+                              use_history=False))
+        result["from_history"] = from_history
+        result["keywords"] = entry["keywords"] if entry else []
+        result["content"] = entry["content"] if entry else None
+        return result
+
+    def metrics(self):
+        return {
+            "requests": self._snapshot_counters(),
+            "detector": self.batcher.info(),
+            "answers": self.answer_cache.info(),
+            "storage": self.data_storage.info(),
+            "latency": metrics.snapshot(),
+        }
+
+    def _snapshot_counters(self):
+        with self._counter_lock:
+            return dict(self.counters)
+
+    def close(self):
+        self.batcher.close()
+        self.answer_cache.close()
+        self.data_storage.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Görüntü analizi HTTP servisi")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=8, help="Tek toplu tespitteki en fazla görüntü")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="Toplu tespit için diğer istekleri bekleme süresi (ms)")
+    parser.add_argument("--max-queue", type=int, default=64,
+                        help="Bekleyen tespit isteği sınırı (aşılınca 503 döner)")
+    parser.add_argument("--allow-local-files", action="store_true",
+                        help="JSON 'source' alanında sunucudaki dosya yollarına izin ver")
+    args = parser.parse_args()
+
+    server = AnalysisServer((args.host, args.port), build_components(),
+                            max_batch_size=args.max_batch_size, max_wait=args.max_wait_ms / 1000,
+                            max_queue=args.max_queue, allow_local_files=args.allow_local_files)
+    logger.info(f"Sunucu dinliyor: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
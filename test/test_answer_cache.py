@@ -0,0 +1,101 @@
+# tests/test_answer_cache.py
+
+import unittest
+import sys
+import os
+import tempfile
+import functools
+from datetime import datetime, timedelta
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.answer_cache import AnswerCache
+from modules.data_storage import DataStorage
+from modules.keyword_extractor import KeywordExtractor
+from modules.pipeline import research
+from modules.rate_limiter import ProviderLimiter
+from modules.web_searcher import WebSearcher
+
+class TestAnswerCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = DataStorage(os.path.join(self.tmpdir.name, "history.jsonl"), legacy_file=None)
+        self.calls = 0
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def _compute(self):
+        self.calls += 1
+        return {"keywords": ["fincan"], "content": f"içerik {self.calls}"}
+
+    def test_fresh_history_is_served_without_compute(self):
+        cache = AnswerCache(self.storage, max_age=3600, refresh_after=None)
+        entry, cached = cache.get_or_compute("cup", self._compute)
+        self.assertFalse(cached)
+        self.assertEqual(entry["content"], "içerik 1")
+
+        # Yeni süreç: yanıt yalnızca geçmişten bulunur
+        entry, cached = AnswerCache(self.storage, max_age=3600, refresh_after=None).get_or_compute("cup", self._compute)
+        self.assertTrue(cached)
+        self.assertEqual(entry["content"], "içerik 1")
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_history_is_recomputed(self):
+        old = (datetime.now() - timedelta(hours=2)).isoformat()
+        self.storage.backend.append({"timestamp": old, "object": "cup", "keywords": [], "content": "eski"})
+
+        entry, cached = AnswerCache(self.storage, max_age=3600).get_or_compute("cup", self._compute)
+        self.assertFalse(cached)
+        self.assertEqual(entry["content"], "içerik 1")
+        self.assertEqual(len(self.storage._read_data()), 2)
+
+    def test_stale_answer_is_refreshed_in_background(self):
+        old = (datetime.now() - timedelta(minutes=30)).isoformat()
+        self.storage.backend.append({"timestamp": old, "object": "cup", "keywords": [], "content": "eski"})
+
+        cache = AnswerCache(self.storage, max_age=3600, refresh_after=600)
+        entry, cached = cache.get_or_compute("cup", self._compute)
+        self.assertTrue(cached)
+        self.assertEqual(entry["content"], "eski")
+        cache.close()
+
+        self.assertEqual(cache.info()["refreshes"], 1)
+        entry, cached = cache.get_or_compute("cup", self._compute)
+        self.assertTrue(cached)
+        self.assertEqual(entry["content"], "içerik 1")
+
+    def test_refresh_does_not_touch_search_history(self):
+        old = (datetime.now() - timedelta(minutes=30)).isoformat()
+        self.storage.backend.append({"timestamp": old, "object": "cup", "keywords": [], "content": "eski"})
+        keyword_extractor = KeywordExtractor()
+        web_searcher = WebSearcher(use_cache=False, serper_limiter=ProviderLimiter("Serper"))
+        web_searcher._search_concurrently = lambda query, num_results=5, lang='tr': [
+            {"title": query, "link": "https://ornek.com", "snippet": query}]
+        web_searcher._cached_wikipedia = lambda name, lang='tr': None
+        self.addCleanup(web_searcher._executor.shutdown, wait=False)
+
+        # Kullanıcının ekrandaki son araması
+        research(keyword_extractor, web_searcher, "şemsiye")
+        search_history = list(web_searcher.search_history)
+        keyword_history = list(keyword_extractor.history)
+
+        cache = AnswerCache(self.storage, max_age=3600, refresh_after=600)
+        cache.get_or_compute("cup", functools.partial(research, keyword_extractor, web_searcher, "fincan"),
+                             refresh=functools.partial(research, keyword_extractor, web_searcher, "fincan",
+                                                       use_history=False))
+        cache.close()
+
+        self.assertEqual(cache.info()["refreshes"], 1)
+        self.assertEqual(web_searcher.search_history, search_history)
+        self.assertEqual(keyword_extractor.history, keyword_history)
+
+    def test_no_result_is_not_stored(self):
+        entry, cached = AnswerCache(self.storage, max_age=3600).get_or_compute("cup", lambda: None)
+        self.assertIsNone(entry)
+        self.assertEqual(self.storage._read_data(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_batch_scheduler.py
+
+import unittest
+import sys
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.batch_scheduler import MicroBatcher
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_are_batched(self):
+        calls = []
+
+        def square_all(items):
+            calls.append(len(items))
+            return [item * item for item in items]
+
+        batcher = MicroBatcher(square_all, max_batch_size=4, max_wait=0.05)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(batcher, range(8)))
+        batcher.close()
+
+        self.assertEqual(results, [i * i for i in range(8)])
+        self.assertLess(len(calls), 8)
+        self.assertTrue(all(size <= 4 for size in calls))
+        info = batcher.info()
+        self.assertEqual(info["requests"], 8)
+        self.assertEqual(info["batches"], len(calls))
+        self.assertEqual(info["depth"], 0)
+
+    def test_failure_reaches_every_caller(self):
+        def fail(items):
+            raise RuntimeError("model hatası")
+
+        batcher = MicroBatcher(fail, max_wait=0.0)
+        with self.assertRaises(RuntimeError):
+            batcher(1)
+        batcher.close()
+        self.assertEqual(batcher.info()["failed"], 1)
+
+    def test_failure_reaches_only_its_caller(self):
+        def invert_all(items):
+            if 0 in items:
+                raise ZeroDivisionError("bozuk görüntü")
+            return [1 / item for item in items]
+
+        batcher = MicroBatcher(invert_all, max_batch_size=4, max_wait=0.05)
+        futures = [batcher.submit(item) for item in (1, 0, 2, 4)]
+        with self.assertRaises(ZeroDivisionError):
+            futures[1].result(1)
+        self.assertEqual([futures[i].result(1) for i in (0, 2, 3)], [1.0, 0.5, 0.25])
+        batcher.close()
+        info = batcher.info()
+        self.assertEqual(info["failed"], 1)
+        self.assertEqual(info["split_batches"], 1)
+
+    def test_full_queue_rejects(self):
+        release = threading.Event()
+
+        def blocked(items):
+            release.wait()
+            return items
+
+        batcher = MicroBatcher(blocked, max_batch_size=1, max_wait=0.0, max_queue=1)
+        first = batcher.submit("a")   # İşleniyor (bekletiliyor)
+        while batcher.depth():
+            pass
+        second = batcher.submit("b")  # Kuyrukta
+        with self.assertRaises(queue.Full):
+            batcher.submit("c")
+        release.set()
+        self.assertEqual((first.result(1), second.result(1)), ("a", "b"))
+        batcher.close()
+        self.assertEqual(batcher.info()["rejected"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
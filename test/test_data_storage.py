@@ -0,0 +1,397 @@
+# tests/test_data_storage.py
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import data_storage
+from modules.data_storage import DataStorage
+
+class TestDataStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage_file = os.path.join(self.tmpdir.name, "history.jsonl")
+        self.legacy_file = os.path.join(self.tmpdir.name, "history.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_save_appends_one_line(self):
+        storage = DataStorage(self.storage_file, legacy_file=None)
+        for i in range(3):
+            self.assertTrue(storage.save_data(f"nesne{i}", ["a", "b"], "içerik"))
+
+        with open(self.storage_file, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)
+        previous = storage.get_previous_data(limit=2)
+        self.assertEqual([entry["object"] for entry in previous], ["nesne1", "nesne2"])
+
+    def test_migrates_legacy_array_once(self):
+        legacy = [{"timestamp": "2025-04-18T14:49:27", "object": "cup", "keywords": ["fincan"], "content": "x"}]
+        with open(self.legacy_file, 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+
+        storage = DataStorage(self.storage_file, legacy_file=self.legacy_file)
+        storage.save_data("book", ["kitap"], "y")
+        # İkinci açılışta yeniden taşınmaz
+        storage = DataStorage(self.storage_file, legacy_file=self.legacy_file)
+        self.assertEqual([entry["object"] for entry in storage._read_data()], ["cup", "book"])
+
+    def test_partial_last_line_is_skipped(self):
+        storage = DataStorage(self.storage_file, legacy_file=None)
+        storage.save_data("cup", [], "x")
+        with open(self.storage_file, 'a', encoding='utf-8') as f:
+            f.write('{"object": "yar')  # Yazma sırasında çökme
+
+        storage = DataStorage(self.storage_file, legacy_file=None)
+        storage.save_data("book", [], "y")
+        self.assertEqual([entry["object"] for entry in storage._read_data()], ["cup", "book"])
+
+    def test_reverse_pagination(self):
+        storage = DataStorage(self.storage_file, legacy_file=None)
+        for i in range(50):
+            storage.save_data(f"nesne{i}", ["ç" * (i % 7)], "içerik " * (i % 13))
+
+        # Blok sınırlarının satır ortasına denk gelmesi için küçük blok
+        original_block = data_storage.REVERSE_READ_BLOCK
+        data_storage.REVERSE_READ_BLOCK = 37
+        try:
+            pages, cursor = [], None
+            while True:
+                entries, cursor = storage.browse_history(limit=15, cursor=cursor)
+                pages.append([entry["object"] for entry in entries])
+                if cursor is None:
+                    break
+            self.assertEqual([len(page) for page in pages], [15, 15, 15, 5])
+            self.assertEqual(sum(pages, []), [f"nesne{i}" for i in reversed(range(50))])
+            self.assertEqual([entry["object"] for entry in storage.get_previous_data(3)],
+                             ["nesne47", "nesne48", "nesne49"])
+        finally:
+            data_storage.REVERSE_READ_BLOCK = original_block
+
+    def test_write_behind_batches_and_flushes_on_close(self):
+        storage = DataStorage(self.storage_file, legacy_file=None, write_behind=True,
+                              batch_size=10, flush_interval=60)
+        writer = storage.writer
+        for i in range(25):
+            storage.save_data(f"nesne{i}", [], "içerik")
+
+        # Okuma kuyruğu boşaltmaz, bekleyen kayıtları da döndürür
+        self.assertEqual(len(storage.get_previous_data(limit=100)), 25)
+        storage.save_data("son", [], "içerik")
+        storage.close()
+
+        with open(self.storage_file, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 26)
+        metrics = writer.info()
+        self.assertEqual(metrics["written"], 26)
+        # 10'luk iki toplu yazma ve kapanışta kalan 6 kayıt
+        self.assertEqual(metrics["batches"], 3)
+
+    def test_reads_include_pending_entries_without_flushing(self):
+        storage = DataStorage(self.storage_file, legacy_file=None, write_behind=True,
+                              batch_size=100, flush_interval=60)
+        writer = storage.writer
+        start = datetime.now()
+        storage.save_data("şemsiye", ["yağmur"], "Şemsiye yağmurdan korur.")
+        storage.save_data("kitap", ["roman"], "Kitap okunur.")
+
+        self.assertEqual(storage.latest("şemsiye", since=start)["content"], "Şemsiye yağmurdan korur.")
+        self.assertEqual([entry["object"] for entry in storage.find(since=start)], ["kitap", "şemsiye"])
+        self.assertEqual([entry["object"] for entry in storage.search("YAĞMURDAN")], ["şemsiye"])
+        self.assertEqual([entry["object"] for entry in storage.get_previous_data(limit=1)], ["kitap"])
+        self.assertEqual(len(storage._read_data()), 2)
+        # Hiçbiri diske yazılmadı
+        self.assertEqual(writer.info()["written"], 0)
+        self.assertFalse(os.path.exists(self.storage_file))
+
+        storage.close()
+        self.assertEqual(writer.info()["written"], 2)
+        self.assertEqual(writer.pending(), [])
+
+    def test_put_after_close_is_written(self):
+        storage = DataStorage(self.storage_file, legacy_file=None, write_behind=True)
+        writer = storage.writer
+        writer.close()
+        writer.put({"timestamp": datetime.now().isoformat(), "object": "geç", "keywords": [], "content": ""})
+
+        self.assertEqual(writer.info()["sync_writes"], 1)
+        self.assertEqual([entry["object"] for entry in DataStorage(self.storage_file, legacy_file=None)._read_data()],
+                         ["geç"])
+
+    def test_write_behind_backpressure(self):
+        storage = DataStorage(self.storage_file, legacy_file=None, write_behind=True,
+                              max_queue=2, batch_size=1, flush_interval=0)
+        writer = storage.writer
+        for i in range(50):
+            storage.save_data(f"nesne{i}", [], "içerik")
+        storage.close()
+
+        metrics = writer.info()
+        self.assertEqual(metrics["written"] + metrics["sync_writes"], 50)
+        self.assertLessEqual(metrics["max_depth"], 2)
+        self.assertEqual(len(DataStorage(self.storage_file, legacy_file=None)._read_data()), 50)
+
+class SlowBackend:
+    """Yazılan kayıtları sırasıyla tutan, her toplu yazmada bekleyen sahte saklama katmanı."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.entries = []
+
+    def extend(self, entries, sync=False):
+        time.sleep(self.delay)
+        self.entries.extend(entries)
+
+class TestWriteBehindOrder(unittest.TestCase):
+    def test_full_queue_keeps_write_order(self):
+        backend = SlowBackend(0.02)
+        writer = data_storage.WriteBehindQueue(backend, max_queue=2, batch_size=1, flush_interval=0,
+                                               put_timeout=0.01)
+        for i in range(20):
+            writer.put({"object": f"nesne{i}"})
+        writer.close()
+
+        # Bekleme süresi defalarca dolsa da hiçbir kayıt kuyruktakilerin önüne geçmez
+        self.assertEqual([entry["object"] for entry in backend.entries], [f"nesne{i}" for i in range(20)])
+        self.assertGreater(writer.info()["queue_full"], 0)
+
+    def test_stopped_writer_writes_pending_in_order(self):
+        backend = SlowBackend(0)
+        writer = data_storage.WriteBehindQueue(backend, max_queue=2, put_timeout=0.01)
+        writer._queue.put(data_storage._STOP)
+        writer._thread.join()
+
+        for i in range(3):
+            writer.put({"object": f"nesne{i}"})
+
+        self.assertEqual([entry["object"] for entry in backend.entries], ["nesne0", "nesne1", "nesne2"])
+        self.assertEqual(writer.info()["sync_writes"], 3)
+        self.assertEqual(writer.pending(), [])
+
+class TestSegmentedHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage_file = os.path.join(self.tmpdir.name, "history.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _storage(self):
+        return DataStorage(self.storage_file, legacy_file=None, max_segment_bytes=1000)
+
+    def test_rotation_and_reads_across_segments(self):
+        storage = self._storage()
+        for i in range(40):
+            storage.save_data(f"nesne{i}", ["anahtar"], "içerik " * 10)
+
+        segments = storage.backend.segments
+        self.assertGreater(len(segments), 3)
+        self.assertLess(os.path.getsize(self.storage_file), 1000)
+        self.assertTrue(all(segment["file"].endswith(".jsonl.gz") for segment in segments))
+
+        expected = [f"nesne{i}" for i in range(40)]
+        self.assertEqual([entry["object"] for entry in self._storage()._read_data()], expected)
+
+        pages, cursor = [], None
+        while True:
+            entries, cursor = storage.browse_history(limit=7, cursor=cursor)
+            pages.extend(entry["object"] for entry in entries)
+            if cursor is None:
+                break
+        self.assertEqual(pages, expected[::-1])
+
+    def test_compaction_drops_duplicates_and_expired(self):
+        storage = self._storage()
+        old = (datetime.now() - timedelta(days=30)).isoformat()
+        storage.backend.extend([{"timestamp": old, "object": "eski", "keywords": [], "content": "x" * 300}])
+        for i in range(12):
+            storage.save_data(f"nesne{i % 3}", [], "aynı içerik " * 20)
+        storage.backend.rotate()
+
+        stats = storage.compact(max_age_days=7)
+        self.assertEqual(stats["entries_before"], 13)
+        self.assertEqual(stats["expired"], 1)
+        self.assertEqual(stats["duplicates"], 9)
+        self.assertEqual(stats["entries_after"], 3)
+        self.assertLess(stats["bytes_after"], stats["bytes_before"])
+        # En yeni kopyalar sırasıyla kalır
+        self.assertEqual([entry["object"] for entry in self._storage()._read_data()],
+                         ["nesne0", "nesne1", "nesne2"])
+        # Eski bölüt dosyaları silinir (bölütler + manifest)
+        self.assertEqual(len(os.listdir(storage.backend.segment_dir)), len(storage.backend.segments) + 1)
+
+    def test_interrupted_rotation_is_recovered(self):
+        storage = self._storage()
+        storage.save_data("cup", [], "x")
+        os.replace(self.storage_file, self.storage_file + ".rotating")  # Taşıma sırasında çökme
+
+        storage = self._storage()
+        storage.save_data("book", [], "y")
+        self.assertFalse(os.path.exists(self.storage_file + ".rotating"))
+        self.assertEqual([entry["object"] for entry in storage._read_data()], ["cup", "book"])
+
+    def test_second_process_compaction_is_not_lost(self):
+        # Uygulama ve compact_history.py aynı geçmişi ayrı kilit dosyası tanıtıcılarıyla kullanır
+        app = self._storage()
+        for i in range(20):
+            app.save_data(f"nesne{i}", ["anahtar"], "içerik " * 10)
+
+        compactor = self._storage()
+        compactor.backend.rotate()  # --rotate
+        stats = compactor.compact()
+        self.assertEqual(stats["entries_after"], 20)
+
+        # Uygulama eski manifestle değil diskteki güncel manifestle devam eder
+        for i in range(20, 40):
+            app.save_data(f"nesne{i}", ["anahtar"], "içerik " * 10)
+        segments = self._storage().backend.segments
+        self.assertEqual(len({segment["seq"] for segment in segments}), len(segments))
+        for segment in segments:
+            self.assertTrue(os.path.exists(os.path.join(app.backend.segment_dir, segment["file"])))
+        self.assertEqual([entry["object"] for entry in self._storage()._read_data()],
+                         [f"nesne{i}" for i in range(40)])
+
+    def test_concurrent_compaction_is_refused(self):
+        storage = self._storage()
+        for i in range(20):
+            storage.save_data(f"nesne{i}", [], "içerik " * 10)
+        other = self._storage()
+        self.assertTrue(other.backend._compaction_lock.acquire(blocking=False))
+        try:
+            with self.assertRaises(data_storage.HistoryLockedError):
+                storage.compact()
+        finally:
+            other.backend._compaction_lock.release()
+        stats = storage.compact()
+        self.assertEqual(stats["entries_after"], stats["entries_before"])
+        self.assertEqual(len(storage._read_data()), 20)
+
+class TestContentDedup(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage_file = os.path.join(self.tmpdir.name, "history.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_identical_content_is_stored_once(self):
+        storage = DataStorage(self.storage_file, legacy_file=None, dedupe_content=True)
+        content = "Sırt çantası hakkında uzun bir açıklama. " * 40
+        for i in range(10):
+            storage.save_data("sırt çantası", ["okul"], content)
+        storage.save_data("fincan", ["kahve"], "kısa içerik")
+
+        info = storage.info()["blobs"]
+        self.assertEqual(info["blobs"], 2)
+        self.assertEqual(info["dedup_hits"], 9)
+        # Tam kopyalarla yazılacak boyutun dörtte birinden az
+        self.assertLess(os.path.getsize(self.storage_file) + info["bytes"], len(content.encode("utf-8")) * 10 / 4)
+        storage.close()
+
+        # Özellik kapalı açılan depo da içerikleri çözebilir
+        reopened = DataStorage(self.storage_file, legacy_file=None)
+        entries = reopened._read_data()
+        self.assertEqual([entry["content"] for entry in entries], [content] * 10 + ["kısa içerik"])
+        self.assertNotIn("content_ref", entries[0])
+        self.assertEqual(len(reopened.search("çantası açıklama")), 10)
+        reopened.close()
+
+    def test_near_duplicates_reuse_existing_blob(self):
+        storage = DataStorage(self.storage_file, legacy_file=None, dedupe_content=True,
+                              near_duplicate_threshold=0.8)
+        base = " ".join(f"kelime{i}" for i in range(200))
+        storage.save_data("kitap", [], base)
+        storage.save_data("kitap", [], base + " ek")
+        storage.save_data("fincan", [], base + " ek")  # Başka nesnenin içeriği karşılaştırılmaz
+
+        entries = storage._read_data()
+        self.assertEqual(entries[1]["content"], base)
+        self.assertNotIn("content_similarity", entries[1])  # İç alan okuyuculara dönmez
+        self.assertEqual(entries[2]["content"], base + " ek")
+        self.assertEqual(storage.info()["blobs"]["near_duplicates"], 1)
+        storage.close()
+
+    def test_compaction_removes_unreferenced_blobs(self):
+        storage = DataStorage(self.storage_file, legacy_file=None, dedupe_content=True, max_segment_bytes=1000)
+        old = (datetime.now() - timedelta(days=30)).isoformat()
+        storage.backend.extend([{"timestamp": old, "object": "eski", "keywords": [],
+                                 "content": "eski içerik " * 100}])
+        for i in range(6):
+            storage.save_data(f"nesne{i}", [], f"içerik {i} " * 50)
+        storage.backend.rotate()
+        storage.save_data("yeni", [], "etkin dosyadaki içerik " * 20)
+        blobs_before = storage.info()["blobs"]
+
+        stats = storage.compact(max_age_days=7)
+        self.assertEqual(stats["blobs_removed"], 1)
+        self.assertGreater(stats["blob_bytes_freed"], 0)
+        blobs = storage.info()["blobs"]
+        self.assertEqual(blobs["blobs"], blobs_before["blobs"] - 1)
+        self.assertLess(blobs["bytes"], blobs_before["bytes"])
+
+        # Kalan kayıtların içerikleri (etkin dosyadakiler dahil) okunabilir
+        storage.save_data("sonra", [], "sıkıştırmadan sonra " * 20)
+        storage.close()
+        reopened = DataStorage(self.storage_file, legacy_file=None)
+        contents = {entry["object"]: entry["content"] for entry in reopened._read_data()}
+        self.assertNotIn("eski", contents)
+        self.assertEqual(contents["nesne3"], "içerik 3 " * 50)
+        self.assertEqual(contents["yeni"], "etkin dosyadaki içerik " * 20)
+        self.assertEqual(contents["sonra"], "sıkıştırmadan sonra " * 20)
+        reopened.close()
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmpdir.name, "history.db")
+
+    def tearDown(self):
+        self.storage.backend.close()
+        self.tmpdir.cleanup()
+
+    def test_find_and_search(self):
+        self.storage = DataStorage(self.db_file, legacy_file=None, backend="sqlite")
+        old = (datetime.now() - timedelta(days=10)).isoformat()
+        self.storage.backend.append({"timestamp": old, "object": "handbag",
+                                     "keywords": ["el çantası"], "content": "Eski deri çanta"})
+        self.storage.save_data("handbag", ["el çantası", "kadın"], "Yeni sezon deri ÇANTA modelleri")
+        self.storage.save_data("cup", ["fincan"], "Porselen fincan")
+
+        this_week = self.storage.find("handbag", since=datetime.now() - timedelta(days=7))
+        self.assertEqual([entry["content"] for entry in this_week], ["Yeni sezon deri ÇANTA modelleri"])
+        self.assertEqual(len(self.storage.find("handbag")), 2)
+
+        # Türkçe büyük/küçük harf farkı gözetilmez, tüm kelimeler geçmeli
+        found = self.storage.search("deri çanta")
+        self.assertEqual({entry["content"] for entry in found},
+                         {"Eski deri çanta", "Yeni sezon deri ÇANTA modelleri"})
+        self.assertEqual(self.storage.search("kadın")[0]["keywords"], ["el çantası", "kadın"])
+        self.assertEqual(self.storage.search("porselen", object_name="handbag"), [])
+        self.assertEqual(self.storage.get_previous_data(1)[0]["object"], "cup")
+
+        entries, cursor = self.storage.browse_history(limit=2)
+        self.assertEqual([entry["object"] for entry in entries], ["cup", "handbag"])
+        entries, cursor = self.storage.browse_history(limit=2, cursor=cursor)
+        self.assertEqual(len(entries), 1)
+        self.assertIsNone(cursor)
+
+    def test_imports_existing_history_once(self):
+        legacy_file = os.path.join(self.tmpdir.name, "history.json")
+        with open(legacy_file, 'w', encoding='utf-8') as f:
+            json.dump([{"timestamp": "2025-04-18T14:49:27", "object": "cup", "keywords": [], "content": "x"}], f)
+
+        self.storage = DataStorage(self.db_file, legacy_file=legacy_file, backend="sqlite")
+        self.storage.backend.close()
+        self.storage = DataStorage(self.db_file, legacy_file=legacy_file, backend="sqlite")
+        self.assertEqual(self.storage.backend.count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
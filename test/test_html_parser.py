@@ -0,0 +1,76 @@
+# tests/test_html_parser.py
+
+import unittest
+import sys
+import os
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.html_parser import parse_ddg_results, available_backends, extract_main_text
+
+def _result_block(i):
+    return f"""
+    <div class="result results_links results_links_deep web-result ">
+      <div class="links_main links_deep result__body">
+        <h2 class="result__title">
+          <a rel="nofollow" class="result__a" href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fornek{i}.com%2Fsayfa%3Fa%3D1&amp;rut=abc">Başlık <b>{i}</b></a>
+        </h2>
+        <a class="result__snippet" href="#">Çanta <b>modelleri</b> &amp; fiyatları {i}<br/>devamı</a>
+        <img src="x.png">
+      </div>
+    </div>"""
+
+SAMPLE_PAGE = ("<html><head><meta charset='utf-8'></head><body><div id='links'>"
+               + "".join(_result_block(i) for i in range(8))
+               + "</div></body></html>").encode("utf-8")
+
+class TestHtmlParser(unittest.TestCase):
+    def test_parse_results_with_each_backend(self):
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                results = parse_ddg_results(SAMPLE_PAGE, num_results=3, backend=backend)
+
+                self.assertEqual(len(results), 3)
+                self.assertEqual(results[0]['title'], "Başlık0")
+                self.assertEqual(results[0]['link'], "https://ornek0.com/sayfa?a=1")
+                self.assertEqual(results[2]['snippet'], "Çantamodelleri& fiyatları 2devamı")
+
+    def test_parse_malformed_markup(self):
+        # Kapatılmamış <p> ve <span>, açılmamış </b>: sonuç blokları yine ayrı ayrı bulunmalı
+        blocks = "".join(f"""
+            <div class="result"><p><span>
+              <a class="result__a" href="https://ornek{i}.com">Başlık {i}</b></a>
+              <div class="result__snippet">Özet {i}<p>devamı</div>
+            </div>""" for i in range(3))
+        page = ("<html><body><div id='links'>" + blocks + "</div></body></html>").encode("utf-8")
+
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                results = parse_ddg_results(page, num_results=5, backend=backend)
+
+                self.assertEqual([result['link'] for result in results],
+                                 [f"https://ornek{i}.com" for i in range(3)])
+                self.assertEqual(results[1]['title'], "Başlık 1")
+                self.assertEqual(results[1]['snippet'], "Özet 1devamı")
+
+    def test_extract_main_text_streaming(self):
+        page = ("<html><head><script>var s = '<p>betik içindeki paragraf</p>';</script></head><body>"
+                "<nav><p>Menüdeki bu bağlantı metni de yeterince uzun ama atlanmalı</p></nav>"
+                "<article><h1>Kısa</h1><p>Sırt çantası seçerken askıların kalınlığına <b>dikkat</b> edilmelidir.</p>"
+                "<p>İkinci paragraf: laptop bölmesi olan modeller okul için daha kullanışlıdır.</p></article>"
+                "</body></html>").encode("utf-8")
+        # UTF-8 çok baytlı karakterleri bölecek şekilde küçük parçalarla besle
+        chunks = [page[i:i + 7] for i in range(0, len(page), 7)]
+
+        text = extract_main_text(chunks)
+        self.assertEqual(text.split("\n"), [
+            "Sırt çantası seçerken askıların kalınlığına dikkat edilmelidir.",
+            "İkinci paragraf: laptop bölmesi olan modeller okul için daha kullanışlıdır.",
+        ])
+
+        # Karakter sınırına ulaşınca okuma durur
+        self.assertLessEqual(len(extract_main_text(chunks, max_chars=20)), 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# tests/test_http_client.py
+
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.http_client import DEFAULT_TIMEOUT, HostLimitTimeout, HttpClient
+
+class RecordingTransport:
+    """İstekleri ağa çıkmadan kaydeder; hold ayarlanmışsa yavaş ana bilgisayarı serbest bırakılana kadar bekletir."""
+
+    def __init__(self):
+        self.calls = []
+        self.hold = None
+        self.active = 0
+        self.max_active = {}
+        self._lock = threading.Lock()
+
+    def send(self, session, method, url, **kwargs):
+        with self._lock:
+            self.calls.append((method, url, kwargs))
+            self.active += 1
+            self.max_active[url] = max(self.max_active.get(url, 0), self.active)
+        try:
+            if self.hold is not None and "yavas" in url:
+                self.hold.wait(5)
+            return "yanıt"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.transport = RecordingTransport()
+
+    def test_default_timeout(self):
+        client = HttpClient(transport=self.transport)
+        client.get("https://ornek.com/a")
+        client.post("https://ornek.com/b", timeout=1)
+
+        self.assertEqual(self.transport.calls[0][2]["timeout"], DEFAULT_TIMEOUT)
+        self.assertEqual(self.transport.calls[1][2]["timeout"], 1)
+        client.close()
+
+    def test_retry_and_backoff_config(self):
+        client = HttpClient(retries=3, backoff_factor=0.5, transport=self.transport)
+        retry = client.session.get_adapter("https://ornek.com").max_retries
+
+        self.assertEqual(retry.total, 3)
+        self.assertEqual(retry.backoff_factor, 0.5)
+        self.assertIn(429, retry.status_forcelist)
+        self.assertIn(503, retry.status_forcelist)
+        # Serper gibi POST istekleri kotayı harcamasın diye yeniden denenmez
+        self.assertIn("GET", retry.allowed_methods)
+        self.assertNotIn("POST", retry.allowed_methods)
+        client.close()
+
+    def test_per_host_limit(self):
+        client = HttpClient(per_host_limit=2, transport=self.transport)
+        self.transport.hold = threading.Event()
+        threads = [threading.Thread(target=client.get, args=("https://yavas.com",)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+
+        # Sınır dolu ana bilgisayar başka ana bilgisayarları bekletmez
+        self.assertEqual(client.get("https://hizli.com", timeout=0.5), "yanıt")
+        self.transport.hold.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.transport.max_active["https://yavas.com"], 2)
+        self.assertEqual(len(self.transport.calls), 5)
+        client.close()
+
+    def test_host_limit_wait_times_out(self):
+        client = HttpClient(per_host_limit=1, transport=self.transport)
+        self.transport.hold = threading.Event()
+        holder = threading.Thread(target=client.get, args=("https://yavas.com",))
+        holder.start()
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        with self.assertRaises(HostLimitTimeout):
+            client.get("https://yavas.com", timeout=(0.1, 0.1))
+        self.assertLess(time.monotonic() - start, 1)
+
+        self.transport.hold.set()
+        holder.join()
+        # Sınır serbest kaldıktan sonra istek yapılabilir
+        self.assertEqual(client.get("https://yavas.com", timeout=0.1), "yanıt")
+        client.close()
+
+if __name__ == '__main__':
+    unittest.main()
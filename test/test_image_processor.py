@@ -23,7 +23,7 @@ class TestImageProcessor(unittest.TestCase):
         self.assertFalse(is_url("/path/to/image.jpg"))
         self.assertFalse(is_url("C:\\Users\\images\\photo.png"))
     
-    @patch('modules.image_processor.requests.get')
+    @patch('modules.image_processor.http_client.get')
     def test_get_image_from_url(self, mock_get):
         # Mock response hazırla
         mock_response = MagicMock()
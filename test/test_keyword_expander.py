@@ -0,0 +1,95 @@
+# tests/test_keyword_expander.py
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.keyword_expander import EmbeddingExpander
+
+# Küçük, elle seçilmiş vektörler: çanta grubu ve yiyecek grubu
+VECTORS = {
+    "çanta": [1.0, 0.0, 0.0],
+    "sırt": [0.9, 0.1, 0.0],
+    "askı": [0.8, 0.3, 0.0],
+    "fermuar": [0.7, 0.0, 0.4],
+    "ekmek": [0.0, 0.0, 1.0],
+    "peynir": [0.0, 0.2, 0.9],
+}
+
+class FakeVocab:
+    """SpaCy Vocab'ın kullanılan kısmı; bilinmeyen kelimeyi sözlüğe eklemez."""
+
+    def __init__(self, vectors):
+        self.vectors = {word: np.array(vector, dtype=np.float32) for word, vector in vectors.items()}
+        self.strings = set(self.vectors) | {"vektörsüz"}
+
+    def has_vector(self, word):
+        return word in self.vectors
+
+    def get_vector(self, word):
+        return self.vectors[word]
+
+class FakeNlp:
+    def __init__(self, vectors=VECTORS):
+        self.vocab = FakeVocab(vectors)
+
+class TestEmbeddingExpander(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.nlp = FakeNlp()
+        patcher = mock.patch("modules.keyword_expander.get_nlp", return_value=self.nlp)
+        self.get_nlp = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _expander(self, **kwargs):
+        vocabulary = list(VECTORS) + ["vektörsüz", "bilinmeyen"]
+        return EmbeddingExpander(vocabulary=vocabulary, cache_dir=self.tmpdir.name, **kwargs)
+
+    def test_build_matrix(self):
+        expander = self._expander()
+        self.assertTrue(expander.available)
+
+        # Vektörü olmayan kelimeler matrise girmez, satırlar birim uzunluktadır
+        self.assertEqual(expander.words, list(VECTORS))
+        self.assertEqual(expander.matrix.shape, (len(VECTORS), 3))
+        np.testing.assert_allclose(np.linalg.norm(expander.matrix, axis=1), 1.0, rtol=1e-5)
+        # Bilinmeyen kelimeler sözlüğe eklenmez
+        self.assertNotIn("bilinmeyen", self.nlp.vocab.strings)
+
+    def test_reload_uses_memory_mapped_matrix(self):
+        self.assertTrue(self._expander().available)
+        self.get_nlp.reset_mock()
+
+        reloaded = self._expander()
+        self.assertTrue(reloaded.available)
+        self.assertIsInstance(reloaded.matrix, np.memmap)
+        self.assertEqual(reloaded.words, list(VECTORS))
+        # Matris diskten açıldı, model yüklenmedi
+        self.get_nlp.assert_not_called()
+
+        # Sözlük değişirse matris yeniden oluşturulur
+        changed = EmbeddingExpander(vocabulary=["çanta", "ekmek"], cache_dir=self.tmpdir.name)
+        self.assertTrue(changed.available)
+        self.assertEqual(changed.words, ["çanta", "ekmek"])
+
+    def test_expand_returns_top_k_neighbours(self):
+        expander = self._expander(top_k=2, min_similarity=0.5)
+
+        # Nesne adının kendisi atlanır, en yakın iki kelime benzerlik sırasıyla döner
+        self.assertEqual(expander.expand("çanta"), ["sırt", "askı"])
+        # Benzerlik eşiğinin altındaki kelimeler (ekmek-fermuar ~0.50) alınmaz
+        self.assertEqual(expander.expand("ekmek", top_k=3), ["peynir"])
+        self.assertEqual(expander.expand_batch(["sırt çanta", "vektörsüz"]), [["askı", "fermuar"], []])
+
+if __name__ == '__main__':
+    unittest.main()
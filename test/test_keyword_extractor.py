@@ -0,0 +1,150 @@
+# tests/test_keyword_extractor.py
+
+import unittest
+import sys
+import os
+import threading
+import time
+import types
+from unittest import mock
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.pattern_matcher import PatternMatcher
+from modules import keyword_extractor
+from modules.keyword_extractor import KeywordExtractor, DEFAULT_RULES, get_nlp, get_wordnet
+
+class TestPatternMatcher(unittest.TestCase):
+    def test_finds_overlapping_patterns(self):
+        matcher = PatternMatcher(["çanta", "el çantası", "ta", "sırt"])
+        matches = list(matcher.iter_matches("el çantası"))
+
+        self.assertIn((0, 10, "el çantası"), matches)
+        self.assertIn((3, 8, "çanta"), matches)
+        self.assertEqual(matcher.found("el çantası"), {"çanta", "el çantası", "ta"})
+        self.assertEqual(matcher.found("masa"), set())
+
+class TestKeywordExtractor(unittest.TestCase):
+    def test_category_matching(self):
+        found = DEFAULT_RULES.object_matcher.found("laptop çantası")
+        # Tam eşleşme, kısmi eşleşme ve ters yönde kısmi eşleşme
+        self.assertEqual(DEFAULT_RULES.match_category("sırt çantası", set()), "sırt çantası")
+        self.assertEqual(DEFAULT_RULES.match_category("laptop çantası", found), "çanta")
+        self.assertEqual(DEFAULT_RULES.match_category("sandv", set()), "sandviç")
+        self.assertIsNone(DEFAULT_RULES.match_category("uçak", set()))
+
+    def test_generate_keywords_turkish(self):
+        extractor = KeywordExtractor(keyword_count=20)
+        keywords = extractor.generate_keywords("sosisli sandviç", is_turkish=True)
+
+        self.assertIn("ketçap", keywords)
+        self.assertIn("sosisli sandviç tarifi", keywords)
+
+        # Geçmişe bağlı zenginleştirme
+        keywords = extractor.generate_keywords("sandviç", is_turkish=True)
+        self.assertIn("ev yapımı sandviç", keywords)
+
+    def test_generate_keywords_cache(self):
+        extractor = KeywordExtractor()
+        first = extractor.generate_keywords("uçak", is_turkish=True)
+        second = extractor.generate_keywords("uçak", is_turkish=True)
+
+        # Geçmiş parmak izi değişmediği için ikinci çağrı önbellekten gelir
+        self.assertEqual(first, second)
+        self.assertEqual(extractor.cache.info()["hits"], 1)
+        self.assertEqual(len(extractor.history), 2)
+
+        # Geçmiş bağlamı değişince sonuç yeniden üretilir
+        extractor.generate_keywords("sandviç", is_turkish=True)
+        extractor.generate_keywords("sandviç", is_turkish=True)
+        self.assertEqual(extractor.cache.info()["hits"], 1)
+
+    def test_generate_keywords_without_history(self):
+        extractor = KeywordExtractor(keyword_count=20)
+        extractor.generate_keywords("sosisli sandviç", is_turkish=True)
+
+        # Bağımsız çağrı önceki nesnenin bağlamını almaz ve geçmişi değiştirmez
+        keywords = extractor.generate_keywords("sandviç", is_turkish=True, use_history=False)
+        self.assertNotIn("ev yapımı sandviç", keywords)
+        self.assertEqual(sorted(keywords),
+                         sorted(KeywordExtractor(keyword_count=20).generate_keywords("sandviç", is_turkish=True)))
+        self.assertEqual(len(extractor.history), 1)
+
+class TestSharedResources(unittest.TestCase):
+    def setUp(self):
+        # Modül düzeyindeki önbellekler testler arasında sıfırlanır
+        patches = [
+            mock.patch.dict(keyword_extractor._nlp_models, clear=True),
+            mock.patch.object(keyword_extractor, "_wordnet", None),
+            mock.patch.object(keyword_extractor, "_wordnet_loaded", False),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_get_nlp_loads_model_once(self):
+        loads = []
+
+        def load(model_name, offline):
+            loads.append(model_name)
+            time.sleep(0.05)
+            return object()
+
+        with mock.patch.object(keyword_extractor, "_load_spacy_model", side_effect=load):
+            models = []
+            threads = [threading.Thread(target=lambda: models.append(get_nlp("tr"))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(loads, ["tr_core_news_md"])
+        self.assertTrue(all(model is models[0] for model in models))
+        # Bilinmeyen dil için model yoktur
+        self.assertIsNone(get_nlp("xx"))
+
+    def test_get_nlp_offline_does_not_download(self):
+        spacy = types.ModuleType("spacy")
+        spacy.load = mock.Mock(side_effect=OSError("model yok"))
+
+        with mock.patch.dict(sys.modules, {"spacy": spacy}), \
+                mock.patch.object(keyword_extractor.config, "OFFLINE_MODE", True), \
+                mock.patch.object(keyword_extractor.subprocess, "run") as run:
+            self.assertIsNone(get_nlp("en"))
+
+        run.assert_not_called()
+        spacy.load.assert_called_once_with("en_core_web_md")
+
+    def test_get_wordnet_offline_is_cached(self):
+        nltk = types.ModuleType("nltk")
+        nltk.data = mock.Mock()
+        nltk.data.find.side_effect = LookupError("wordnet yok")
+        nltk.download = mock.Mock()
+
+        with mock.patch.dict(sys.modules, {"nltk": nltk}):
+            self.assertIsNone(get_wordnet(offline=True))
+            self.assertIsNone(get_wordnet(offline=True))
+
+        nltk.download.assert_not_called()
+        # Başarısız yükleme de hatırlanır, ikinci çağrıda tekrar denenmez
+        self.assertEqual(nltk.data.find.call_count, 1)
+
+    def test_get_wordnet_reuses_loaded_corpus(self):
+        wordnet = mock.Mock()
+        nltk = types.ModuleType("nltk")
+        nltk.data = mock.Mock()
+        nltk.download = mock.Mock()
+        corpus = types.ModuleType("nltk.corpus")
+        corpus.wordnet = wordnet
+        nltk.corpus = corpus
+
+        with mock.patch.dict(sys.modules, {"nltk": nltk, "nltk.corpus": corpus}):
+            self.assertIs(get_wordnet(), wordnet)
+            self.assertIs(get_wordnet(), wordnet)
+
+        wordnet.ensure_loaded.assert_called_once_with()
+        nltk.download.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
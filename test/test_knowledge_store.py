@@ -0,0 +1,72 @@
+# tests/test_knowledge_store.py
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.knowledge_store import COCO_CLASSES, KnowledgeStore, detectable_classes, prefetch
+
+class FakeTranslator:
+    def translate(self, text):
+        return {"cup": "fincan", "book": "kitap"}.get(text, text)
+
+class FakeKeywordExtractor:
+    def __init__(self):
+        self.history = []
+
+    def generate_keywords(self, object_name, is_turkish=False):
+        self.history.append(object_name)
+        return [object_name, "bilgi"]
+
+class FakeWebSearcher:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_knowledge(self, object_name, keywords, lang='tr'):
+        self.calls.append(object_name)
+        return {"query": f"{object_name} bilgi",
+                "results": [{"title": object_name, "link": "https://ornek.com", "snippet": ""}],
+                "wikipedia": f"{object_name} özeti"}
+
+class TestKnowledgeStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "knowledge.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_detectable_classes(self):
+        classes = detectable_classes(os.path.join(os.path.dirname(__file__), '..',
+                                                  'custom_objects_dataset', 'data.yaml'))
+        self.assertEqual(len(COCO_CLASSES), 80)
+        # Özel sınıfların COCO'da olmayanları eklenir
+        self.assertIn("shoe", classes)
+        self.assertIn("table", classes)
+        self.assertEqual(len(classes), len(set(classes)))
+
+    def test_prefetch_is_incremental_and_persistent(self):
+        store = KnowledgeStore(self.path)
+        searcher = FakeWebSearcher()
+        self.assertEqual(prefetch(store, ["cup"], FakeTranslator(), FakeKeywordExtractor(), searcher), 1)
+        self.assertEqual(prefetch(store, ["cup", "book"], FakeTranslator(), FakeKeywordExtractor(), searcher), 1)
+        self.assertEqual(searcher.calls, ["fincan", "kitap"])
+
+        reloaded = KnowledgeStore(self.path)
+        entry = reloaded.get("Fincan")
+        self.assertEqual(entry["name"], "cup")
+        self.assertEqual(entry["wikipedia"], "fincan özeti")
+        self.assertIs(reloaded.get("cup"), entry)
+
+        # Kayıtlar dile göre anahtarlanır
+        self.assertIsNone(reloaded.get("cup", lang="en"))
+
+        # Süresi dolan kayıt güncel sayılmaz
+        self.assertIsNone(KnowledgeStore(self.path, max_age=-1).get("cup"))
+
+if __name__ == '__main__':
+    unittest.main()
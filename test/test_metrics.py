@@ -0,0 +1,88 @@
+# tests/test_metrics.py
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.metrics import Histogram, MetricsRegistry
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_and_quantiles(self):
+        histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+        for value in [0.005] * 90 + [0.05] * 9 + [3.0]:
+            histogram.observe(value)
+
+        data = histogram.snapshot()
+        self.assertEqual(data["count"], 100)
+        self.assertEqual(data["buckets"], [90, 9, 0, 1])
+        self.assertEqual(data["p50"], 0.01)
+        self.assertEqual(data["p95"], 0.1)
+        self.assertEqual(data["max"], 3.0)
+        self.assertEqual(histogram.quantile(1.0), 3.0)
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_timers_counters_and_gauges(self):
+        registry = MetricsRegistry(buckets=(0.5, 1.0))
+
+        @registry.timed("stage_seconds", stage="detect")
+        def detect(x):
+            return x * 2
+
+        self.assertEqual(detect(3), 6)
+        with registry.timer("stage_seconds", stage="fetch"):
+            pass
+        registry.count("cache_requests_total", cache="search", result="hit")
+        registry.count("cache_requests_total", cache="search", result="hit")
+        registry.gauge("queue_depth", lambda: 4, queue="detect")
+
+        data = registry.snapshot()
+        stages = {series["stage"]: series["value"]["count"] for series in data["histograms"]["stage_seconds"]}
+        self.assertEqual(stages, {"detect": 1, "fetch": 1})
+        self.assertEqual(data["counters"]["cache_requests_total"],
+                         [{"cache": "search", "result": "hit", "value": 2}])
+        self.assertEqual(data["gauges"]["queue_depth"], [{"queue": "detect", "value": 4.0}])
+        json.dumps(data)
+
+    def test_prometheus_format(self):
+        registry = MetricsRegistry(buckets=(0.5, 1.0))
+        registry.observe("stage_seconds", 0.7, stage='a"b')
+        registry.count("cache_requests_total", cache="search", result="miss")
+
+        lines = registry.prometheus().splitlines()
+        self.assertIn("# TYPE goruntu_stage_seconds histogram", lines)
+        self.assertIn('goruntu_stage_seconds_bucket{stage="a\\"b",le="0.5"} 0', lines)
+        self.assertIn('goruntu_stage_seconds_bucket{stage="a\\"b",le="1.0"} 1', lines)
+        self.assertIn('goruntu_stage_seconds_bucket{stage="a\\"b",le="+Inf"} 1', lines)
+        self.assertIn('goruntu_stage_seconds_count{stage="a\\"b"} 1', lines)
+        self.assertIn('goruntu_cache_requests_total{cache="search",result="miss"} 1', lines)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "metrics.json")
+            registry.dump(path)
+            with open(path, encoding='utf-8') as f:
+                self.assertIn("stage_seconds", json.load(f)["histograms"])
+
+    def test_disabled_registry_records_nothing(self):
+        registry = MetricsRegistry(enabled=False)
+
+        @registry.timed("stage_seconds", stage="detect")
+        def detect():
+            return "ok"
+
+        self.assertEqual(detect(), "ok")
+        with registry.timer("stage_seconds", stage="fetch"):
+            pass
+        registry.observe("stage_seconds", 1.0)
+        registry.count("cache_requests_total", cache="search", result="hit")
+
+        data = registry.snapshot()
+        self.assertEqual(data["histograms"], {})
+        self.assertEqual(data["counters"], {})
+
+if __name__ == '__main__':
+    unittest.main()
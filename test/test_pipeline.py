@@ -0,0 +1,70 @@
+# tests/test_pipeline.py
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.pipeline import Pipeline, Stage, iter_batch_sources, parse_workers
+
+class TestPipeline(unittest.TestCase):
+    def test_all_items_flow_through_stages(self):
+        def double(item):
+            item["value"] = item["source"] * 2
+
+        def skip_odd(item):
+            if item["value"] % 4:
+                item["done"] = True
+
+        def fail_on_eight(item):
+            if item["value"] == 8:
+                raise ValueError("sekiz")
+            item["stored"] = True
+
+        results = []
+        pipeline = Pipeline([Stage("double", double, 3), Stage("skip", skip_odd, 2),
+                             Stage("store", fail_on_eight, 1)], queue_size=2)
+        summary = pipeline.run(range(10), sink=results.append)
+
+        self.assertEqual(summary["items"], 10)
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(sorted(item["source"] for item in results), list(range(10)))
+        stored = sorted(item["source"] for item in results if item.get("stored"))
+        self.assertEqual(stored, [0, 2, 6, 8])
+        self.assertEqual(summary["stages"]["skip"]["processed"], 10)
+        self.assertEqual(summary["stages"]["store"]["processed"], 4)
+        self.assertEqual(summary["stages"]["store"]["failed"], 1)
+
+    def test_stages_overlap(self):
+        # İki aşama da öğe başına 20 ms; aşamalar sırayla çalışsaydı süre ~0.8 sn olurdu
+        def slow(item):
+            time.sleep(0.02)
+
+        pipeline = Pipeline([Stage("a", slow, 4), Stage("b", slow, 4)])
+        summary = pipeline.run(range(20))
+        self.assertEqual(summary["items"], 20)
+        self.assertLess(summary["seconds"], 0.4)
+
+    def test_batch_sources_and_workers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("b.jpg", "a.PNG", "notlar.txt"):
+                open(os.path.join(tmpdir, name), 'w').close()
+            list_file = os.path.join(tmpdir, "notlar.txt")
+            with open(list_file, 'w', encoding='utf-8') as f:
+                f.write("# liste\nhttps://example.com/1.jpg\n\nfoto.png\n")
+
+            self.assertEqual(iter_batch_sources(tmpdir),
+                             [os.path.join(tmpdir, "a.PNG"), os.path.join(tmpdir, "b.jpg")])
+            self.assertEqual(iter_batch_sources(list_file), ["https://example.com/1.jpg", "foto.png"])
+            self.assertEqual(iter_batch_sources(os.path.join(tmpdir, "*.jpg")), [os.path.join(tmpdir, "b.jpg")])
+
+        self.assertEqual(parse_workers(["detect=2", "search=6"]), {"detect": 2, "search": 6})
+        with self.assertRaises(ValueError):
+            parse_workers(["gpu=2"])
+
+if __name__ == '__main__':
+    unittest.main()
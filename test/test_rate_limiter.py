@@ -0,0 +1,82 @@
+# tests/test_rate_limiter.py
+
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.rate_limiter import QuotaTracker, SingleFlight, TokenBucket
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return ["sonuç"]
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("q", fetch)))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=lambda: results.append(flights.do("q", fetch))) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [["sonuç"]] * 4)
+        self.assertEqual(flights.shared, 3)
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_denied(self):
+        bucket = TokenBucket(rate=0.001, capacity=2)
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    def test_pause_withholds_tokens(self):
+        bucket = TokenBucket(rate=100, capacity=5)
+        bucket.pause(0.2)
+        self.assertFalse(bucket.try_acquire())
+        time.sleep(0.25)
+        self.assertTrue(bucket.try_acquire())
+
+class TestQuotaTracker(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "quota.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_daily_budget_spreads_quota_and_persists(self):
+        # 30 günlük ayın 1'i: (100 - 10) / 30 = 3 istek
+        today = date(2026, 11, 1)
+        quota = QuotaTracker(self.path, monthly_limit=100, reserve=10)
+        self.assertEqual(quota.daily_budget(today), 3)
+        self.assertEqual([quota.try_consume(today) for _ in range(4)], [True, True, True, False])
+
+        reloaded = QuotaTracker(self.path, monthly_limit=100, reserve=10)
+        self.assertFalse(reloaded.try_consume(today))
+        # Yeni ayda sayaç sıfırlanır
+        self.assertTrue(reloaded.try_consume(date(2026, 12, 1)))
+
+    def test_reserve_is_never_used(self):
+        today = date(2026, 11, 30)
+        quota = QuotaTracker(self.path, monthly_limit=5, reserve=2)
+        self.assertEqual(sum(quota.try_consume(today) for _ in range(5)), 3)
+
+if __name__ == '__main__':
+    unittest.main()
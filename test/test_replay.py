@@ -0,0 +1,61 @@
+# tests/test_replay.py
+
+import unittest
+import sys
+import os
+import base64
+import json
+import tempfile
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+
+from modules.replay import Cassette, ReplayServer, ReplayTransport, interaction_key
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "kaset.jsonl")
+        url = "https://google.serper.dev/search"
+        body = json.dumps({"q": "fincan"}).encode("utf-8")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "key": interaction_key("POST", url, body), "method": "POST", "url": url,
+                "status": 200, "headers": {"Content-Type": "application/json"},
+                "body": base64.b64encode(b'{"organic": []}').decode("ascii"),
+            }) + "\n")
+        self.session = requests.Session()
+
+    def tearDown(self):
+        self.session.close()
+        self.tmpdir.cleanup()
+
+    def test_replays_recorded_response(self):
+        server = ReplayServer(Cassette(self.path)).start()
+        try:
+            transport = ReplayTransport(server.url)
+            response = transport.send(self.session, "POST", "https://google.serper.dev/search",
+                                      json={"q": "fincan"}, timeout=5)
+            self.assertEqual(response.json(), {"organic": []})
+
+            missing = transport.send(self.session, "POST", "https://google.serper.dev/search",
+                                     json={"q": "bardak"}, timeout=5)
+            self.assertEqual(missing.status_code, 404)
+        finally:
+            server.stop()
+        self.assertEqual(server.stats, {"hits": 1, "misses": 1, "errors": 0})
+
+    def test_error_injection(self):
+        server = ReplayServer(Cassette(self.path), error_rate=1.0, error_status=503).start()
+        try:
+            response = ReplayTransport(server.url).send(self.session, "POST", "https://google.serper.dev/search",
+                                                        json={"q": "fincan"}, timeout=5)
+        finally:
+            server.stop()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(server.stats["errors"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# tests/test_search_cache.py
+
+import unittest
+import tempfile
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.search_cache import SearchCache
+
+class TestSearchCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "cache.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_or_fetch_caches_results(self):
+        cache = SearchCache(db_path=self.db_path)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return [{"title": "Pizza", "link": "https://example.com", "snippet": "..."}]
+
+        first = cache.get_or_fetch("serper", "pizza tarifi", "tr", 5, fetch)
+        second = cache.get_or_fetch("serper", "pizza tarifi", "tr", 5, fetch)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.info()["hits"], 1)
+
+        # Farklı sonuç sayısı farklı anahtardır
+        cache.get_or_fetch("serper", "pizza tarifi", "tr", 10, fetch)
+        self.assertEqual(len(calls), 2)
+        cache.close()
+
+        # Sonuçlar yeniden başlatmadan sonra da diskte durur
+        reopened = SearchCache(db_path=self.db_path)
+        self.assertEqual(reopened.get("serper", "pizza tarifi", "tr", 5), first)
+        reopened.close()
+
+    def test_empty_results_are_not_cached(self):
+        cache = SearchCache(db_path=self.db_path)
+        cache.get_or_fetch("duckduckgo", "boş", "tr", 5, lambda: [])
+        self.assertIsNone(cache.get("duckduckgo", "boş", "tr", 5))
+        cache.close()
+
+    def test_stale_result_is_served_and_refreshed(self):
+        cache = SearchCache(db_path=self.db_path, ttls={"wikipedia": 0.01})
+        cache.set("wikipedia", "kedi", "tr", None, "eski özet")
+        time.sleep(0.02)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            value = cache.get_or_fetch("wikipedia", "kedi", "tr", None, lambda: "yeni özet", executor=executor)
+        self.assertEqual(value, "eski özet")
+        self.assertEqual(cache.get("wikipedia", "kedi", "tr", None, allow_stale=True), "yeni özet")
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# tests/test_search_rules.py
+
+import unittest
+import sys
+import os
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.search_rules import DEFAULT_SEARCH_RULES
+
+class TestSearchRules(unittest.TestCase):
+    def setUp(self):
+        self.rules = DEFAULT_SEARCH_RULES
+
+    def test_build_query_uses_category_variant(self):
+        self.assertEqual(self.rules.build_query("sırt çantası", ["kadın"]),
+                         "kadın sırt çantası seyahat okul ergonomik çantalar")
+        self.assertEqual(self.rules.build_query("sosisli sandviç", []),
+                         "etli ve soslu sosisli sandviç tarifleri")
+        self.assertEqual(self.rules.build_query("kedi", ["evcil", "hayvan", "tüy", "mama"]),
+                         "kedi evcil hayvan tüy")
+
+    def test_build_query_continues_previous_search(self):
+        self.assertEqual(self.rules.build_query("el çantası", [], last_object="çanta"),
+                         "yeni sezon el çantası modelleri")
+
+    def test_scorer(self):
+        score = self.rules.make_scorer("sosisli sandviç", ["tarif", "sos"])
+        # alan adı (10) + sosisli metin (8) + başlıkta tarif (3) + özette sos (1)
+        self.assertEqual(score("nefisyemektarifleri.com", "kolay tarif", "bol sos ile"), 22)
+        self.assertEqual(score("example.org", "alakasız", "yok"), 0)
+
+    def test_match_content_fields(self):
+        match = self.rules.match("el çantası")
+        self.assertEqual(match.get("header").format(title="El Çantası"), "## El Çantası Hakkında Bilgiler")
+        self.assertEqual(len(match.get("tips")), 2)
+        self.assertIsNone(self.rules.match("kedi").get("header"))
+
+if __name__ == '__main__':
+    unittest.main()
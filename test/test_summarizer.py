@@ -0,0 +1,35 @@
+# tests/test_summarizer.py
+
+import unittest
+import sys
+import os
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.summarizer import summarize
+
+class TestSummarizer(unittest.TestCase):
+    def test_keeps_best_sentences_in_original_order(self):
+        content = ("Kısa. Bu cümle sırt çantası ile ilgili uzunca bir açıklama içerir. "
+                   "Alakasız ama oldukça uzun bir cümle daha burada duruyor. "
+                   "Ergonomik sırt çantası modelleri okul için uygundur")
+        summary = summarize(content, object_name="sırt çantası", keywords=["ergonomik"], max_sentences=2)
+
+        self.assertEqual(summary, " Bu cümle sırt çantası ile ilgili uzunca bir açıklama içerir. "
+                                  " Ergonomik sırt çantası modelleri okul için uygundur")
+
+    def test_duplicate_sentences(self):
+        # Aynı cümle birden fazla kez geçse de her biri kendi konumunda kalır
+        content = "Pizza hamuru dinlendirilmeli. Sos ayrı hazırlanmalı. Pizza hamuru dinlendirilmeli"
+        summary = summarize(content, object_name="pizza")
+        self.assertEqual(summary.count("Pizza hamuru dinlendirilmeli"), 2)
+        self.assertTrue(summary.startswith("Pizza"))
+
+    def test_max_length(self):
+        content = ". ".join(f"Bu {i}. cümle özetlenecek uzun içeriğin bir parçasıdır" for i in range(1000))
+        summary = summarize(content, keywords=["içerik"], max_length=200)
+        self.assertEqual(len(summary), 203)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# tests/test_translator.py
+
+import unittest
+import sys
+import os
+
+# Ana dizini ekle (relative import'lar için)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.translator import LabelTable, Translator
+
+class TestLabelTable(unittest.TestCase):
+    def test_indexed_by_class_id(self):
+        # YOLO names alanı sırasız ve boşluklu bir sözlük olabilir
+        table = LabelTable({2: "car", 0: "person", 3: "hoverboard"})
+
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table[0], "insan")
+        self.assertEqual(table[2], "araba")
+        self.assertIsNone(table[1])
+        self.assertIsNone(table.get(3))
+        self.assertIsNone(table.get(-1))
+        self.assertIsNone(table.get(10))
+        self.assertEqual(table.unresolved, [3])
+        self.assertEqual(LabelTable(["person", "car"]).labels, ["insan", "araba"])
+
+class TestBuildLabelTable(unittest.TestCase):
+    def setUp(self):
+        self.translator = Translator(use_google=False)
+        self.calls = []
+
+        def translate(text, from_lang="en", to_lang="tr"):
+            self.calls.append(text)
+            # Çevrilemeyen ad olduğu gibi döner
+            return {"hoverboard": "elektrikli kaykay"}.get(text, text)
+
+        self.translator.translate = translate
+
+    def test_known_classes_need_no_translation(self):
+        table = self.translator.build_label_table({0: "person", 1: "car"})
+
+        self.assertTrue(table.ready.is_set())
+        self.assertEqual(table.labels, ["insan", "araba"])
+        self.assertEqual(self.calls, [])
+
+    def test_unknown_classes_are_translated(self):
+        table = self.translator.build_label_table({0: "person", 1: "hoverboard", 2: "zorb"}, background=False)
+
+        self.assertTrue(table.ready.is_set())
+        self.assertEqual(self.calls, ["hoverboard", "zorb"])
+        self.assertEqual(table.labels, ["insan", "elektrikli kaykay", None])
+
+    def test_background_translation_sets_ready(self):
+        table = self.translator.build_label_table(["hoverboard"])
+
+        self.assertTrue(table.ready.wait(5))
+        self.assertEqual(table[0], "elektrikli kaykay")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+# tests/test_web_searcher.py
+
+import unittest
+import sys
+import os
+import json
+import subprocess
+import tempfile
+import threading
+import time
+from unittest import mock
+
+# Ana dizini ekle (relative import'lar için)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from modules.rate_limiter import ProviderLimiter, QuotaTracker
+from modules.web_searcher import WebSearcher
+
+# Bilgi deposunu bir süreçte hazırlayıp başka bir süreçte (farklı hash tohumu ile) kullanan betik
+KNOWLEDGE_SCRIPT = '''
+import json, sys
+sys.path.insert(0, sys.argv[1])
+from modules.keyword_extractor import KeywordExtractor
+from modules.knowledge_store import KnowledgeStore, prefetch
+from modules.rate_limiter import ProviderLimiter
+from modules.web_searcher import WebSearcher
+
+class Translator:
+    def translate(self, text):
+        return "şemsiye"
+
+calls = []
+def search(query, num_results=5, lang="tr"):
+    calls.append(query)
+    return [{"title": "Şemsiye", "link": "https://ornek.com/semsiye", "snippet": query}]
+
+store = KnowledgeStore(sys.argv[3])
+searcher = WebSearcher(use_cache=False, serper_limiter=ProviderLimiter("Serper"), knowledge_store=store)
+searcher._search_concurrently = search
+searcher._cached_wikipedia = lambda name, lang="tr": name + " özeti"
+if sys.argv[2] == "prefetch":
+    prefetch(store, ["umbrella"], Translator(), KeywordExtractor(), searcher)
+else:
+    keywords = KeywordExtractor().generate_keywords("şemsiye", is_turkish=True)
+    results = searcher.search_web("şemsiye", keywords)
+    print(json.dumps({"calls": calls, "results": results}))
+'''
+
+class TestKnowledgeLookup(unittest.TestCase):
+    def _run(self, mode, path, seed):
+        process = subprocess.run([sys.executable, "-c", KNOWLEDGE_SCRIPT, ROOT, mode, path],
+                                 env=dict(os.environ, PYTHONHASHSEED=seed),
+                                 capture_output=True, text=True, check=True)
+        return process.stdout
+
+    def test_prefetched_entry_is_used_across_processes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "knowledge.json")
+            self._run("prefetch", path, "1")
+            # Anahtar kelime kümesinin sırası hash tohumuna göre değişir; kayıt yine bulunmalı
+            for seed in ("2", "3"):
+                output = json.loads(self._run("search", path, seed).strip().splitlines()[-1])
+                self.assertEqual(output["calls"], [])
+                self.assertEqual(output["results"][0]["link"], "https://ornek.com/semsiye")
+
+class TestWebSearcher(unittest.TestCase):
+    def setUp(self):
+        self.searcher = WebSearcher(use_cache=False, serper_limiter=ProviderLimiter("Serper"))
+        self.queries = []
+
+        def search(query, num_results=5, lang='tr'):
+            self.queries.append(query)
+            return [{"title": query, "link": "https://ornek.com", "snippet": query}]
+
+        self.searcher._search_concurrently = search
+        self.searcher._cached_wikipedia = lambda name, lang='tr': None
+
+    def tearDown(self):
+        self.searcher._executor.shutdown(wait=False)
+
+    def test_independent_search_ignores_history(self):
+        self.searcher.search_web("sandviç", ["ekmek"])
+        self.searcher.search_web("sosisli sandviç", ["ketçap"], use_history=False)
+        self.searcher.search_web("sosisli sandviç", ["ketçap"])
+
+        # Yalnızca geçmişi kullanan arama önceki nesneye göre sürdürülür
+        self.assertNotEqual(self.queries[1], "farklı sosisli sandviç tarifleri")
+        self.assertEqual(self.queries[2], "farklı sosisli sandviç tarifleri")
+        self.assertEqual([search["object"] for search in self.searcher.search_history],
+                         ["sandviç", "sosisli sandviç"])
+
+    def test_summary_uses_given_keywords(self):
+        self.searcher.search_web("kitap", ["roman"])
+        results = [{"title": f"Sonuç {i}", "link": f"https://ornek.com/{i}",
+                    "snippet": "Bu cümle uzun ama konuyla ilgisiz bir açıklama içeriyor. " * 4 +
+                               "Şemsiye yağmurdan korur. "} for i in range(5)]
+        content = self.searcher.extract_content(results, "şemsiye", ["yağmurdan"])
+        # Özet son aramanın ('kitap') değil verilen nesnenin cümlelerini öne çıkarır
+        self.assertIn("Şemsiye yağmurdan korur", content)
+
+class TestConcurrentSearch(unittest.TestCase):
+    def setUp(self):
+        self.searcher = WebSearcher(use_cache=False, serper_limiter=ProviderLimiter("Serper"),
+                                    search_deadline=0.5)
+        self.result = [{"title": "Şemsiye", "link": "https://ornek.com/semsiye", "snippet": "Şemsiye"}]
+
+    def tearDown(self):
+        self.searcher._executor.shutdown(wait=False)
+
+    def test_providers_run_in_parallel(self):
+        # Sağlayıcılar sırayla çalışsaydı engel hiçbir zaman aşılmazdı
+        barrier = threading.Barrier(2, timeout=1)
+
+        def serper(query, num_results=5, lang='tr'):
+            barrier.wait()
+            return []
+
+        def duckduckgo(query, num_results=5, lang='tr'):
+            barrier.wait()
+            return self.result
+
+        self.searcher._search_serper_limited = serper
+        self.searcher._search_duckduckgo = duckduckgo
+        self.assertEqual(self.searcher._search_concurrently("şemsiye"), self.result)
+
+    def test_deadline_cuts_off_slow_providers(self):
+        def slow(query, num_results=5, lang='tr'):
+            time.sleep(2)
+            return self.result
+
+        self.searcher._search_serper_limited = slow
+        self.searcher._search_duckduckgo = slow
+        start = time.monotonic()
+        self.assertEqual(self.searcher._search_concurrently("şemsiye"), [])
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    def test_prefetched_summary_is_picked_up_in_same_language(self):
+        calls = []
+
+        def wikipedia(name, lang='tr'):
+            calls.append((name, lang))
+            return "Umbrella özeti"
+
+        self.searcher._cached_wikipedia = wikipedia
+        self.searcher._search_concurrently = lambda query, num_results=5, lang='tr': self.result
+        results = self.searcher.search_web("umbrella", ["rain"], lang="en")
+        content = self.searcher.extract_content(results, "umbrella", ["rain"], lang="en")
+
+        # Arama sırasında başlatılan istek kullanılır, ikinci kez çekilmez
+        self.assertEqual(calls, [("umbrella", "en")])
+        self.assertIn("Umbrella özeti", content)
+        self.assertEqual(self.searcher._wiki_futures, {})
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        error = Exception(f"{self.status_code} Client Error")
+        error.response = self
+        raise error
+
+class TestSerperRateLimit(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.quota = QuotaTracker(os.path.join(self.tmpdir.name, "quota.json"), monthly_limit=1000, reserve=0)
+        self.limiter = ProviderLimiter("Serper", rate=100, burst=5, quota=self.quota)
+        self.searcher = WebSearcher(use_cache=False, serper_limiter=self.limiter)
+
+    def tearDown(self):
+        self.searcher._executor.shutdown(wait=False)
+        self.tmpdir.cleanup()
+
+    def _search(self, response):
+        with mock.patch("modules.web_searcher.http_client.post", return_value=response):
+            return self.searcher._search_serper("şemsiye")
+
+    def test_credit_exhaustion_marks_quota(self):
+        self.assertEqual(self._search(FakeResponse(429, '{"message": "Not enough credits"}')), [])
+        self.assertTrue(self.quota.info()["exhausted"])
+        self.assertFalse(self.limiter.acquire())
+
+    def test_credit_header_marks_quota(self):
+        self.assertEqual(self._search(FakeResponse(429, "", {"X-Credits-Remaining": "0"})), [])
+        self.assertTrue(self.quota.info()["exhausted"])
+
+    def test_rate_limit_mentioning_quota_does_not_exhaust(self):
+        response = FakeResponse(429, '{"message": "Per-second quota exceeded, slow down"}', {"Retry-After": "0.2"})
+        self.assertEqual(self._search(response), [])
+        self.assertFalse(self.quota.info()["exhausted"])
+        self.assertFalse(self.limiter.acquire())
+
+    def test_rate_limit_backs_off_without_marking_quota(self):
+        self.assertEqual(self._search(FakeResponse(429, "Too many requests", {"Retry-After": "0.2"})), [])
+        self.assertFalse(self.quota.info()["exhausted"])
+        # Bekleme süresince istek yapılmaz, sonra kota hâlâ kullanılabilir
+        self.assertFalse(self.limiter.acquire())
+        time.sleep(0.25)
+        self.assertTrue(self.limiter.acquire())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1 +1,56 @@
-# genel yardımcı fonksiyonlar
\ No newline at end of file
+# genel yardımcı fonksiyonlar
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Boyutu sınırlı, isabet/ıska sayaçlı, thread-safe LRU önbellek."""
+
+    _MISSING = object()
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Anahtarın değerini döndürür ve anahtarı en yeni konuma taşır."""
+        with self._lock:
+            value = self._data.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Değeri ekler; kapasite aşılırsa en eski girdiyi atar."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self):
+        """Önbellek istatistiklerini döndürür."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / total if total else 0.0,
+        }